@@ -0,0 +1 @@
+from .test__suite import TestSuite
\ No newline at end of file
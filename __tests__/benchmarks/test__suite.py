@@ -0,0 +1,60 @@
+import os
+import tempfile
+import unittest
+
+from benchmarks.suite import BENCHMARKS, compare_results, format_results, load_results, measure_import_time, \
+    parse_import_time, run_benchmark, save_results
+
+
+class TestSuite(unittest.TestCase):
+
+    def test__benchmarks_registered(self):
+        for name in ['card_deck.construct', 'card_deck.shuffle', 'card_deck.deal_2', 'card_deck.draw_1.hand_26',
+                     'render.card_str', 'render.card_deck_str', 'war.headless_game', 'war.throughput_100_games']:
+            self.assertIn(name, BENCHMARKS)
+
+    def test__run_benchmark(self):
+        result = run_benchmark(BENCHMARKS['render.card_str'], repeats=1)
+        self.assertGreater(result['seconds_per_op'], 0)
+        self.assertAlmostEqual(1, result['seconds_per_op'] * result['ops_per_second'])
+
+    def test__parse_import_time(self):
+        report = '\n'.join([
+            'import time: self [us] | cumulative | imported package',
+            'import time:       212 |       8159 |     models',
+            'import time:       215 |      25940 |   card_games',
+            'import time:       261 |      26424 | card_table',
+        ])
+        self.assertEqual(25940, parse_import_time(report, 'card_games'))
+        self.assertEqual(26424, parse_import_time(report, 'card_table'))
+        with self.assertRaises(Exception):
+            parse_import_time(report, 'card')
+
+    def test__measure_import_time(self):
+        result = measure_import_time('card_games', repeats=1)
+        self.assertGreater(result['seconds_per_op'], 0)
+        self.assertAlmostEqual(1, result['seconds_per_op'] * result['ops_per_second'])
+
+    def test__save_results__load_results(self):
+        results = {'foo': {'seconds_per_op': 0.5, 'ops_per_second': 2.0}}
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'results.json')
+            save_results(results, path)
+            self.assertEqual(results, load_results(path))
+
+    def test__compare_results(self):
+        baseline = {
+            'foo': {'seconds_per_op': 1.0, 'ops_per_second': 1.0},
+            'bar': {'seconds_per_op': 1.0, 'ops_per_second': 1.0},
+        }
+        results = {
+            'foo': {'seconds_per_op': 1.05, 'ops_per_second': 1 / 1.05},
+            'bar': {'seconds_per_op': 1.5, 'ops_per_second': 1 / 1.5},
+            'new': {'seconds_per_op': 9.0, 'ops_per_second': 1 / 9},
+        }
+        self.assertEqual(['bar'], compare_results(results, baseline, threshold=0.1))
+        self.assertEqual([], compare_results(results, baseline, threshold=0.6))
+
+        table = format_results(results, baseline, threshold=0.1)
+        self.assertIn('+50.0%  REGRESSION', table)
+        self.assertIn('+5.0%\n', table)
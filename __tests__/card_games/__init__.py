@@ -1,2 +1,9 @@
 from .test__card_game import TestCardGame
+from .test__cycle_detector import TestCycleDetector
+from .test__instrumentation import TestInstrumentation
+from .test__output_sink import TestOutputSink
+from .test__registry import TestRegistry
+from .test__replay_log import TestReplayLog
+from .test__round_trace import TestRoundTrace
+from .test__rule_variant import TestRuleVariant
 from .test__war import TestWar
\ No newline at end of file
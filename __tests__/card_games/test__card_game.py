@@ -1,4 +1,6 @@
+import io
 import unittest
+from unittest import mock
 
 from card_games.card_game import CardGame
 from models import Player
@@ -35,3 +37,18 @@ class TestCardGame(unittest.TestCase):
         self.assertEqual(1, game.players[0].play_pile.card_count())
         self.assertEqual(drawn_card, game.players[0].play_pile.cards[0])
         self.assertTrue(drawn_card.face_up)
+
+    def test__end_round__headless(self):
+        players = [Player('Player 1'), Player('Player 2')]
+        game = CardGame(players, headless=True)
+        game.deal_hands()
+        game.play_top_card(players[0])
+        game.round_winner = players[0]
+
+        with mock.patch('sys.stdout', new=io.StringIO()) as std_out:
+            game.end_round()
+            self.assertEqual('', std_out.getvalue())
+
+        self.assertEqual(1, game.round_number)
+        self.assertIsNone(game.round_winner)
+        self.assertIsNone(players[0].play_pile)
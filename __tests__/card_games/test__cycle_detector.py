@@ -0,0 +1,20 @@
+import unittest
+
+from card_games.cycle_detector import CycleDetector
+
+
+class TestCycleDetector(unittest.TestCase):
+
+    def test__repeats(self):
+        detector = CycleDetector()
+
+        # A sequence that enters a cycle of length 3 after 4 steps: 0, 1, 2, 3, 4, 5, 6, 4, 5, 6, ...
+        states = [0, 1, 2, 3] + [4, 5, 6] * 10
+        detected_at = next(index for index, state in enumerate(states) if detector.repeats(state))
+
+        self.assertEqual(states[detected_at], detector.saved_state)
+        self.assertLessEqual(detected_at, 4 + 2 * 3 + 3)
+
+    def test__repeats__no_cycle(self):
+        detector = CycleDetector()
+        self.assertFalse(any(detector.repeats(state) for state in range(1000)))
@@ -0,0 +1,86 @@
+import io
+import json
+import os
+import pstats
+import random
+import tempfile
+import unittest
+
+from card_games import OutputSink, War
+from card_games.instrumentation import Instrumentation
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+        self.war = War(headless=True, rng=random.Random(0))
+        self.instrumentation = Instrumentation(record_trace=True)
+
+    def test__attach(self):
+        self.instrumentation.attach(self.war)
+        result = self.war.run_to_completion()
+
+        timers = self.instrumentation.timers
+        self.assertEqual(1, timers['deal'].calls)
+        self.assertEqual(result.round_number, timers['pile_transfer'].calls)
+        self.assertEqual(result.war_count, timers['war'].calls)
+        self.assertEqual(2 * result.round_number, timers['play_top_card'].calls)
+        self.assertEqual(0, timers['render'].calls)
+        self.assertGreater(timers['shuffle'].calls, 0)
+
+    def test__attach__render(self):
+        war = War(names=['Foo', 'Bar'], rng=random.Random(0), output=OutputSink(io.StringIO()))
+        self.instrumentation.attach(war)
+        result = war.run_to_completion()
+
+        self.assertGreater(self.instrumentation.timers['render'].calls, result.round_number)
+
+    def test__attach__exclusive_time(self):
+        self.instrumentation.attach(self.war)
+        self.war.run_to_completion()
+
+        for timer in self.instrumentation.timers.values():
+            self.assertLessEqual(timer.exclusive_ns, timer.inclusive_ns)
+        # Deal hands only ever calls untimed methods
+        self.assertEqual(self.instrumentation.timers['deal'].exclusive_ns,
+                         self.instrumentation.timers['deal'].inclusive_ns)
+
+    def test__detach(self):
+        self.instrumentation.attach(self.war)
+        self.instrumentation.detach(self.war)
+        self.war.run_to_completion()
+
+        self.assertEqual(0, sum(timer.calls for timer in self.instrumentation.timers.values()))
+        self.assertNotIn('play_top_card', self.war.__dict__)
+
+    def test__breakdown(self):
+        self.instrumentation.attach(self.war)
+        self.war.run_to_completion()
+
+        lines = self.instrumentation.breakdown().split('\n')
+        self.assertEqual(7, len(lines))
+        self.assertTrue(lines[0].startswith('phase'))
+
+    def test__export_chrome_trace(self):
+        self.instrumentation.attach(self.war)
+        self.war.run_to_completion()
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'trace.json')
+            self.instrumentation.export_chrome_trace(path)
+            with open(path) as trace_file:
+                events = json.load(trace_file)['traceEvents']
+
+        self.assertEqual(sum(timer.calls for timer in self.instrumentation.timers.values()), len(events))
+        self.assertEqual({'X'}, {event['ph'] for event in events})
+
+    def test__export_pstats(self):
+        self.instrumentation.attach(self.war)
+        self.war.run_to_completion()
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'phases.prof')
+            self.instrumentation.export_pstats(path)
+            stats = pstats.Stats(path, stream=io.StringIO())
+
+        self.assertEqual(self.instrumentation.timers['deal'].calls, stats.stats[('card_games', 0, 'deal')][1])
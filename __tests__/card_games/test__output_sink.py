@@ -0,0 +1,45 @@
+import io
+import unittest
+from unittest import mock
+
+from card_games.output_sink import OutputSink
+
+
+class TestOutputSink(unittest.TestCase):
+
+    def test__write(self):
+        stream = io.StringIO()
+        sink = OutputSink(stream)
+
+        sink.write('FOO\n')
+        self.assertEqual('FOO\n', stream.getvalue())
+
+    def test__write__default_stream(self):
+        sink = OutputSink()
+
+        with mock.patch('sys.stdout', new=io.StringIO()) as std_out:
+            sink.write('FOO\n')
+            self.assertEqual('FOO\n', std_out.getvalue())
+
+    def test__write__buffered(self):
+        stream = io.StringIO()
+        sink = OutputSink(stream, buffered=True)
+
+        sink.write('FOO\n')
+        sink.write('BAR\n')
+        self.assertEqual('', stream.getvalue())
+
+        sink.flush()
+        self.assertEqual('FOO\nBAR\n', stream.getvalue())
+        self.assertEqual([], sink.buffer)
+
+    def test__truncate(self):
+        stream = io.StringIO()
+        sink = OutputSink(stream, buffered=True)
+
+        sink.write('FOO\n')
+        mark = sink.mark()
+        sink.write('BAR\n')
+        sink.truncate(mark)
+        sink.flush()
+        self.assertEqual('FOO\n', stream.getvalue())
@@ -0,0 +1,45 @@
+import subprocess
+import sys
+import unittest
+
+import card_games
+from card_games.registry import GAMES, game_names, load_game, register_game
+from card_games.war import War
+
+
+class TestRegistry(unittest.TestCase):
+
+    def test__game_names(self):
+        self.assertEqual('War', game_names()[0])
+
+    def test__load_game(self):
+        self.assertIs(War, load_game('War'))
+        self.assertIs(War, card_games.War)
+
+    def test__load_game__unregistered(self):
+        with self.assertRaises(Exception):
+            load_game('Go Fish')
+
+    def test__register_game(self):
+        register_game('Output', 'card_games.output_sink:OutputSink')
+        try:
+            self.assertEqual('Output', game_names()[-1])
+            self.assertIs(card_games.OutputSink, load_game('Output'))
+        finally:
+            GAMES.pop('Output')
+
+    def test__register_game__invalid_import_path(self):
+        with self.assertRaises(Exception):
+            register_game('War', 'card_games.war')
+        self.assertEqual('card_games.war:War', GAMES['War'])
+
+    def test__unknown_attribute(self):
+        with self.assertRaises(AttributeError):
+            card_games.GoFish
+
+    def test__games_imported_lazily(self):
+        # The menu is built without importing any game, or even typing
+        script = 'import sys; from card_table import CardTable; CardTable(); print(sorted(set(sys.modules) & ' \
+                 '{"card_games.war", "models", "typing"}))'
+        process = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True)
+        self.assertEqual('[]', process.stdout.strip())
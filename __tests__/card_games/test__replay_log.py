@@ -0,0 +1,112 @@
+import io
+import unittest
+
+from card_games import OutputSink, War
+from card_games.replay_log import ReplayLog
+
+
+class TestReplayLog(unittest.TestCase):
+
+    def record_game(self, seed: int, reshuffle: bool = True) -> ReplayLog:
+        war = War(headless=True, seed=seed, reshuffle=reshuffle, max_rounds=5000)
+        war.replay_log = ReplayLog()
+        self.result = war.run_to_completion()
+        return war.replay_log
+
+    def test__record(self):
+        log = self.record_game(5)
+
+        self.assertEqual(list(range(52)), sorted(log.deal))
+        self.assertEqual(self.result.round_number, len(log.round_winners))
+        self.assertGreater(len(log.shuffle_seeds), 0)
+        self.assertTrue(log.reshuffle)
+
+    def test__to_bytes__from_bytes(self):
+        log = self.record_game(5)
+        data = log.to_bytes()
+        decoded_log = ReplayLog.from_bytes(data)
+
+        self.assertEqual(log.deal, decoded_log.deal)
+        self.assertEqual(log.shuffle_seeds, decoded_log.shuffle_seeds)
+        self.assertEqual(log.round_winners, decoded_log.round_winners)
+        self.assertEqual(log.reshuffle, decoded_log.reshuffle)
+        self.assertEqual(2, decoded_log.number_of_players)
+        self.assertEqual(len(data), 19 + 52 + 4 * len(log.shuffle_seeds) + len(log.round_winners))
+
+    def test__from_bytes__invalid(self):
+        with self.assertRaises(Exception) as context:
+            ReplayLog.from_bytes(b'FOOBAR' + bytes(20))
+        self.assertTrue('Not a version 2 War replay log' in str(context.exception))
+
+    def test__replay(self):
+        for seed in range(5):
+            log = ReplayLog.from_bytes(self.record_game(seed).to_bytes())
+            result = log.replay()
+
+            self.assertEqual(self.result.winner, result.winner)
+            self.assertEqual(self.result.round_number, result.round_number)
+            self.assertEqual(self.result.war_count, result.war_count)
+
+    def test__replay__without_reshuffle(self):
+        log = self.record_game(0, reshuffle=False)
+        result = log.replay()
+
+        self.assertEqual(self.result.winner, result.winner)
+        self.assertEqual(self.result.round_number, result.round_number)
+
+    def test__replay__output(self):
+        log = self.record_game(3)
+        stream = io.StringIO()
+        log.replay(output=OutputSink(stream))
+
+        self.assertIn(f'ROUND {len(log.round_winners)} RESULTS', stream.getvalue())
+        self.assertIn('GAME OVER!', stream.getvalue())
+
+    def test__replay__mismatch(self):
+        log = self.record_game(3)
+        log.round_winners[0] ^= 1
+
+        with self.assertRaises(Exception) as context:
+            log.replay()
+        self.assertTrue('does not match' in str(context.exception))
+
+    def test__replay__fast_shuffle(self):
+        war = War(headless=True, seed=5, fast_shuffle=True, shoe_views=True)
+        war.replay_log = ReplayLog()
+        result = war.run_to_completion()
+        log = ReplayLog.from_bytes(war.replay_log.to_bytes())
+
+        self.assertTrue(log.fast_shuffle)
+        replayed_result = log.replay()
+        self.assertEqual((result.winner, result.round_number, result.war_count),
+                         (replayed_result.winner, replayed_result.round_number, replayed_result.war_count))
+
+    def test__replay__number_of_players(self):
+        for shoe_views in (False, True):
+            war = War(headless=True, seed=8, number_of_players=3, max_rounds=5000, shoe_views=shoe_views,
+                      fast_shuffle=shoe_views)
+            war.replay_log = ReplayLog()
+            result = war.run_to_completion()
+            log = ReplayLog.from_bytes(war.replay_log.to_bytes())
+
+            self.assertEqual(3, log.number_of_players)
+            replayed_result = log.replay()
+            self.assertEqual((result.winner, result.round_number, result.war_count),
+                             (replayed_result.winner, replayed_result.round_number, replayed_result.war_count))
+
+    def test__replay__large_shoe(self):
+        war = War(headless=True, seed=2, number_of_players=4, decks=6, max_rounds=2000, shoe_views=True,
+                  fast_shuffle=True)
+        war.replay_log = ReplayLog()
+        result = war.run_to_completion()
+        log = ReplayLog.from_bytes(war.replay_log.to_bytes())
+
+        self.assertEqual(312, len(log.deal))
+        replayed_result = log.replay()
+        self.assertEqual((result.winner, result.round_number, result.war_count),
+                         (replayed_result.winner, replayed_result.round_number, replayed_result.war_count))
+
+    def test__replay__names(self):
+        log = self.record_game(5)
+        with self.assertRaises(Exception):
+            log.replay(names=['FOO', 'BAR', 'BAZ'])
\ No newline at end of file
@@ -0,0 +1,103 @@
+import os
+import random
+import tempfile
+import unittest
+
+from card_games import War
+from card_games.round_trace import RoundTrace, TraceReader, TraceWriter
+from card_games.rule_variant import RuleVariant
+from enums import Rank, Suit
+from models import Card
+
+
+class TestRoundTrace(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'games.wartrace')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def traced_game(self, game_id: int, seed: int, **options) -> RoundTrace:
+        war = War(headless=True, rng=random.Random(seed), max_rounds=300, **options)
+        war.round_trace = RoundTrace(game_id)
+        war.run_to_completion()
+        return war.round_trace
+
+    def test__record_round(self):
+        trace = RoundTrace(7)
+        trace.record_round(1, 2, [[Card(Rank.TWO, Suit.SPADES)], [Card(Rank.ACE, Suit.HEARTS, face_up=True)]],
+                           [20, 32])
+        trace.record_round(None, 0, [[], []], [20, 32])
+
+        rounds = list(trace.rounds())
+        self.assertEqual(2, len(rounds))
+        self.assertEqual(1, rounds[0].winner)
+        self.assertEqual(2, rounds[0].war_depth)
+        self.assertEqual(Rank.ACE, rounds[0].played[1][0].rank)
+        self.assertTrue(rounds[0].played[1][0].face_up)
+        self.assertEqual([20, 32], rounds[0].hand_counts)
+        self.assertIsNone(rounds[1].winner)
+
+    def test__trace_round__war(self):
+        trace = self.traced_game(0, 3)
+        rounds = list(trace.rounds())
+
+        war = War(headless=True, rng=random.Random(3), max_rounds=300)
+        result = war.run_to_completion()
+        self.assertEqual(result.round_number, len(rounds))
+        self.assertEqual(result.war_count, sum(traced_round.war_depth for traced_round in rounds))
+        for traced_round in rounds:
+            self.assertEqual(52, sum(traced_round.hand_counts))
+            cards_played = [len(cards) for cards in traced_round.played]
+            self.assertEqual([1 + 4 * traced_round.war_depth] * 2, cards_played)
+
+    def test__trace_round__players(self):
+        rounds = list(self.traced_game(0, 5, number_of_players=3).rounds())
+        self.assertEqual(3, len(rounds[0].hand_counts))
+        self.assertEqual(3, len(rounds[0].played))
+
+    def test__compiled_round__traced(self):
+        war = War(headless=True)
+        war.round_trace = RoundTrace(0)
+        self.assertIs(War.play_round, war.compiled_round())
+
+    def test__reader__random_access(self):
+        traces = [self.traced_game(game_id, game_id, variant=RuleVariant(war_depth=1)) for game_id in range(0, 20, 2)]
+        for compress in (True, False):
+            with TraceWriter(self.path, compress=compress, block_size=2000) as writer:
+                for trace in traces:
+                    writer.write(trace)
+
+            with TraceReader(self.path) as reader:
+                self.assertEqual(10, len(reader))
+                self.assertEqual(list(range(0, 20, 2)), list(reader.game_ids()))
+                self.assertNotIn(3, reader)
+                for trace in reversed(traces):
+                    expected = list(trace.rounds())
+                    actual = list(reader.rounds(trace.game_id))
+                    self.assertEqual([traced_round.hand_counts for traced_round in expected],
+                                     [traced_round.hand_counts for traced_round in actual])
+                    self.assertEqual([[[card.to_code() for card in cards] for cards in traced_round.played]
+                                      for traced_round in expected],
+                                     [[[card.to_code() for card in cards] for cards in traced_round.played]
+                                      for traced_round in actual])
+
+    def test__reader__missing_game(self):
+        with TraceWriter(self.path) as writer:
+            writer.write(self.traced_game(1, 1))
+        with TraceReader(self.path) as reader, self.assertRaises(Exception):
+            reader.rounds(2)
+
+    def test__reader__empty(self):
+        TraceWriter(self.path).close()
+        with TraceReader(self.path) as reader:
+            self.assertEqual(0, len(reader))
+            self.assertNotIn(0, reader)
+
+    def test__write__out_of_order(self):
+        with TraceWriter(self.path) as writer:
+            writer.write(RoundTrace(5))
+            with self.assertRaises(Exception):
+                writer.write(RoundTrace(5))
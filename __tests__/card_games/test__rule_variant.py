@@ -0,0 +1,143 @@
+import random
+import traceback
+import unittest
+from unittest import mock
+
+from card_games import War
+from card_games.instrumentation import Instrumentation
+from card_games.replay_log import ReplayLog
+from card_games.rule_variant import RuleVariant, compile_round, round_source
+from enums import Rank, Suit
+from models import Card, CardDeck
+
+
+class TestRuleVariant(unittest.TestCase):
+
+    def test__init__invalid_rules(self):
+        for rules in [{'face_down_cards': -1}, {'war_depth': -1}, {'short_war': 'FOO'}, {'pile_order': 'FOO'},
+                      {'reshuffle': 'FOO'}]:
+            with self.assertRaises(Exception):
+                RuleVariant(**rules)
+
+    def test__rank_values(self):
+        self.assertEqual(14, RuleVariant().rank_values()[Rank.ACE])
+        self.assertEqual(2, RuleVariant().rank_values()[Rank.TWO])
+        self.assertEqual(13, RuleVariant().rank_values()[Rank.KING])
+        self.assertEqual(1, RuleVariant(ace_low=True).rank_values()[Rank.ACE])
+
+    def test__eq__hash(self):
+        self.assertEqual(RuleVariant(), RuleVariant())
+        self.assertEqual(hash(RuleVariant(war_depth=2)), hash(RuleVariant(war_depth=2)))
+        self.assertNotEqual(RuleVariant(), RuleVariant(pile_order='winner_first'))
+
+    def test__is_replayable(self):
+        self.assertTrue(RuleVariant().is_replayable())
+        self.assertTrue(RuleVariant(reshuffle='never').is_replayable())
+        self.assertFalse(RuleVariant(reshuffle='every_round').is_replayable())
+        self.assertFalse(RuleVariant(ace_low=True).is_replayable())
+
+    def test__compile_round__cached(self):
+        self.assertIs(compile_round(RuleVariant(face_down_cards=2)), compile_round(RuleVariant(face_down_cards=2)))
+
+    def test__compile_round__traceback(self):
+        play_round = compile_round(RuleVariant(face_down_cards=1))
+        self.assertEqual(round_source(RuleVariant(face_down_cards=1)), play_round.source)
+
+        player = mock.Mock()
+        player.hand.is_top_card_face_up.return_value = False
+        player.hand.draw.side_effect = Exception('Empty hand')
+        game = mock.Mock(players=[player], eliminated_players=set())
+        lines = ''
+        try:
+            play_round(game)
+        except Exception as exception:
+            lines = ''.join(traceback.format_exception(exception))
+        self.assertIn('<War round RuleVariant(', lines)
+        self.assertIn('card = player.hand.draw(1)[0]', lines)
+
+    def test__round_source__rules_decided_up_front(self):
+        source = round_source(RuleVariant(face_down_cards=1, reshuffle='never'))
+        self.assertIn('.draw(2)', source)
+        self.assertNotIn('variant', source)
+        self.assertNotIn('shuffle', source)
+        self.assertNotIn('wars ==', source)
+
+    def test__compiled_round__same_games(self):
+        variants = [RuleVariant(), RuleVariant(ace_low=True, face_down_cards=1), RuleVariant(war_depth=1),
+                    RuleVariant(short_war='play_remaining', pile_order='winner_last'),
+                    RuleVariant(pile_order='winner_first', reshuffle='every_round')]
+        for variant in variants:
+            for seed in range(4):
+                options = {'headless': True, 'variant': variant, 'max_rounds': 2000,
+                           'number_of_players': 2 + seed % 2}
+                compiled = War(rng=random.Random(seed), **options)
+                generic = War(rng=random.Random(seed), **options)
+                generic.play_round = generic.play_round
+
+                self.assertEqual(vars(generic.run_to_completion()), vars(compiled.run_to_completion()))
+
+    def test__compiled_round__fallback(self):
+        war = War(headless=True)
+        self.assertIs(compile_round(RuleVariant()), war.compiled_round())
+
+        Instrumentation().attach(war)
+        self.assertIs(War.play_round, war.compiled_round())
+        self.assertIs(War.play_round, War(names=['FOO', 'BAR']).compiled_round())
+
+    def test__play_war_cards__face_down_cards(self):
+        war = War(headless=True, variant=RuleVariant(face_down_cards=1))
+        war.deal_hands()
+
+        drawn_cards = war.play_war_cards(war.player_one)
+        self.assertEqual(2, len(drawn_cards))
+        self.assertFalse(drawn_cards[0].face_up)
+        self.assertTrue(drawn_cards[1].face_up)
+
+    def test__play_war_cards__play_remaining(self):
+        war = War(headless=True, variant=RuleVariant(short_war='play_remaining'))
+        war.deal_hands()
+        war.player_one.hand = CardDeck([Card(Rank.FOUR, Suit.SPADES), Card(Rank.KING, Suit.SPADES)])
+
+        drawn_cards = war.play_war_cards(war.player_one)
+        self.assertEqual(2, len(drawn_cards))
+        self.assertTrue(drawn_cards[1].face_up)
+        self.assertEqual([], war.play_war_cards(war.player_one))
+
+    def test__declare_war__play_remaining(self):
+        war = War(headless=True, variant=RuleVariant(short_war='play_remaining'))
+        war.deal_hands()
+        war.player_one.hand = CardDeck([Card(Rank.FOUR, Suit.SPADES), Card(Rank.KING, Suit.SPADES)])
+        war.player_two.hand = CardDeck([Card(Rank.TEN, Suit.SPADES)] * 5)
+        for player in war.players:
+            war.play_top_card(player)
+
+        # Player one is short of cards, but plays their last card (a King) rather than forfeiting
+        war.declare_war()
+        self.assertFalse(war.forfeit)
+        self.assertEqual(war.player_one, war.round_winner)
+        self.assertEqual(2 + 5, war.player_one.hand_count())
+
+    def test__declare_war__war_depth(self):
+        war = War(headless=True, variant=RuleVariant(war_depth=0))
+        war.deal_hands()
+        for player in war.players:
+            war.play_top_card(player)
+
+        war.declare_war()
+        self.assertEqual(0, war.war_count)
+        self.assertIsNone(war.round_winner)
+        self.assertEqual([26, 26], [player.hand_count() for player in war.players])
+
+    def test__collect_play_piles__winner_first(self):
+        war = War(headless=True, variant=RuleVariant(pile_order='winner_first'))
+        war.deal_hands()
+        cards = [war.play_top_card(player) for player in war.players]
+
+        war.collect_play_piles(war.player_two)
+        self.assertEqual([cards[1], cards[0]], list(war.player_two.hand.cards)[-2:])
+
+    def test__deal_hands__replay_log(self):
+        war = War(headless=True, variant=RuleVariant(ace_low=True))
+        war.replay_log = ReplayLog()
+        with self.assertRaises(Exception):
+            war.deal_hands()
@@ -1,11 +1,13 @@
 import io
+import random
 import unittest
 from unittest import mock
 from unittest.mock import patch
 
 from card_games import War
+from card_games.output_sink import OutputSink
 from enums import Rank, Suit
-from models import Card
+from models import Card, CardDeck
 
 
 class TestWar(unittest.TestCase):
@@ -32,7 +34,7 @@ class TestWar(unittest.TestCase):
 
         war.determine_round_winner(cards_1, cards_2)
         self.assertEqual(
-            war.player_two.hand.cards[-2:], [cards_1[1], cards_2[1]])
+            list(war.player_two.hand.cards)[-2:], [cards_1[1], cards_2[1]])
         self.assertEqual(war.player_two, war.round_winner)
 
     @patch('builtins.input', side_effect=['Player 1', 'Player 2'])
@@ -48,7 +50,7 @@ class TestWar(unittest.TestCase):
 
         war.determine_round_winner(cards_1, cards_2)
         self.assertEqual(
-            war.player_one.hand.cards[-2:], [cards_1[1], cards_2[1]])
+            list(war.player_one.hand.cards)[-2:], [cards_1[1], cards_2[1]])
         self.assertEqual(war.player_one, war.round_winner)
 
     @patch('builtins.input', side_effect=['Player 1', 'Player 2'])
@@ -75,7 +77,7 @@ class TestWar(unittest.TestCase):
         drawn_cards = war.play_war_cards(war.player_one)
 
         self.assertEqual(4, len(drawn_cards))
-        self.assertEqual(drawn_cards, war.player_one.play_pile.cards)
+        self.assertEqual(drawn_cards, list(war.player_one.play_pile.cards))
         self.assertFalse(drawn_cards[0].face_up)
         self.assertFalse(drawn_cards[1].face_up)
         self.assertFalse(drawn_cards[2].face_up)
@@ -120,3 +122,195 @@ class TestWar(unittest.TestCase):
             self.assertEqual(1, war.war_count)
             self.assertIsNone(war.game_winner)
             self.assertIsNone(war.round_winner)
+
+    @patch('builtins.input')
+    def test__init__headless(self, mock_input):
+        war = War(headless=True)
+
+        mock_input.assert_not_called()
+        self.assertTrue(war.headless)
+        self.assertEqual('Player 1', war.player_one.name)
+        self.assertEqual('Player 2', war.player_two.name)
+
+        war = War(headless=True, names=['FOO', 'BAR'])
+        self.assertEqual('FOO', war.player_one.name)
+        self.assertEqual('BAR', war.player_two.name)
+
+    def test__run_to_completion(self):
+        war = War(headless=True, rng=random.Random(1))
+
+        with mock.patch('sys.stdout', new=io.StringIO()) as std_out:
+            result = war.run_to_completion()
+            self.assertEqual('', std_out.getvalue())
+
+        self.assertIn(result.winner, [0, 1])
+        self.assertEqual(war.players[result.winner].name, result.winner_name)
+        self.assertGreater(result.round_number, 0)
+
+        # Game state is reset so the instance can be played again
+        self.assertIsNone(war.game_winner)
+        self.assertEqual(0, war.round_number)
+        self.assertEqual(0, war.war_count)
+        self.assertFalse(war.forfeit)
+
+    def test__run_to_completion__seeded(self):
+        result_1 = War(headless=True, rng=random.Random(7)).run_to_completion()
+        result_2 = War(headless=True, rng=random.Random(7)).run_to_completion()
+
+        self.assertEqual(result_1.winner, result_2.winner)
+        self.assertEqual(result_1.round_number, result_2.round_number)
+        self.assertEqual(result_1.war_count, result_2.war_count)
+        self.assertEqual(result_1.forfeit, result_2.forfeit)
+
+    @patch('builtins.input', side_effect=['s', 'n'])
+    def test__play__skip_to_end(self, mock_input):
+        stream = io.StringIO()
+        war = War(names=['Player 1', 'Player 2'], rng=random.Random(1), output=OutputSink(stream))
+        war.play()
+
+        output = stream.getvalue()
+        self.assertIn('GAME OVER!', output)
+        self.assertTrue(output.endswith('\nGoodbye!\n'))
+        self.assertFalse(war.output.buffered)
+
+    @patch('builtins.input', side_effect=['s', 'n'])
+    def test__play__skip_to_end__summarised(self, mock_input):
+        stream = io.StringIO()
+        war = War(names=['Player 1', 'Player 2'], rng=random.Random(1), output=OutputSink(stream),
+                  skip_display_interval=10)
+        war.play()
+        summarised_output = stream.getvalue()
+
+        mock_input.side_effect = ['s', 'n']
+        stream = io.StringIO()
+        war = War(names=['Player 1', 'Player 2'], rng=random.Random(1), output=OutputSink(stream))
+        war.play()
+        full_output = stream.getvalue()
+
+        self.assertIn('\t\tROUND 1\n', summarised_output)
+        self.assertIn('\t\tROUND 10\n', summarised_output)
+        self.assertNotIn('\t\tROUND 11\n', summarised_output)
+        self.assertIn('\t\tROUND 11\n', full_output)
+        self.assertIn('GAME OVER!', summarised_output)
+        self.assertLess(len(summarised_output), len(full_output))
+
+    def test__init__cycle_detection_requires_no_reshuffle(self):
+        with self.assertRaises(Exception) as context:
+            War(headless=True, detect_cycles=True)
+        self.assertTrue('requires reshuffle to be off' in str(context.exception))
+
+    def test__init__invalid_skip_display_interval(self):
+        for skip_display_interval in [0, -1]:
+            with self.assertRaises(ValueError):
+                War(headless=True, skip_display_interval=skip_display_interval)
+
+    def test__run_to_completion__max_rounds(self):
+        result = War(headless=True, rng=random.Random(0), max_rounds=5).run_to_completion()
+
+        self.assertTrue(result.is_draw())
+        self.assertIsNone(result.winner_name)
+        self.assertFalse(result.cycle)
+        self.assertEqual(5, result.round_number)
+
+    def test__run_to_completion__cycle(self):
+        # Without reshuffling, this deal returns to an earlier state after a few hundred rounds
+        war = War(headless=True, rng=random.Random(0), reshuffle=False, detect_cycles=True)
+        result = war.run_to_completion()
+
+        self.assertTrue(result.is_draw())
+        self.assertTrue(result.cycle)
+        self.assertFalse(war.cycle_detected)
+        self.assertIsNone(war.cycle_detector)
+
+    def test__run_to_completion__cycle__shoe_views(self):
+        # Checking for cycles only builds the cards drawn, leaving the rest of the shoe unbuilt
+        with mock.patch.object(Card, 'from_code', side_effect=Card.from_code) as from_code:
+            result = War(headless=True, rng=random.Random(0), reshuffle=False, detect_cycles=True, shoe_views=True,
+                         max_rounds=5).run_to_completion()
+        self.assertEqual(5, result.round_number)
+        self.assertLess(from_code.call_count, 52)
+
+        result = War(headless=True, rng=random.Random(0), reshuffle=False, detect_cycles=True,
+                     shoe_views=True).run_to_completion()
+        expected = War(headless=True, rng=random.Random(0), reshuffle=False, detect_cycles=True).run_to_completion()
+        self.assertTrue(result.cycle)
+        self.assertEqual(expected.round_number, result.round_number)
+
+    def test__init__seed(self):
+        result_1 = War(headless=True, seed=11).run_to_completion()
+        result_2 = War(headless=True, seed=11).run_to_completion()
+
+        self.assertEqual(result_1.winner, result_2.winner)
+        self.assertEqual(result_1.round_number, result_2.round_number)
+        self.assertEqual(result_1.war_count, result_2.war_count)
+
+    def test__init__number_of_players(self):
+        war = War(headless=True, number_of_players=4, decks=2)
+
+        self.assertEqual(4, war.number_of_players)
+        self.assertEqual(['Player 1', 'Player 2', 'Player 3', 'Player 4'], [player.name for player in war.players])
+        self.assertEqual(war.players[1], war.player_two)
+
+        war.deal_hands()
+        self.assertEqual([26, 26, 26, 26], [player.hand_count() for player in war.players])
+
+        with self.assertRaises(Exception) as context:
+            War(headless=True, names=['FOO'])
+        self.assertTrue('at least 2 players' in str(context.exception))
+
+    def test__determine_round_winner__highest_card(self):
+        war = War(headless=True, number_of_players=3)
+        war.deal_hands()
+        cards = [Card(Rank.FOUR, Suit.SPADES), Card(Rank.KING, Suit.SPADES), Card(Rank.TWO, Suit.SPADES)]
+        for player, card in zip(war.players, cards):
+            player.add_to_play_pile([card])
+
+        war.determine_round_winner(*([card] for card in cards))
+        self.assertEqual(war.players[1], war.round_winner)
+        self.assertEqual(cards, list(war.players[1].hand.cards)[-3:])
+
+    @patch('card_games.War.declare_war')
+    def test__determine_round_winner__tied_players_only(self, mock_declare_war):
+        war = War(headless=True, number_of_players=4)
+        war.deal_hands()
+        cards = [Card(Rank.KING, Suit.SPADES), Card(Rank.TWO, Suit.SPADES), Card(Rank.KING, Suit.HEARTS),
+                 Card(Rank.TEN, Suit.SPADES)]
+
+        war.determine_round_winner(*([card] for card in cards))
+        mock_declare_war.assert_called_once_with([war.players[0], war.players[2]])
+
+    def test__declare_war__eliminates_short_players(self):
+        war = War(headless=True, number_of_players=3)
+        war.deal_hands()
+        war.players[0].hand = CardDeck([Card(Rank.FOUR, Suit.SPADES)])
+        for player in war.players:
+            war.play_top_card(player)
+
+        war.declare_war([war.players[0], war.players[2]])
+        self.assertEqual({war.players[0]}, war.eliminated_players)
+        self.assertEqual(war.players[2], war.round_winner)
+        self.assertIsNone(war.game_winner)
+        self.assertTrue(war.forfeit)
+        # Player 2 is still in the game, so the round winner collects every play pile
+        self.assertEqual(16 + 3, war.players[2].hand_count())
+        self.assertNotIn(war.players[0], war.players_in_play())
+
+    def test__run_to_completion__number_of_players(self):
+        war = War(headless=True, rng=random.Random(3), number_of_players=5, decks=2)
+        result = war.run_to_completion()
+
+        self.assertIn(result.winner, range(5))
+        self.assertEqual(war.players[result.winner].name, result.winner_name)
+        self.assertEqual(set(), war.eliminated_players)
+
+    def test__deal_hands__deck(self):
+        deck = CardDeck([Card(rank, suit) for rank in [Rank.TWO, Rank.THREE, Rank.FOUR, Rank.ACE] for suit in Suit])
+        for shoe_views in [False, True]:
+            war = War(headless=True, deck=deck, decks=2, seed=4, shoe_views=shoe_views)
+            war.deal_hands()
+
+            # Every game is dealt new copies of the deck's cards
+            self.assertEqual([16, 16], [player.hand_count() for player in war.players])
+            self.assertEqual({Rank.TWO, Rank.THREE, Rank.FOUR, Rank.ACE},
+                             {card.rank for card in war.player_one.hand.cards})
+            self.assertFalse(set(map(id, deck.cards)) & set(map(id, war.player_one.hand.cards)))
\ No newline at end of file
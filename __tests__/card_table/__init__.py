@@ -0,0 +1 @@
+from .test__server import TestServer
\ No newline at end of file
@@ -0,0 +1,122 @@
+import asyncio
+import unittest
+
+from card_table.server import WarServer
+
+
+class Client:
+    """A stand-in client, reading whole responses (game output and the status line) from the server"""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    async def read_response(self):
+        output = []
+        while True:
+            line = (await self.reader.readline()).decode().rstrip('\n')
+            if not line.startswith('| '):
+                return output, line
+            output.append(line[2:])
+
+    async def send(self, command: str):
+        self.writer.write(f'{command}\n'.encode())
+        await self.writer.drain()
+        return await self.read_response()
+
+
+class TestServer(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.server = WarServer(port=0, max_sessions=50, seed=1)
+        await self.server.start()
+        self.clients = []
+
+    async def asyncTearDown(self):
+        await self.server.close()
+        for client in self.clients:
+            client.writer.close()
+
+    async def connect(self) -> Client:
+        client = Client(*await asyncio.open_connection('127.0.0.1', self.server.port))
+        self.clients.append(client)
+        _, greeting = await client.read_response()
+        self.assertTrue(greeting.startswith('OK Welcome'))
+        return client
+
+    async def test__play(self):
+        client = await self.connect()
+
+        _, status = await client.send('PLAY')
+        self.assertTrue(status.startswith('ERR No game'))
+
+        _, status = await client.send('NEW FOO BAR')
+        self.assertEqual('OK Dealt 2 players', status)
+
+        output, status = await client.send('PLAY')
+        self.assertEqual('OK Round 1', status)
+        self.assertIn('\t\tROUND 1', output)
+        self.assertIn('FOO plays:', output)
+
+        output, status = await client.send('')
+        self.assertEqual('OK Round 2', status)
+
+        output, status = await client.send('status')
+        self.assertEqual('OK Round 2', status)
+        self.assertTrue(output[0].startswith('Name: FOO, Card Count: '))
+        self.assertEqual(52, sum(int(line.split(': ')[-1]) for line in output))
+
+        _, status = await client.send('QUIT')
+        self.assertEqual('OK Goodbye!', status)
+
+    async def test__skip(self):
+        client = await self.connect()
+        await client.send('NEW')
+
+        output, status = await client.send('SKIP')
+        self.assertTrue(status.startswith('OK Game over after'))
+        self.assertIn('=============GAME OVER!=============', output)
+        self.assertFalse(any('plays:' in line for line in output))
+        self.assertFalse(any('ROUND' in line for line in output))
+
+        _, status = await client.send('SKIP')
+        self.assertTrue(status.startswith('ERR No game'))
+
+    async def test__invalid_commands(self):
+        client = await self.connect()
+
+        _, status = await client.send('FOO')
+        self.assertEqual('ERR Unknown command FOO', status)
+        _, status = await client.send('NEW SOLO')
+        self.assertEqual('ERR War requires at least 2 players', status)
+        _, status = await client.send('X' * 2000)
+        self.assertEqual('ERR line too long', status)
+
+    async def test__new__too_many_players(self):
+        client = await self.connect()
+
+        _, status = await client.send('NEW ' + ' '.join(['P'] * 9))
+        self.assertEqual('ERR At most 8 players can play at a table', status)
+        _, status = await client.send('PLAY')
+        self.assertTrue(status.startswith('ERR No game'))
+
+        _, status = await client.send('NEW ' + ' '.join(['P'] * 8))
+        self.assertEqual('OK Dealt 8 players', status)
+
+    async def test__concurrent_sessions(self):
+        clients = [await self.connect() for _ in range(20)]
+        for client in clients:
+            await client.send('NEW')
+
+        responses = await asyncio.gather(*[client.send('SKIP') for client in clients])
+        self.assertTrue(all(status.startswith('OK Game over') for _, status in responses))
+        self.assertEqual(20, len(self.server.sessions))
+
+    async def test__server_full(self):
+        self.server.max_sessions = 1
+        client = await self.connect()
+
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.server.port)
+        self.assertEqual(b'ERR Server full\n', await reader.readline())
+        writer.close()
+        await client.send('QUIT')
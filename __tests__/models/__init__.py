@@ -1,3 +1,6 @@
 from .test__card import TestCard
 from .test__card_deck import TestCardDeck
-from .test__player import TestPlayer
\ No newline at end of file
+from .test__compact_deck import TestCompactDeck
+from .test__permutation import TestPermutation
+from .test__player import TestPlayer
+from .test__shoe_view import TestShoeView
\ No newline at end of file
@@ -1,7 +1,8 @@
 import unittest
 
 from enums import Rank, Suit
-from models import Card
+from models import Card, card_code
+from models.card import STANDARD_DECK
 
 
 class TestCard(unittest.TestCase):
@@ -37,3 +38,44 @@ class TestCard(unittest.TestCase):
         self.assertFalse(card.face_up)
         card.flip()
         self.assertTrue(card.face_up)
+
+    def test__to_code(self):
+        self.assertEqual(0, Card(Rank.TWO, Suit.CLUBS).to_code())
+        self.assertEqual(51, Card(Rank.ACE, Suit.SPADES).to_code())
+        self.assertEqual(51 | card_code.FACE_UP, Card(Rank.ACE, Suit.SPADES, face_up=True).to_code())
+
+    def test__from_code(self):
+        for code in range(52):
+            for face_up in [False, True]:
+                card = Card.from_code(code | (card_code.FACE_UP if face_up else 0))
+                self.assertEqual(card_code.RANKS[code // 4], card.rank)
+                self.assertEqual(card_code.SUITS[code % 4], card.suit)
+                self.assertEqual(face_up, card.face_up)
+                self.assertEqual(card.to_code(), Card.from_code(card.to_code()).to_code())
+
+    def test__slots(self):
+        card = Card(Rank.KING, Suit.HEARTS)
+        self.assertFalse(hasattr(card, '__dict__'))
+
+    def test__from_trusted(self):
+        cards = Card.from_trusted(STANDARD_DECK)
+
+        self.assertEqual(52, len(cards))
+        self.assertEqual(STANDARD_DECK, tuple((card.rank, card.suit) for card in cards))
+        self.assertFalse(any(card.face_up for card in cards))
+        self.assertTrue(all(card.face_up for card in Card.from_trusted(STANDARD_DECK[:2], face_up=True)))
+
+    def test__str(self):
+        card = Card(Rank.TEN, Suit.HEARTS, face_up=True)
+        self.assertEqual(
+            '┌───────┐\n'
+            '| 10    |\n'
+            '|       |\n'
+            '|   ♥   |\n'
+            '|       |\n'
+            '|    10 |\n'
+            '└───────┘', str(card))
+
+        card.flip()
+        self.assertEqual('┌───────┐\n' + '| ----- |\n' * 5 + '└───────┘', str(card))
+        self.assertEqual(tuple(str(card).split('\n')), card.lines())
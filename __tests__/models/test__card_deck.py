@@ -12,7 +12,31 @@ class TestCardDeck(unittest.TestCase):
 
         cards = [Card(Rank.FOUR, Suit.SPADES)]
         deck_2 = CardDeck(cards)
-        self.assertEqual(cards, deck_2.cards)
+        self.assertEqual(cards, list(deck_2.cards))
+
+    def test__init__shoe(self):
+        deck = CardDeck(decks=3)
+        self.assertEqual(156, deck.card_count())
+        self.assertEqual(3, sum(1 for card in deck.cards if card.rank == Rank.ACE and card.suit == Suit.SPADES))
+
+    def test__init__empty(self):
+        deck = CardDeck([])
+        self.assertEqual(0, deck.card_count())
+
+    def test__cards(self):
+        cards = [Card(Rank.FOUR, Suit.SPADES), Card(Rank.EIGHT, Suit.SPADES), Card(Rank.ACE, Suit.HEARTS)]
+        deck = CardDeck(cards)
+
+        # The cards are a list copy of the deck's queue, so they slice and compare like a list
+        self.assertEqual(cards, deck.cards)
+        self.assertEqual(cards[1:], deck.cards[1:])
+        deck.cards.pop()
+        self.assertEqual(3, deck.card_count())
+        self.assertEqual(cards, list(deck.queue))
+
+        deck.cards = cards[:1]
+        self.assertEqual(cards[:1], deck.cards)
+        self.assertEqual(1, len(deck.queue))
 
     def test__card_count(self):
         cards = [Card(Rank.FOUR, Suit.SPADES), Card(Rank.EIGHT, Suit.SPADES)]
@@ -33,6 +57,19 @@ class TestCardDeck(unittest.TestCase):
         self.assertEqual(17, len(hands[1].cards))
         self.assertEqual(17, len(hands[2].cards))
 
+    def test__deal__more_hands_than_cards(self):
+        deck = CardDeck([Card(Rank.FOUR, Suit.SPADES), Card(Rank.EIGHT, Suit.SPADES)])
+        hands = deck.deal(3)
+        self.assertEqual([1, 1, 0], [hand.card_count() for hand in hands])
+
+    def test__deal__order(self):
+        deck = CardDeck()
+        cards = list(deck.cards)
+        hands = deck.deal(3)
+        self.assertEqual(cards[0::3], list(hands[0].cards))
+        self.assertEqual(cards[1::3], list(hands[1].cards))
+        self.assertEqual(cards[2::3], list(hands[2].cards))
+
     def test__draw(self):
         deck = CardDeck()
         first_card = deck.cards[0]
@@ -58,4 +95,25 @@ class TestCardDeck(unittest.TestCase):
         self.assertEqual(2, len(deck.cards))
         self.assertEqual(card_2, deck.cards[-1])
 
+    def test__draw__then_add(self):
+        deck = CardDeck()
+        cards = list(deck.cards)
+
+        drawn_cards = deck.draw()
+        self.assertEqual([cards[0]], drawn_cards)
+
+        deck.add(drawn_cards)
+        self.assertEqual(cards[1:] + cards[:1], list(deck.cards))
+        self.assertEqual(cards[1], deck.cards[0])
+
+    def test__str(self):
+        cards = [Card(Rank.ACE, Suit.SPADES, face_up=True)] + [Card(Rank.TWO, Suit.CLUBS) for _ in range(5)]
+        deck = CardDeck(cards)
 
+        lines = str(deck).split('\n')
+        self.assertEqual(15, len(lines))
+        self.assertEqual('', lines[-1])
+        self.assertEqual('┌───────┐' * 5, lines[0])
+        self.assertEqual('| A     |' + '| ----- |' * 4, lines[1])
+        self.assertEqual('┌───────┐', lines[7])
+        self.assertEqual('| ----- |', lines[8])
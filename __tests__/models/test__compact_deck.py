@@ -0,0 +1,60 @@
+import random
+import unittest
+
+from enums import Rank, Suit
+from models import Card, CardDeck, CompactDeck, card_code
+
+
+class TestCompactDeck(unittest.TestCase):
+
+    def test__init(self):
+        deck = CompactDeck()
+        self.assertEqual(52, deck.card_count())
+        self.assertEqual(set(range(52)), set(deck.codes))
+
+        deck_2 = CompactDeck(b'\x01\x02')
+        self.assertEqual(bytearray(b'\x01\x02'), deck_2.codes)
+
+        empty_deck = CompactDeck(b'')
+        self.assertEqual(0, empty_deck.card_count())
+
+    def test__shuffle(self):
+        deck = CompactDeck(bytes([1 | card_code.FACE_UP, 2, 3 | card_code.FACE_UP]))
+        deck.shuffle(random.Random(1))
+        self.assertEqual([1, 2, 3], sorted(deck.codes))
+
+    def test__deal(self):
+        deck = CompactDeck()
+        hands = deck.deal(3)
+        self.assertEqual(deck.codes[0::3], hands[0].codes)
+        self.assertEqual(17, hands[1].card_count())
+        self.assertEqual(17, hands[2].card_count())
+
+    def test__draw(self):
+        deck = CompactDeck(bytes([5, 6, 7, 8]))
+        self.assertEqual(bytearray([5]), deck.draw())
+        self.assertEqual(bytearray([6, 7]), deck.draw(2))
+        self.assertEqual(1, deck.card_count())
+
+        with self.assertRaises(IndexError):
+            deck.draw(2)
+
+    def test__add(self):
+        deck = CompactDeck(bytes([5]))
+        deck.add(bytes([6, 7]))
+        self.assertEqual(bytearray([5, 6, 7]), deck.codes)
+
+    def test__from_cards__to_cards(self):
+        cards = [Card(Rank.FOUR, Suit.SPADES), Card(Rank.ACE, Suit.HEARTS, face_up=True)]
+        deck = CompactDeck.from_cards(cards)
+        self.assertEqual(bytearray([card.to_code() for card in cards]), deck.codes)
+
+        rebuilt_cards = deck.to_cards()
+        self.assertEqual([Rank.FOUR, Rank.ACE], [card.rank for card in rebuilt_cards])
+        self.assertEqual([Suit.SPADES, Suit.HEARTS], [card.suit for card in rebuilt_cards])
+        self.assertEqual([False, True], [card.face_up for card in rebuilt_cards])
+
+    def test__matches_card_deck_order(self):
+        cards = list(CardDeck(rng=random.Random(3)).cards)
+        codes = CompactDeck(rng=random.Random(3)).codes
+        self.assertEqual([card.to_code() for card in cards], list(codes))
@@ -0,0 +1,39 @@
+import unittest
+
+from enums import Rank, Suit
+from models import Card, CardDeck, CompactDeck, card_code
+from models.permutation import permute, seeded_permutation
+
+
+class TestPermutation(unittest.TestCase):
+
+    def test__seeded_permutation(self):
+        order = seeded_permutation(7, 52)
+
+        self.assertEqual(list(range(52)), sorted(order))
+        self.assertEqual(order, seeded_permutation(7, 52))
+        self.assertNotEqual(order, seeded_permutation(8, 52))
+        self.assertEqual([], seeded_permutation(7, 0))
+
+    def test__seeded_permutation__stable(self):
+        # Permutations are part of the replay log format, so must never change for a seed
+        self.assertEqual([3, 4, 2, 1, 0], seeded_permutation(1, 5))
+
+    def test__permute(self):
+        self.assertEqual(['c', 'a', 'b'], permute('abc', [2, 0, 1]))
+        self.assertEqual(['a'], permute('a', [0]))
+        self.assertEqual([], permute('', []))
+
+    def test__card_deck__shuffle_seeded(self):
+        cards = [Card(Rank.ACE, Suit.SPADES, face_up=True), Card(Rank.TWO, Suit.CLUBS), Card(Rank.KING, Suit.HEARTS)]
+        deck = CardDeck(cards)
+        deck.shuffle_seeded(3)
+
+        self.assertEqual(permute(cards, seeded_permutation(3, 3)), list(deck.cards))
+        self.assertFalse(any(card.face_up for card in deck.cards))
+
+    def test__compact_deck__shuffle_seeded(self):
+        deck = CompactDeck(bytes([1 | card_code.FACE_UP, 2, 3]))
+        deck.shuffle_seeded(3)
+
+        self.assertEqual(bytearray(permute(bytes([1, 2, 3]), seeded_permutation(3, 3))), deck.codes)
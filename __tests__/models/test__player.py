@@ -20,7 +20,7 @@ class TestPlayer(unittest.TestCase):
 
         self.assertIsNone(player.hand)
         player.add_to_hand(cards)
-        self.assertEqual(cards, player.hand.cards)
+        self.assertEqual(cards, list(player.hand.cards))
 
         cards_2 = [
             Card(Rank.FOUR, Suit.CLUBS, face_up=True),
@@ -35,14 +35,14 @@ class TestPlayer(unittest.TestCase):
 
         self.assertIsNone(player.play_pile)
         player.add_to_play_pile(cards)
-        self.assertEqual(cards, player.play_pile.cards)
+        self.assertEqual(cards, list(player.play_pile.cards))
 
         cards_2 = [
             Card(Rank.FOUR, Suit.CLUBS),
             Card(Rank.EIGHT, Suit.CLUBS)
         ]
         player.add_to_play_pile(cards_2)
-        self.assertEqual(cards_2, player.play_pile.cards[-2:])
+        self.assertEqual(cards_2, list(player.play_pile.cards)[-2:])
         self.assertFalse(player.play_pile.cards[-1].face_up)
 
     def test__clear_play_pile(self):
@@ -50,7 +50,7 @@ class TestPlayer(unittest.TestCase):
         cards = [Card(Rank.FOUR, Suit.SPADES), Card(Rank.EIGHT, Suit.SPADES)]
         player.add_to_play_pile(cards)
 
-        self.assertEqual(cards, player.play_pile.cards)
+        self.assertEqual(cards, list(player.play_pile.cards))
         player.clear_play_pile()
         self.assertIsNone(player.play_pile)
 
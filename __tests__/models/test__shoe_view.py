@@ -0,0 +1,89 @@
+import random
+import unittest
+from unittest import mock
+
+from card_games import War
+from enums import Rank, Suit
+from models import Card, CompactDeck, ShoeView, card_code
+
+
+class TestShoeView(unittest.TestCase):
+
+    def test__deal_views(self):
+        deck = CompactDeck(rng=random.Random(4), decks=2)
+        views = deck.deal_views(3)
+
+        self.assertEqual([35, 35, 34], [view.card_count() for view in views])
+        self.assertTrue(all(view.shoe is deck.codes for view in views))
+        self.assertEqual([card.to_code() for card in CompactDeck(deck.codes[1::3]).to_cards()],
+                         [card.to_code() for card in views[1].cards])
+
+    def test__draw(self):
+        view = ShoeView(bytearray([0, 1, 2, 3, 4, 5]), 1, 2)
+        card = Card(Rank.ACE, Suit.SPADES)
+        view.add([card])
+
+        drawn_cards = view.draw(2)
+        self.assertEqual([1, 3], [card.to_code() for card in drawn_cards])
+        self.assertEqual(2, view.card_count())
+
+        drawn_cards = view.draw(2)
+        self.assertEqual(5, drawn_cards[0].to_code())
+        self.assertIs(card, drawn_cards[1])
+        self.assertEqual(0, view.card_count())
+
+    def test__cards(self):
+        view = ShoeView(bytearray([0, 1, 2]), 0, 1)
+        card = Card(Rank.ACE, Suit.SPADES)
+        view.add([card])
+
+        cards = view.cards
+        self.assertEqual([0, 1, 2], [card.to_code() for card in list(cards)[:3]])
+        self.assertIs(card, cards[-1])
+        # Building the cards is done once, so they keep their identity
+        self.assertIs(cards[0], view.cards[0])
+        self.assertEqual(0, view.remaining)
+        self.assertEqual(4, view.card_count())
+
+    def test__signature(self):
+        views = CompactDeck(bytes(range(6))).deal_views(2)
+        self.assertEqual((0, 2, 4), views[0].signature())
+
+        # Cards keep the index of the shoe they were dealt from, whichever hand they are added to
+        views[1].add(views[0].draw())
+        card = Card(Rank.ACE, Suit.SPADES)
+        views[1].add([card])
+        self.assertEqual((1, 3, 5, 0, id(card)), views[1].signature())
+        self.assertEqual(3, views[1].remaining)
+        self.assertEqual(views[1].signature(), tuple(views[1].positions.get(card, id(card)) for card in views[1].cards))
+
+    def test__is_top_card_face_up(self):
+        view = ShoeView(bytearray([1 | card_code.FACE_UP]), 0, 1)
+        self.assertTrue(view.is_top_card_face_up())
+
+        view.add(view.draw())
+        self.assertTrue(view.is_top_card_face_up())
+        view.shuffle(random.Random(0))
+        self.assertFalse(view.is_top_card_face_up())
+
+    def test__shuffle_seeded(self):
+        view = ShoeView(bytearray([0, 1, 2]), 0, 1)
+        cards = view.draw(3)
+        for card in cards:
+            card.flip()
+        view.add(cards)
+
+        # Every dealt card has been drawn by the time the top card is face up, so nothing is built
+        self.assertTrue(view.is_top_card_face_up())
+        with mock.patch.object(Card, 'from_code') as from_code:
+            view.shuffle_seeded(7)
+        from_code.assert_not_called()
+        self.assertEqual(sorted(map(id, cards)), sorted(map(id, view.cards)))
+        self.assertFalse(any(card.face_up for card in view.cards))
+
+    def test__war(self):
+        for seed in range(5):
+            result = War(headless=True, rng=random.Random(seed), shoe_views=True).run_to_completion()
+            expected = War(headless=True, rng=random.Random(seed)).run_to_completion()
+            self.assertEqual((expected.winner, expected.round_number, expected.war_count),
+                             (result.winner, result.round_number, result.war_count))
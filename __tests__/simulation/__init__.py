@@ -0,0 +1,8 @@
+from .test__checkpoint import TestCheckpoint
+from .test__results_store import TestResultsStore
+from .test__sequential import TestSequential
+from .test__simulator import TestSimulator
+from .test__solver import TestSolver
+from .test__statistics import TestStatistics
+from .test__sweep import TestSweep
+from .test__vectorized import TestVectorizedWar
\ No newline at end of file
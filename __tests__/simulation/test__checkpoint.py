@@ -0,0 +1,116 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from simulation import SimulationResults, simulate
+from simulation.checkpoint import SimulationCheckpoint, read_slot
+from simulation.simulator import simulate_games
+
+
+SETTINGS = {'n_games': 12, 'seed': 5, 'reshuffle': True, 'max_rounds': None, 'number_of_players': 2, 'decks': 1,
+            'variant': None}
+
+
+class TestCheckpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'simulation.checkpoint')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def assertResultsEqual(self, expected: SimulationResults, actual: SimulationResults):
+        self.assertEqual(expected.game_count, actual.game_count)
+        self.assertEqual(expected.wins, actual.wins)
+        self.assertEqual(expected.rounds.histogram.counts, actual.rounds.histogram.counts)
+        self.assertEqual(expected.rounds.log_histogram.counts, actual.rounds.log_histogram.counts)
+        self.assertEqual(expected.rounds.moments.total_of_squares, actual.rounds.moments.total_of_squares)
+        self.assertEqual(expected.wars.histogram.counts, actual.wars.histogram.counts)
+        self.assertEqual(expected.forfeit_count, actual.forfeit_count)
+
+    def test__save__load(self):
+        checkpoint = SimulationCheckpoint(self.path)
+        checkpoint.start(SETTINGS, 4, simulate_games(5, 0, 4))
+        checkpoint.complete(0)
+        checkpoint.save()
+
+        loaded = SimulationCheckpoint(self.path)
+        self.assertTrue(loaded.load(SETTINGS))
+        self.assertEqual(4, loaded.chunk_size)
+        self.assertEqual({0}, loaded.completed)
+        self.assertEqual(1, loaded.sequence)
+        self.assertResultsEqual(checkpoint.results, loaded.results)
+
+    def test__load__no_checkpoint(self):
+        self.assertFalse(SimulationCheckpoint(self.path).load(SETTINGS))
+
+    def test__load__different_simulation(self):
+        checkpoint = SimulationCheckpoint(self.path)
+        checkpoint.start(SETTINGS, 4, SimulationResults())
+        checkpoint.save()
+
+        with self.assertRaises(Exception):
+            SimulationCheckpoint(self.path).load(dict(SETTINGS, seed=6))
+
+    def test__save__double_buffered(self):
+        checkpoint = SimulationCheckpoint(self.path)
+        checkpoint.start(SETTINGS, 4, SimulationResults())
+        checkpoint.complete(0)
+        checkpoint.save()
+        checkpoint.complete(4)
+        checkpoint.save()
+        self.assertEqual(1, read_slot(self.path + '.1')[0])
+        self.assertEqual(2, read_slot(self.path + '.0')[0])
+
+        # A save torn part way through leaves the previous checkpoint to resume from
+        with open(self.path + '.0', 'r+b') as slot_file:
+            slot_file.truncate(os.path.getsize(self.path + '.0') - 1)
+        self.assertIsNone(read_slot(self.path + '.0'))
+        loaded = SimulationCheckpoint(self.path)
+        self.assertTrue(loaded.load(SETTINGS))
+        self.assertEqual({0}, loaded.completed)
+
+        # The next save then overwrites the torn slot
+        loaded.save()
+        self.assertEqual(2, read_slot(self.path + '.0')[0])
+
+    def test__complete__interval(self):
+        checkpoint = SimulationCheckpoint(self.path, interval=3600)
+        checkpoint.start(SETTINGS, 4, SimulationResults())
+        checkpoint.complete(0)
+        self.assertIsNone(read_slot(self.path + '.1'))
+
+        checkpoint.interval = 0
+        checkpoint.complete(4)
+        self.assertEqual({0, 4}, read_slot(self.path + '.1')[1]['completed'])
+
+    def test__simulate__resume(self):
+        expected = simulate(12, workers=1, seed=5, chunk_size=4)
+
+        # Interrupt the simulation while it plays its third chunk
+        calls = []
+        def interrupt_third_chunk(*args):
+            calls.append(args)
+            if len(calls) == 3:
+                raise KeyboardInterrupt
+            return simulate_games(*args)
+        with mock.patch('simulation.simulator.simulate_games', side_effect=interrupt_third_chunk):
+            with self.assertRaises(KeyboardInterrupt):
+                simulate(12, workers=1, seed=5, chunk_size=4, checkpoint_path=self.path, checkpoint_interval=0)
+
+        # Resuming only plays the chunk that wasn't completed, even with a different number of workers
+        with mock.patch('simulation.simulator.simulate_games', side_effect=simulate_games) as resumed_games:
+            results = simulate(12, workers=1, seed=5, checkpoint_path=self.path)
+        self.assertEqual([mock.call(5, 8, 12, True, None, 2, 1, None)], resumed_games.call_args_list)
+        self.assertResultsEqual(expected, results)
+
+    def test__simulate__workers(self):
+        expected = simulate(12, workers=1, seed=5)
+        results = simulate(12, workers=2, seed=5, chunk_size=5, checkpoint_path=self.path, checkpoint_interval=0)
+        self.assertResultsEqual(expected, results)
+
+        checkpoint = SimulationCheckpoint(self.path)
+        checkpoint.load(SETTINGS)
+        self.assertEqual({0, 5, 10}, checkpoint.completed)
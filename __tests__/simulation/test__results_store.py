@@ -0,0 +1,185 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from card_games import GameResult
+from simulation import results_store
+from simulation.results_store import ResultsStore, ResultsStoreWriter, concatenate, simulate_to_store, store_games
+from simulation.simulator import play_games
+
+
+RESULTS = [GameResult(0, 'Player 1', 120, 4), GameResult(1, 'Player 2', 6000, 30, forfeit=True),
+           GameResult(None, None, 5001, 25, cycle=True), GameResult(1, 'Player 2', 80, 2)]
+
+
+class TestResultsStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'results')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, path: str, start: int = 0, results=RESULTS, seed: int = 0):
+        with ResultsStoreWriter(path, seed) as writer:
+            writer.extend(start, results)
+
+    def test__records(self):
+        self.write(self.path, start=10)
+        with ResultsStore(self.path) as store:
+            records = list(store.records())
+
+        self.assertEqual(4, store.count)
+        self.assertEqual([10, 11, 12, 13], [record.game_number for record in records])
+        self.assertEqual([0, 1, -1, 1], [record.winner for record in records])
+        self.assertEqual([120, 6000, 5001, 80], [record.round_number for record in records])
+        self.assertEqual([4, 30, 25, 2], [record.war_count for record in records])
+        self.assertEqual([False, True, False, False], [record.forfeit for record in records])
+        self.assertEqual([False, False, True, False], [record.cycle for record in records])
+        self.assertTrue(records[2].is_draw())
+
+    def test__records__many_seats(self):
+        self.write(self.path, results=[GameResult(200, 'Player 201', 300, 9), GameResult(32767, None, 1, 0)])
+        with ResultsStore(self.path) as store:
+            self.assertEqual([200, 32767], [record.winner for record in store.records()])
+            self.assertEqual([0], [record.game_number for record in store.scan(winner=200)])
+
+    def test__records__empty(self):
+        self.write(self.path, results=[])
+        with ResultsStore(self.path) as store:
+            self.assertEqual([], list(store.records()))
+            self.assertEqual([], list(store.scan(round_number=(5000, None))))
+
+    def test__append__batches(self):
+        with mock.patch.object(results_store, 'BATCH_SIZE', 3):
+            writer = ResultsStoreWriter(self.path)
+            writer.extend(0, RESULTS)
+
+            # Only the complete batch is recorded in the manifest until the writer is closed
+            self.assertEqual(3, ResultsStore(self.path).count)
+            writer.close()
+        self.assertEqual(4, ResultsStore(self.path).count)
+
+    def test__append__resumes_after_last_batch(self):
+        self.write(self.path, results=RESULTS[:2])
+        with open(os.path.join(self.path, 'round_number.col'), 'ab') as column_file:
+            column_file.write(b'\xff' * 6)
+
+        # The torn rows past the manifest's count are overwritten
+        self.write(self.path, start=2, results=RESULTS[2:])
+        with ResultsStore(self.path) as store:
+            self.assertEqual([120, 6000, 5001, 80], list(store.column('round_number')))
+
+    def test__append__different_seed(self):
+        self.write(self.path, seed=1)
+        with self.assertRaises(Exception):
+            ResultsStoreWriter(self.path, seed=2)
+
+    def test__scan(self):
+        self.write(self.path)
+        for numpy in (results_store.np, None):
+            with mock.patch.object(results_store, 'np', numpy), ResultsStore(self.path) as store:
+                self.assertEqual([1, 2], [record.game_number for record in store.scan(round_number=(5000, None))])
+                self.assertEqual([1], [record.game_number for record in store.scan(round_number=(5000, None),
+                                                                                  cycle=False)])
+                self.assertEqual([1, 3], [record.game_number for record in store.scan(winner=1)])
+                self.assertEqual([0, 3], [record.game_number for record in store.scan(war_count=(None, 10))])
+                self.assertEqual([0, 2, 3], [record.game_number for record in store.scan(forfeit=False)])
+
+    def test__scan__blocks(self):
+        self.write(self.path)
+        with mock.patch.object(results_store, 'SCAN_BLOCK', 3), ResultsStore(self.path) as store:
+            self.assertEqual([1, 3], [record.game_number for record in store.scan(winner=1)])
+
+    def test__scan__invalid_condition(self):
+        self.write(self.path)
+        with ResultsStore(self.path) as store, self.assertRaises(Exception):
+            list(store.scan(flags=1))
+
+    @unittest.skipIf(results_store.np is None, 'NumPy is not installed')
+    def test__array(self):
+        self.write(self.path)
+        store = ResultsStore(self.path)
+        self.assertEqual([120, 6000, 5001, 80], store.array('round_number').tolist())
+        self.assertEqual([0, 1, -1, 1], store.array('winner').tolist())
+
+    @unittest.skipIf(results_store.np is None, 'NumPy is not installed')
+    def test__array__cached(self):
+        self.write(self.path)
+        store = ResultsStore(self.path)
+        self.assertIs(store.array('round_number'), store.array('round_number'))
+        store.close()
+        self.assertEqual({}, store.arrays)
+
+    def test__refresh(self):
+        with ResultsStoreWriter(self.path) as writer:
+            writer.extend(0, RESULTS[:2])
+            writer.flush()
+            store = ResultsStore(self.path)
+            self.assertEqual([120, 6000], list(store.column('round_number')))
+            if results_store.np is not None:
+                self.assertEqual([120, 6000], store.array('round_number').tolist())
+
+            writer.extend(2, RESULTS[2:])
+            writer.flush()
+            store.refresh()
+            self.assertEqual([120, 6000, 5001, 80], list(store.column('round_number')))
+            if results_store.np is not None:
+                self.assertEqual([120, 6000, 5001, 80], store.array('round_number').tolist())
+            store.close()
+
+    def test__concatenate(self):
+        shard_paths = [os.path.join(self.directory.name, f'shard{index}') for index in range(2)]
+        self.write(shard_paths[0], start=0, results=RESULTS[:3])
+        self.write(shard_paths[1], start=3, results=RESULTS[3:])
+
+        concatenate(shard_paths, self.path)
+        with ResultsStore(self.path) as store:
+            self.assertEqual([0, 1, 2, 3], list(store.column('game_number')))
+            self.assertEqual([120, 6000, 5001, 80], list(store.column('round_number')))
+
+    def test__concatenate__different_seeds(self):
+        shard_paths = [os.path.join(self.directory.name, f'shard{index}') for index in range(2)]
+        for seed, shard_path in enumerate(shard_paths):
+            self.write(shard_path, seed=seed)
+        with self.assertRaises(Exception):
+            concatenate(shard_paths, self.path)
+
+    def test__store_games(self):
+        store_games(self.path, 7, 0, 5, max_rounds=500)
+        expected = list(play_games(7, 0, 5, max_rounds=500))
+        with ResultsStore(self.path) as store:
+            self.assertEqual(7, store.seed)
+            self.assertEqual([result.round_number for result in expected], list(store.column('round_number')))
+            self.assertEqual([-1 if result.winner is None else result.winner for result in expected],
+                             list(store.column('winner')))
+
+    def test__simulate_to_store__shards(self):
+        single_path = os.path.join(self.directory.name, 'single')
+        simulate_to_store(10, single_path, workers=1, seed=3).close()
+        store = simulate_to_store(10, self.path, workers=2, seed=3, chunk_size=3)
+
+        self.assertFalse(os.path.exists(self.path + '.shards'))
+        with store, ResultsStore(single_path) as single:
+            self.assertEqual(list(range(10)), list(store.column('game_number')))
+            for name in results_store.COLUMNS:
+                self.assertEqual(list(single.column(name)), list(store.column(name)))
+
+    def test__simulate_to_store__replaces_store(self):
+        for workers in (1, 2):
+            for _ in range(2):
+                with simulate_to_store(6, self.path, workers=workers, seed=3, chunk_size=4) as store:
+                    self.assertEqual(list(range(6)), list(store.column('game_number')))
+
+        # A store of a different simulation is replaced too, rather than refused
+        with simulate_to_store(3, self.path, workers=1, seed=4) as store:
+            self.assertEqual(4, store.seed)
+            self.assertEqual(3, store.count)
+
+    def test__simulate_to_store__stale_shards(self):
+        # A shard left by an interrupted run isn't appended to
+        self.write(os.path.join(self.path + '.shards', f'{0:012d}'), results=RESULTS[:2], seed=3)
+        with simulate_to_store(6, self.path, workers=2, seed=3, chunk_size=4) as store:
+            self.assertEqual(list(range(6)), list(store.column('game_number')))
\ No newline at end of file
@@ -0,0 +1,78 @@
+import unittest
+
+from card_games import GameResult
+from simulation import SimulationResults
+from simulation.sequential import PrecisionTarget, is_finished, simulate_until
+from simulation.simulator import simulate_games
+
+
+class TestSequential(unittest.TestCase):
+
+    def test__init__invalid_target(self):
+        for arguments in [('FOO', 0.01), ('win_rate', 0), ('win_rate', 0.01, 1.0)]:
+            with self.assertRaises(Exception):
+                PrecisionTarget(*arguments)
+
+    def test__interval_half_width__rate(self):
+        results = SimulationResults()
+        for game in range(10000):
+            results.add(GameResult(game % 2, None, 100))
+
+        # Close to the normal approximation z * sqrt(p * (1 - p) / n) for a large sample
+        target = PrecisionTarget('win_rate', 0.01, 0.95)
+        self.assertAlmostEqual(0.5, target.estimate(results))
+        self.assertAlmostEqual(1.959964 * 0.005, target.interval_half_width(results), places=5)
+        self.assertTrue(target.is_met(results))
+        self.assertFalse(PrecisionTarget('win_rate', 0.001, 0.95).is_met(results))
+
+    def test__interval_half_width__rare_event(self):
+        results = SimulationResults()
+        for _ in range(100):
+            results.add(GameResult(0, None, 100))
+
+        # No forfeits yet doesn't mean the forfeit rate is known exactly
+        self.assertGreater(PrecisionTarget('forfeit_rate', 0.001).interval_half_width(results), 0.001)
+
+    def test__interval_half_width__mean(self):
+        results = SimulationResults()
+        for rounds in [90, 110] * 50:
+            results.add(GameResult(0, None, rounds))
+
+        target = PrecisionTarget('mean_rounds', 5, 0.95)
+        self.assertEqual(100, target.estimate(results))
+        self.assertAlmostEqual(1.959964 * results.rounds.moments.standard_deviation() / 10,
+                               target.interval_half_width(results), places=5)
+        self.assertTrue(target.is_met(results))
+
+    def test__is_finished(self):
+        results = simulate_games(0, 0, 20)
+        target = PrecisionTarget('mean_rounds', 1000)
+        self.assertFalse(is_finished(results, [target], min_games=100))
+        self.assertTrue(is_finished(results, [target], min_games=10))
+        self.assertTrue(is_finished(results, [PrecisionTarget('mean_rounds', 0.01)], min_games=10, max_games=20))
+
+    def test__simulate_until__stops_when_met(self):
+        target = PrecisionTarget('win_rate', 0.1, 0.9)
+        results = simulate_until([target], workers=1, seed=2, chunk_size=10, min_games=10)
+
+        self.assertTrue(target.is_met(results))
+        self.assertEqual(0, results.game_count % 10)
+        self.assertLess(results.game_count, 200)
+
+        # One chunk less wouldn't have met the target
+        if results.game_count > 10:
+            self.assertFalse(target.is_met(simulate_games(2, 0, results.game_count - 10)))
+
+    def test__simulate_until__max_games(self):
+        results = simulate_until([PrecisionTarget('mean_rounds', 0.01)], workers=1, chunk_size=8, min_games=1,
+                                 max_games=20)
+        self.assertEqual(20, results.game_count)
+
+    def test__simulate_until__reproducible(self):
+        targets = [PrecisionTarget('win_rate', 0.1, 0.9), PrecisionTarget('mean_rounds', 200, 0.9)]
+        results_1 = simulate_until(targets, workers=1, seed=9, chunk_size=6, min_games=6)
+        results_2 = simulate_until(targets, workers=2, seed=9, chunk_size=6, min_games=6)
+
+        self.assertEqual(results_1.game_count, results_2.game_count)
+        self.assertEqual(results_1.wins, results_2.wins)
+        self.assertEqual(results_1.rounds.moments.total_of_squares, results_2.rounds.moments.total_of_squares)
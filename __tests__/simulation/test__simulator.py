@@ -0,0 +1,139 @@
+import os
+import tempfile
+import unittest
+
+from card_games import GameResult
+from simulation import SimulationResults, simulate
+from card_games.round_trace import TraceReader
+from card_games.rule_variant import RuleVariant
+from simulation.simulator import play_games, record_game, simulate_games, trace_games
+
+
+class TestSimulator(unittest.TestCase):
+
+    def test__add(self):
+        results = SimulationResults()
+        results.add(GameResult(0, 'Player 1', 120, 7))
+        results.add(GameResult(1, 'Player 2', 120, 3, forfeit=True))
+
+        self.assertEqual(2, results.game_count)
+        self.assertEqual([1, 1], results.wins)
+        self.assertEqual(2, results.rounds.histogram.counts[120])
+        self.assertEqual(120, results.rounds.moments.mean())
+        self.assertEqual(1, results.wars.histogram.counts[7])
+        self.assertEqual(1, results.wars.histogram.counts[3])
+        self.assertEqual(1, results.forfeit_count)
+        self.assertEqual([0.5, 0.5], results.win_rates())
+
+    def test__merge(self):
+        results_1 = SimulationResults()
+        results_1.add(GameResult(0, 'Player 1', 10, 1))
+        results_2 = SimulationResults()
+        results_2.add(GameResult(0, 'Player 1', 10, 2, forfeit=True))
+
+        results_1.merge(results_2)
+        self.assertEqual(2, results_1.game_count)
+        self.assertEqual([2, 0], results_1.wins)
+        self.assertEqual(2, results_1.rounds.histogram.counts[10])
+        self.assertEqual(2, results_1.rounds.moments.count)
+        self.assertEqual(1, results_1.forfeit_count)
+
+    def test__add__long_game(self):
+        results = SimulationResults()
+        results.add(GameResult(0, 'Player 1', 25000, 1200))
+        other_results = SimulationResults()
+        other_results.add(GameResult(1, 'Player 2', 120, 7))
+        other_results.merge(results)
+
+        # Games over 10,000 rounds get a bin of their own, rather than overflowing
+        for aggregate in (results, other_results):
+            self.assertEqual(1, aggregate.rounds.histogram.counts[25000])
+            self.assertEqual(0, aggregate.rounds.histogram.overflow)
+            self.assertEqual(1, aggregate.wars.histogram.counts[1200])
+        self.assertEqual(1, other_results.rounds.histogram.counts[120])
+        self.assertEqual(25001, len(other_results.rounds.histogram.counts))
+
+    def test__consume(self):
+        results = SimulationResults()
+        results.consume(play_games(3, 0, 10))
+        self.assertEqual(10, results.game_count)
+        self.assertEqual(results.rounds.moments.total, simulate_games(3, 0, 10).rounds.moments.total)
+
+    def test__simulate_games(self):
+        results = simulate_games(3, 0, 10)
+        self.assertEqual(10, results.game_count)
+        self.assertEqual(10, sum(results.wins))
+        self.assertEqual(10, sum(results.rounds.histogram.counts) + results.rounds.histogram.overflow)
+
+    def test__simulate__reproducible(self):
+        results_1 = simulate(12, workers=1, seed=5)
+        results_2 = simulate(12, workers=2, seed=5, chunk_size=5)
+
+        self.assertEqual(12, results_1.game_count)
+        self.assertEqual(results_1.wins, results_2.wins)
+        self.assertEqual(results_1.rounds.histogram.counts, results_2.rounds.histogram.counts)
+        self.assertEqual(results_1.rounds.log_histogram.counts, results_2.rounds.log_histogram.counts)
+        self.assertEqual(results_1.rounds.moments.total_of_squares, results_2.rounds.moments.total_of_squares)
+        self.assertEqual(results_1.wars.histogram.counts, results_2.wars.histogram.counts)
+        self.assertEqual(results_1.forfeit_count, results_2.forfeit_count)
+
+    def test__add__draw(self):
+        results = SimulationResults()
+        results.add(GameResult(None, None, 563, 9, cycle=True))
+        results.add(GameResult(None, None, 1000, 4))
+
+        self.assertEqual(2, results.game_count)
+        self.assertEqual([0, 0], results.wins)
+        self.assertEqual(2, results.draw_count)
+        self.assertEqual(1, results.cycle_count)
+
+    def test__simulate__without_reshuffle(self):
+        results = simulate(10, workers=1, seed=0, reshuffle=False, max_rounds=100000)
+
+        self.assertEqual(10, results.game_count)
+        self.assertGreater(results.cycle_count, 0)
+        self.assertEqual(results.game_count, sum(results.wins) + results.draw_count)
+
+    def test__record_game(self):
+        results = simulate_games(4, 7, 8)
+        log = record_game(4, 7)
+
+        self.assertEqual(1, results.rounds.histogram.counts[len(log.round_winners)])
+        result = log.replay()
+        self.assertEqual(1, results.wins[result.winner])
+
+    def test__record_game__game_options(self):
+        options = {'number_of_players': 3, 'decks': 2, 'max_rounds': 3000, 'variant': RuleVariant(reshuffle='never')}
+        for game_number in range(3):
+            expected = next(play_games(6, game_number, game_number + 1, **options))
+            log = record_game(6, game_number, **options)
+
+            self.assertEqual(3, log.number_of_players)
+            self.assertEqual(expected.round_number, len(log.round_winners))
+            result = log.replay()
+            self.assertEqual((expected.winner, expected.round_number, expected.war_count),
+                             (result.winner, result.round_number, result.war_count))
+
+    def test__record_game__not_replayable(self):
+        with self.assertRaises(Exception) as context:
+            record_game(6, 0, variant=RuleVariant(ace_low=True))
+        self.assertIn('can\'t be recorded to a replay log', str(context.exception))
+
+    def test__simulate__number_of_players(self):
+        results = simulate(20, workers=1, seed=1, number_of_players=3, decks=2)
+
+        self.assertEqual(20, results.game_count)
+        self.assertEqual(3, len(results.wins))
+        self.assertEqual(20, sum(results.wins) + results.draw_count)
+
+    def test__trace_games(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'games.wartrace')
+            trace_games(path, 4, 10, 14, max_rounds=500)
+
+            with TraceReader(path) as reader:
+                self.assertEqual([10, 11, 12, 13], list(reader.game_ids()))
+                for game_number, result in zip(range(10, 14), play_games(4, 10, 14, max_rounds=500)):
+                    rounds = list(reader.rounds(game_number))
+                    self.assertEqual(result.round_number, len(rounds))
+                    self.assertEqual(result.war_count, sum(traced_round.war_depth for traced_round in rounds))
\ No newline at end of file
@@ -0,0 +1,94 @@
+import itertools
+import unittest
+
+from card_games import War
+from enums import Rank, Suit
+from models import Card, CardDeck
+from models.card_code import RANKS
+from simulation.solver import (CYCLE, TranspositionTable, WarSolver, count_distinct_permutations,
+                               distinct_permutations, play_round, solve)
+
+
+def reduced_deck(ranks, suits):
+    return CardDeck([Card(rank, suit) for rank in ranks for suit in suits])
+
+
+class TestSolver(unittest.TestCase):
+
+    def test__distinct_permutations(self):
+        permutations = list(distinct_permutations([1, 0, 1, 0]))
+
+        self.assertEqual(6, len(permutations))
+        self.assertEqual(len(permutations), len(set(permutations)))
+        self.assertEqual((0, 0, 1, 1), permutations[0])
+        self.assertEqual((1, 1, 0, 0), permutations[-1])
+        self.assertEqual(6, count_distinct_permutations([1, 0, 1, 0]))
+
+    def test__count_distinct_permutations(self):
+        self.assertEqual(34650, count_distinct_permutations([0, 1, 2] * 4))
+        self.assertEqual(sum(1 for _ in distinct_permutations([0, 1, 2] * 2)),
+                         count_distinct_permutations([0, 1, 2] * 2))
+
+    def test__play_round(self):
+        self.assertEqual((((1, 0), ()), 0, 0, False), play_round(((1,), (0,))))
+        self.assertEqual((((2,), (1, 0, 1)), 0, None, False), play_round(((0, 2), (1, 1))))
+
+    def test__play_round__forfeit(self):
+        # Player one doesn't have enough cards for war, but player two has ran out of cards
+        self.assertEqual((((1,), ()), 1, 0, True), play_round(((0, 1), (0,))))
+        self.assertEqual((((1,), (2, 2, 2, 2)), 1, 1, True), play_round(((0, 1), (0, 2, 2, 2, 2))))
+
+    def test__transposition_table(self):
+        table = TranspositionTable(capacity=2)
+        table.put(((0,), (1,)), CYCLE)
+        table.put(((1,), (0,)), CYCLE)
+        table.get(((0,), (1,)))
+        table.put(((2,), (0,)), CYCLE)
+
+        self.assertEqual(2, len(table))
+        self.assertIsNone(table.get(((1,), (0,))))
+        self.assertIs(CYCLE, table.get(((0,), (1,))))
+        self.assertEqual((2, 1, 1), (table.hits, table.misses, table.evictions))
+
+    def test__solve_deal__matches_war(self):
+        suits = list(Suit)
+        solver = WarSolver(reduced_deck([Rank.TWO, Rank.THREE, Rank.FOUR], suits))
+        for deal in itertools.islice(distinct_permutations(solver.ranks), 0, None, 347):
+            cards = [Card(RANKS[rank], suits[0]) for rank in deal]
+            war = War(headless=True, reshuffle=False, detect_cycles=True)
+            war.build_deck = lambda: CardDeck(cards)
+            result = war.run_to_completion()
+
+            outcome = solver.solve_deal(deal)
+            self.assertEqual(result.cycle, outcome.is_cycle())
+            if not result.cycle:
+                self.assertEqual((result.winner, result.round_number, result.war_count, result.forfeit),
+                                 (outcome.winner, outcome.round_count, outcome.war_count, outcome.forfeit))
+
+    def test__solve(self):
+        results = solve(reduced_deck([Rank.TWO, Rank.THREE, Rank.FOUR], [Suit.CLUBS, Suit.HEARTS]))
+
+        self.assertEqual(90, results.deal_count)
+        self.assertEqual(results.deal_count, sum(results.wins) + results.cycle_count)
+        self.assertEqual(1, sum(results.win_probabilities()) + results.cycle_probability())
+        self.assertGreater(results.expected_rounds(), 0)
+
+    def test__solve__deal_count(self):
+        solver = WarSolver(reduced_deck([Rank.TWO, Rank.THREE, Rank.FOUR], [Suit.CLUBS, Suit.HEARTS]))
+        self.assertEqual(90, solver.deal_count())
+
+        # A solve that doesn't play every deal exactly once isn't exact
+        solver.deal_count = lambda: 91
+        with self.assertRaises(Exception):
+            solver.solve()
+
+    def test__solve__bounded_table(self):
+        deck = reduced_deck([Rank.TWO, Rank.THREE, Rank.FOUR], [Suit.CLUBS, Suit.HEARTS, Suit.SPADES])
+        solver = WarSolver(deck, table_capacity=16)
+        results = solver.solve()
+        expected = solve(deck)
+
+        self.assertLessEqual(len(solver.table), 16)
+        self.assertGreater(solver.table.evictions, 0)
+        self.assertEqual((expected.wins, expected.cycle_count, expected.total_rounds, expected.total_wars),
+                         (results.wins, results.cycle_count, results.total_rounds, results.total_wars))
@@ -0,0 +1,112 @@
+import random
+import statistics
+import unittest
+
+from simulation.statistics import Histogram, LogHistogram, RunningMoments, StreamingStatistics
+
+
+class TestStatistics(unittest.TestCase):
+
+    def test__running_moments(self):
+        values = [3, 1, 4, 1, 5, 9, 2, 6]
+        moments = RunningMoments()
+        for value in values:
+            moments.add(value)
+
+        self.assertEqual(8, moments.count)
+        self.assertAlmostEqual(statistics.mean(values), moments.mean())
+        self.assertAlmostEqual(statistics.variance(values), moments.variance())
+        self.assertEqual(1, moments.minimum)
+        self.assertEqual(9, moments.maximum)
+
+    def test__running_moments__merge(self):
+        moments_1 = RunningMoments()
+        moments_2 = RunningMoments()
+        for value in [3, 1, 4]:
+            moments_1.add(value)
+        for value in [1, 5, 9]:
+            moments_2.add(value)
+
+        moments_1.merge(moments_2)
+        self.assertEqual(6, moments_1.count)
+        self.assertAlmostEqual(statistics.variance([3, 1, 4, 1, 5, 9]), moments_1.variance())
+        self.assertEqual(9, moments_1.maximum)
+
+        empty_moments = RunningMoments()
+        empty_moments.merge(moments_1)
+        self.assertEqual(1, empty_moments.minimum)
+
+    def test__histogram(self):
+        histogram = Histogram(bin_width=10, bin_count=3)
+        for value in [0, 9, 10, 29, 30, 500]:
+            histogram.add(value)
+
+        self.assertEqual([2, 1, 1], histogram.counts)
+        self.assertEqual(2, histogram.overflow)
+
+        other_histogram = Histogram(bin_width=10, bin_count=3)
+        other_histogram.add(15)
+        histogram.merge(other_histogram)
+        self.assertEqual([2, 2, 1], histogram.counts)
+
+        with self.assertRaises(Exception):
+            histogram.merge(Histogram(bin_width=5, bin_count=3))
+
+    def test__histogram__unbounded(self):
+        histogram = Histogram(bin_width=10, bin_count=None)
+        for value in [0, 25, 500]:
+            histogram.add(value)
+
+        self.assertEqual(51, len(histogram.counts))
+        self.assertEqual([1, 0, 1], histogram.counts[:3])
+        self.assertEqual(1, histogram.counts[50])
+        self.assertEqual(0, histogram.overflow)
+
+        other_histogram = Histogram(bin_width=10, bin_count=None)
+        other_histogram.add(900)
+        histogram.merge(other_histogram)
+        self.assertEqual(91, len(histogram.counts))
+        self.assertEqual(1, histogram.counts[90])
+
+        with self.assertRaises(Exception):
+            histogram.merge(Histogram(bin_width=10, bin_count=100))
+
+    def test__log_histogram__quantile(self):
+        rng = random.Random(1)
+        values = [rng.randint(1, 100000) for _ in range(20000)] + [0] * 100
+        histogram = LogHistogram(relative_accuracy=0.01)
+        for value in values:
+            histogram.add(value)
+
+        values.sort()
+        self.assertEqual(0.0, histogram.quantile(0))
+        for q in [0.1, 0.5, 0.9, 0.99, 0.999]:
+            exact = values[int(q * (len(values) - 1))]
+            self.assertLessEqual(abs(histogram.quantile(q) - exact), 0.01 * exact + 1e-9)
+
+    def test__log_histogram__merge(self):
+        histogram_1 = LogHistogram()
+        histogram_2 = LogHistogram()
+        whole_histogram = LogHistogram()
+        for value in range(1000):
+            (histogram_1 if value % 3 else histogram_2).add(value)
+            whole_histogram.add(value)
+
+        histogram_1.merge(histogram_2)
+        self.assertEqual(whole_histogram.counts, histogram_1.counts)
+        self.assertEqual(whole_histogram.zero_count, histogram_1.zero_count)
+
+        with self.assertRaises(Exception):
+            histogram_1.merge(LogHistogram(relative_accuracy=0.1))
+
+    def test__streaming_statistics(self):
+        stream = StreamingStatistics(bin_width=1, bin_count=100)
+        stream.consume(value for value in range(1, 101))
+
+        summary = stream.summary()
+        self.assertEqual(100, summary['count'])
+        self.assertAlmostEqual(50.5, summary['mean'])
+        self.assertEqual(1, summary['min'])
+        self.assertEqual(100, summary['max'])
+        self.assertAlmostEqual(50, summary['p50'], delta=1)
+        self.assertEqual(1, stream.histogram.overflow)
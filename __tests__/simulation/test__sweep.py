@@ -0,0 +1,92 @@
+import io
+import unittest
+
+from card_games.rule_variant import RuleVariant
+from enums import Rank, Suit
+from models import Card, CardDeck
+from simulation.simulator import simulate_games
+from simulation.sweep import PROBE_GAMES, SweepConfiguration, SweepProgress, grid, next_chunk, summary_row, sweep, \
+    write_sweep
+
+
+SMALL_DECK = CardDeck([Card(rank, suit) for rank in [Rank.TWO, Rank.THREE, Rank.FOUR, Rank.ACE] for suit in Suit])
+
+
+class TestSweep(unittest.TestCase):
+
+    def test__grid(self):
+        configurations = grid(10, variants={'standard': RuleVariant(), 'ace_low': RuleVariant(ace_low=True)},
+                              decks={'standard': None, 'small': SMALL_DECK}, players=[2, 3])
+
+        self.assertEqual(8, len(configurations))
+        self.assertEqual('standard/standard/2 players', configurations[0].name)
+        self.assertEqual('ace_low/small/3 players', configurations[-1].name)
+        self.assertEqual(16, configurations[-1].deck_size())
+        self.assertTrue(configurations[-1].variant.ace_low)
+
+    def test__next_chunk__probes_first(self):
+        progresses = [SweepProgress(SweepConfiguration('FOO', 100)), SweepProgress(SweepConfiguration('BAR', 3))]
+
+        self.assertEqual((progresses[0], PROBE_GAMES), next_chunk(progresses, 2, 0.5))
+        progresses[0].scheduled = PROBE_GAMES
+        self.assertEqual((progresses[1], 3), next_chunk(progresses, 2, 0.5))
+        progresses[1].scheduled = 3
+
+        # Nothing more is scheduled until a probe has measured its configuration's time per game
+        self.assertIsNone(next_chunk(progresses, 2, 0.5))
+
+    def test__next_chunk__sized_by_time_per_game(self):
+        slow = SweepProgress(SweepConfiguration('SLOW', 1000))
+        fast = SweepProgress(SweepConfiguration('FAST', 10000))
+        slow.scheduled = fast.scheduled = 10
+        slow.add_chunk(simulate_games(0, 0, 0), 10, 1.0)
+        fast.add_chunk(simulate_games(0, 0, 0), 10, 0.01)
+
+        # The configuration with the most work left goes first, in chunks of about the target time
+        self.assertEqual((slow, 5), next_chunk([fast, slow], 2, 0.5))
+        slow.scheduled = 1000
+        self.assertEqual((fast, 500), next_chunk([fast, slow], 2, 0.5))
+
+        # Chunks shrink as the work runs out
+        fast.scheduled = 9980
+        self.assertEqual((fast, 2), next_chunk([fast, slow], 2, 0.5))
+
+    def test__sweep__same_results(self):
+        configurations = grid(12, variants={'standard': RuleVariant(), 'no_reshuffle': RuleVariant(reshuffle='never')},
+                              decks={'small': SMALL_DECK}, players=[2, 3], max_rounds=500)
+
+        in_process = {progress.configuration.name: progress for progress in sweep(configurations, workers=1, seed=3)}
+        pooled = {progress.configuration.name: progress for progress in sweep(configurations, workers=2, seed=3)}
+        self.assertEqual(set(in_process), set(pooled))
+        for name, progress in in_process.items():
+            self.assertEqual(12, pooled[name].results.game_count)
+            self.assertEqual(progress.results.wins, pooled[name].results.wins)
+            self.assertEqual(progress.results.rounds.histogram.counts, pooled[name].results.rounds.histogram.counts)
+
+    def test__sweep__deck(self):
+        configuration = SweepConfiguration('small', 5, deck=SMALL_DECK, decks=2)
+        progress, = sweep([configuration], workers=1, seed=2)
+
+        expected = simulate_games(2, 0, 5, decks=2, deck=SMALL_DECK)
+        self.assertEqual(expected.rounds.histogram.counts, progress.results.rounds.histogram.counts)
+        self.assertEqual(expected.wins, progress.results.wins)
+
+    def test__write_sweep(self):
+        stream = io.StringIO()
+        write_sweep(grid(4, players=[2, 4]), stream, workers=1)
+
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(3, len(lines))
+        self.assertTrue(lines[0].startswith('name,number_of_players,decks,deck_size'))
+        self.assertTrue(lines[2].startswith('standard/standard/4 players,4,1,52,False,3,,forfeit,seat,cycle,4,'))
+
+    def test__summary_row(self):
+        progress = SweepProgress(SweepConfiguration('FOO', 10, RuleVariant(face_down_cards=1)))
+        progress.add_chunk(simulate_games(1, 0, 10), 10, 0.5)
+
+        row = summary_row(progress)
+        self.assertEqual('FOO', row['name'])
+        self.assertEqual(10, row['games'])
+        self.assertEqual(1, row['face_down_cards'])
+        self.assertEqual('0.050000', row['seconds_per_game'])
+        self.assertEqual(2, len(row['win_rates'].split(';')))
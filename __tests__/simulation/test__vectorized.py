@@ -0,0 +1,59 @@
+import random
+import unittest
+
+from card_games import War
+from models import CardDeck
+from simulation.vectorized import VectorizedWar, np, simulate_vectorized
+
+
+@unittest.skipIf(np is None, 'numpy is not installed')
+class TestVectorizedWar(unittest.TestCase):
+
+    def test__init(self):
+        deals = np.arange(52, dtype=np.uint8)[None, :]
+        batch = VectorizedWar(deals, np.random.default_rng(0))
+
+        self.assertEqual(1, batch.game_count)
+        self.assertEqual([26, 26], batch.lengths[0].tolist())
+        self.assertEqual(list(range(0, 52, 2)), batch.hands[0, 0, :26].tolist())
+        self.assertEqual(list(range(1, 52, 2)), batch.hands[0, 1, :26].tolist())
+
+    def test__init__no_reshuffle_requires_max_rounds(self):
+        with self.assertRaises(Exception) as context:
+            VectorizedWar(np.zeros((1, 52)), reshuffle=False)
+        self.assertTrue('max_rounds is required' in str(context.exception))
+
+    def test__matches_object_engine(self):
+        # Without reshuffling both engines are deterministic once dealt, so they must agree game for game
+        seeds = range(40)
+        deals = np.array([[card.to_code() for card in CardDeck(rng=random.Random(seed)).cards] for seed in seeds])
+        batch = VectorizedWar(deals, np.random.default_rng(0), reshuffle=False, max_rounds=2000)
+        batch.run()
+
+        for seed, result in zip(seeds, batch.results()):
+            expected = War(headless=True, rng=random.Random(seed), reshuffle=False, max_rounds=2000).run_to_completion()
+            self.assertEqual(expected.winner, result.winner)
+            self.assertEqual(expected.round_number, result.round_number)
+            self.assertEqual(expected.war_count, result.war_count)
+            self.assertEqual(expected.forfeit, result.forfeit)
+
+    def test__play_round__keeps_every_card(self):
+        rng = np.random.default_rng(1)
+        batch = VectorizedWar(VectorizedWar.random_deals(50, rng), rng)
+
+        for _ in range(200):
+            batch.play_round()
+            for game in np.flatnonzero(batch.active):
+                cards = []
+                for player in range(2):
+                    slots = (batch.heads[game, player] + np.arange(batch.lengths[game, player])) % 52
+                    cards.extend((batch.hands[game, player, slots] & 0x3F).tolist())
+                self.assertEqual(list(range(52)), sorted(cards))
+
+    def test__simulate_vectorized(self):
+        results = simulate_vectorized(30, seed=2, batch_size=20)
+        self.assertEqual(30, results.game_count)
+        self.assertEqual(30, sum(results.wins))
+
+        results_2 = simulate_vectorized(30, seed=2, batch_size=20)
+        self.assertEqual(results.rounds.histogram.counts, results_2.rounds.histogram.counts)
@@ -0,0 +1,58 @@
+"""
+Micro-benchmark for the per-round cost of CardDeck.draw/CardDeck.add as hands grow
+
+Run from the project's main directory with:
+    python -m benchmarks.card_deck
+"""
+from enums import Rank, Suit
+from models import Card, CardDeck
+from typing import List
+import timeit
+
+
+HAND_SIZES = [26, 1000, 10000, 100000]
+ROUNDS = 10000
+
+
+class ListCardDeck:
+    """The original list-backed deck, where drawing from the top is O(n) per card"""
+
+    def __init__(self, cards: List[Card]):
+        self.cards = cards
+
+    def draw(self, number_of_cards: int = 1) -> List[Card]:
+        drawn_cards = []
+        for _ in range(number_of_cards):
+            drawn_cards.append(self.cards.pop(0))
+        return drawn_cards
+
+    def add(self, cards: List[Card]) -> None:
+        self.cards.extend(cards)
+
+
+def build_cards(hand_size: int) -> List[Card]:
+    """Build hand_size cards by cycling through a standard deck"""
+    template = [(rank, suit) for rank in Rank for suit in Suit]
+    return [Card(*template[index % len(template)]) for index in range(hand_size)]
+
+
+def time_round(deck_class: type, hand_size: int) -> float:
+    """Time one War round (draw a card from the top, win it back to the bottom) in nanoseconds"""
+    deck = deck_class(build_cards(hand_size))
+
+    def play_round():
+        deck.add(deck.draw())
+
+    return timeit.timeit(play_round, number=ROUNDS) / ROUNDS * 1e9
+
+
+def main():
+    print(f'{"hand size":>10} {"list (ns/round)":>16} {"deque (ns/round)":>17}')
+    for hand_size in HAND_SIZES:
+        list_time = time_round(ListCardDeck, hand_size)
+        deque_time = time_round(CardDeck, hand_size)
+        print(f'{hand_size:>10} {list_time:>16.0f} {deque_time:>17.0f}')
+
+
+if __name__ == '__main__':
+    main()
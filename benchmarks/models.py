@@ -0,0 +1,69 @@
+"""
+Benchmark for deck creation time and memory per game of the models
+
+Run from the project's main directory with:
+    python -m benchmarks.models
+"""
+from card_games import War
+from collections import deque
+from enums import Rank, Suit
+from models import Card, CardDeck
+from models.card import STANDARD_DECK
+import timeit
+import tracemalloc
+
+
+REPEATS = 2000
+
+
+class DictCard:
+    """The original Card, with a per-instance __dict__ and validation on every construction"""
+
+    def __init__(self, rank: Rank, suit: Suit, face_up: bool = False):
+        if not isinstance(rank, Rank):
+            raise Exception(f'{rank} is not a valid rank')
+        if not isinstance(suit, Suit):
+            raise Exception(f'{suit} is not a valid suit')
+
+        self.rank = rank
+        self.suit = suit
+        self.face_up = face_up
+
+
+def measure_memory(build) -> int:
+    """Measure the bytes still allocated by the object built by build()"""
+    tracemalloc.start()
+    built = build()
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del built
+    return memory
+
+
+def build_dealt_game() -> War:
+    """Build a headless game of War with both hands dealt"""
+    war = War(headless=True)
+    war.deal_hands()
+    return war
+
+
+def main():
+    validated_time = timeit.timeit(lambda: deque(DictCard(rank, suit) for rank in Rank for suit in Suit), number=REPEATS)
+    validated_slots_time = timeit.timeit(lambda: deque(Card(rank, suit) for rank, suit in STANDARD_DECK), number=REPEATS)
+    trusted_time = timeit.timeit(lambda: deque(Card.from_trusted(STANDARD_DECK)), number=REPEATS)
+    deck_time = timeit.timeit(CardDeck, number=REPEATS)
+
+    print('Deck creation (us per 52 cards)')
+    print(f'  validated, __dict__ cards: {validated_time / REPEATS * 1e6:>8.1f}')
+    print(f'  validated, __slots__ cards: {validated_slots_time / REPEATS * 1e6:>7.1f}')
+    print(f'  trusted template: {trusted_time / REPEATS * 1e6:>17.1f}')
+    print(f'  CardDeck() incl. shuffle: {deck_time / REPEATS * 1e6:>9.1f}')
+
+    print('Memory (bytes)')
+    print(f'  52 __dict__ cards: {measure_memory(lambda: [DictCard(rank, suit) for rank, suit in STANDARD_DECK]):>16}')
+    print(f'  52 __slots__ cards: {measure_memory(lambda: Card.from_trusted(STANDARD_DECK)):>15}')
+    print(f'  dealt game of War: {measure_memory(build_dealt_game):>16}')
+
+
+if __name__ == '__main__':
+    main()
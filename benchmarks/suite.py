@@ -0,0 +1,210 @@
+"""
+Performance benchmarks for the models and the War engine.  Run them with run_benchmarks.py
+
+Each benchmark builds whatever it needs up front and returns the operation to time, so only that operation is measured.
+The cold start import time of the main packages is measured too, in a fresh interpreter with python -X importtime
+"""
+from card_games import War
+from enums import Rank, Suit
+from models import Card, CardDeck, CompactDeck
+from simulation.simulator import simulate_games
+from typing import Callable, Dict, List
+import json
+import os
+import random
+import subprocess
+import sys
+import timeit
+
+
+BENCHMARKS = {}
+
+# The modules whose import time is measured, each as the benchmark 'import.<module>'
+IMPORT_BENCHMARKS = ['card_table', 'card_games', 'simulation.simulator']
+
+PROJECT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Benchmarks slower than their baseline by more than this fraction are flagged as regressions
+DEFAULT_THRESHOLD = 0.10
+
+
+def benchmark(name: str) -> Callable:
+    """Register the decorated function as the benchmark with the given name"""
+    def register(build_operation: Callable[[], Callable[[], None]]) -> Callable:
+        BENCHMARKS[name] = build_operation
+        return build_operation
+    return register
+
+
+def build_hand(hand_size: int) -> CardDeck:
+    """Build a hand of hand_size cards by cycling through a shuffled standard deck"""
+    template = list(CardDeck(rng=random.Random(0)).cards)
+    return CardDeck([Card(template[index % 52].rank, template[index % 52].suit) for index in range(hand_size)])
+
+
+@benchmark('card_deck.construct')
+def bench_card_deck_construct() -> Callable[[], None]:
+    return CardDeck
+
+
+@benchmark('card_deck.shuffle')
+def bench_card_deck_shuffle() -> Callable[[], None]:
+    deck = CardDeck()
+    rng = random.Random(0)
+    return lambda: deck.shuffle(rng)
+
+
+@benchmark('card_deck.shuffle_seeded')
+def bench_card_deck_shuffle_seeded() -> Callable[[], None]:
+    deck = CardDeck()
+    seeds = iter(range(10 ** 9))
+    return lambda: deck.shuffle_seeded(next(seeds))
+
+
+@benchmark('card_deck.deal_2')
+def bench_card_deck_deal() -> Callable[[], None]:
+    deck = CardDeck()
+    return lambda: deck.deal(2)
+
+
+@benchmark('deal.card_deck.shoe_8')
+def bench_deal_card_deck() -> Callable[[], None]:
+    rng = random.Random(0)
+    return lambda: CardDeck(rng=rng, decks=8).deal(8)
+
+
+@benchmark('deal.shoe_views.shoe_8')
+def bench_deal_shoe_views() -> Callable[[], None]:
+    rng = random.Random(0)
+    return lambda: CompactDeck(rng=rng, decks=8).deal_views(8)
+
+
+def register_draw_benchmarks() -> None:
+    """Register a draw-and-add-back benchmark for each draw size and hand size"""
+    for number_of_cards in [1, 4]:
+        for hand_size in [26, 1000, 10000]:
+            def build_operation(number_of_cards: int = number_of_cards, hand_size: int = hand_size):
+                deck = build_hand(hand_size)
+                return lambda: deck.add(deck.draw(number_of_cards))
+            BENCHMARKS[f'card_deck.draw_{number_of_cards}.hand_{hand_size}'] = build_operation
+
+
+register_draw_benchmarks()
+
+
+@benchmark('render.card_str')
+def bench_card_str() -> Callable[[], None]:
+    card = Card(Rank.QUEEN, Suit.HEARTS, face_up=True)
+    return lambda: str(card)
+
+
+@benchmark('render.card_deck_str')
+def bench_card_deck_str() -> Callable[[], None]:
+    deck = CardDeck(rng=random.Random(0))
+    for card in list(deck.cards)[::2]:
+        card.flip()
+    return lambda: str(deck)
+
+
+@benchmark('war.headless_game')
+def bench_headless_game() -> Callable[[], None]:
+    war = War(headless=True)
+    seeds = iter(range(10 ** 9))
+
+    def play_game():
+        war.rng = random.Random(next(seeds))
+        war.run_to_completion()
+    return play_game
+
+
+@benchmark('war.throughput_100_games')
+def bench_throughput() -> Callable[[], None]:
+    return lambda: simulate_games(0, 0, 100)
+
+
+def run_benchmark(build_operation: Callable[[], Callable[[], None]], repeats: int = 5) -> Dict[str, float]:
+    """Time a benchmark's operation, keeping the best of several repeats to reduce noise"""
+    timer = timeit.Timer(build_operation())
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeats, number=number))
+    return {'seconds_per_op': best / number, 'ops_per_second': number / best}
+
+
+def measure_import_time(module: str, repeats: int = 5) -> Dict[str, float]:
+    """
+    Time importing a module in a fresh interpreter, as reported by python -X importtime, keeping the best of several
+    repeats.  Every repeat is a new process, so none of the module's imports are already loaded
+    """
+    microseconds = []
+    for _ in range(repeats):
+        process = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'], cwd=PROJECT_DIRECTORY,
+                                 capture_output=True, text=True, check=True)
+        microseconds.append(parse_import_time(process.stderr, module))
+    best = min(microseconds) / 1e6
+    return {'seconds_per_op': best, 'ops_per_second': 1 / best}
+
+
+def parse_import_time(report: str, module: str) -> int:
+    """Find the cumulative import time of a module, in microseconds, in the report of python -X importtime"""
+    for line in report.splitlines():
+        if line.startswith('import time:') and line.count('|') == 2:
+            _, cumulative, imported = line.split('|')
+            if imported.strip() == module:
+                return int(cumulative)
+    raise Exception(f'No import time reported for {module}')
+
+
+def run_benchmarks(name_filter: str = '') -> Dict[str, Dict[str, float]]:
+    """Run every registered benchmark, and measure the import time of every module, whose name contains name_filter"""
+    results = {name: run_benchmark(build_operation)
+               for name, build_operation in BENCHMARKS.items() if name_filter in name}
+    results.update({f'import.{module}': measure_import_time(module)
+                    for module in IMPORT_BENCHMARKS if name_filter in f'import.{module}'})
+    return results
+
+
+def save_results(results: Dict[str, Dict[str, float]], path: str) -> None:
+    """Save benchmark results as JSON"""
+    with open(path, 'w') as results_file:
+        json.dump(results, results_file, indent=2, sort_keys=True)
+
+
+def load_results(path: str) -> Dict[str, Dict[str, float]]:
+    """Load benchmark results saved as JSON"""
+    with open(path) as results_file:
+        return json.load(results_file)
+
+
+def compare_results(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+                    threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """
+    Compare benchmark results against a baseline, giving the names of the benchmarks that regressed
+    (more than threshold slower than the baseline)
+    """
+    regressions = []
+    for name, result in results.items():
+        if name in baseline and result['seconds_per_op'] > baseline[name]['seconds_per_op'] * (1 + threshold):
+            regressions.append(name)
+    return regressions
+
+
+def format_results(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]] = None,
+                   threshold: float = DEFAULT_THRESHOLD) -> str:
+    """Build a table of benchmark results, with the change from the baseline if one is provided"""
+    lines = [f'{"benchmark":<36} {"time/op":>12} {"ops/s":>12}' + (f' {"change":>9}' if baseline else '')]
+    for name, result in results.items():
+        seconds = result['seconds_per_op']
+        line = f'{name:<36} {format_seconds(seconds):>12} {result["ops_per_second"]:>12.0f}'
+        if baseline and name in baseline:
+            change = seconds / baseline[name]['seconds_per_op'] - 1
+            line += f' {change:>+9.1%}' + ('  REGRESSION' if change > threshold else '')
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+def format_seconds(seconds: float) -> str:
+    """Format a duration with the most readable unit"""
+    for unit, scale in [('s', 1), ('ms', 1e-3), ('us', 1e-6)]:
+        if seconds >= scale:
+            return f'{seconds / scale:.2f} {unit}'
+    return f'{seconds / 1e-9:.0f} ns'
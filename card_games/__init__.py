@@ -1 +1,29 @@
-from .war import War
\ No newline at end of file
+"""
+The card games, and what they share.  Everything is imported the first time it is used (PEP 562), so importing
+card_games (e.g. to read the registry of games when CardTable starts) imports none of the games
+"""
+from .registry import GAMES, load_game
+import importlib
+
+
+# The module each of the package's shared classes is imported from, by name
+EXPORTS = {
+    'GameResult': 'card_games.game_result',
+    'OutputSink': 'card_games.output_sink',
+}
+
+
+def __getattr__(name: str):
+    """Import a shared class or registered card game (e.g. War) the first time it is used"""
+    if name in EXPORTS:
+        value = getattr(importlib.import_module(EXPORTS[name]), name)
+    elif name in GAMES:
+        value = load_game(name)
+    else:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(EXPORTS) + list(GAMES))
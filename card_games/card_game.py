@@ -1,6 +1,8 @@
 import os
+import random
 
-from models import Card, CardDeck, Player
+from card_games.output_sink import OutputSink
+from models import Card, CardDeck, CompactDeck, Player
 from typing import List
 
 
@@ -20,21 +22,90 @@ class CardGame:
         The winner of the current round
     game_winner: Player
         The winner of the game
+    headless: bool
+        Whether the game runs without any prompting or printing (e.g. for simulations)
+    rng: random.Random
+        The random number generator used for the deal and every shuffle.  Built from seed if one is provided,
+        otherwise defaults to the global 'random' module
+    output: OutputSink
+        Where everything displayed to the user is written
+    reshuffle: bool
+        Whether a player's hand is shuffled once all of its cards have been played.
+        Without it the game is fully deterministic once dealt
+    replay_log: ReplayLog
+        The replay log the game is being recorded to, if any (see card_games.replay_log)
+    round_trace: RoundTrace
+        The trace every round of the game is being recorded to, if any (see card_games.round_trace)
+    decks: int
+        The number of decks shuffled together into the shoe that is dealt
+    deck: CardDeck
+        The cards of each deck in the shoe (e.g. a reduced deck), if not the standard 52 cards.  Only used as a
+        template: every game is dealt new copies of its cards
+    shoe_views: bool
+        Whether the shoe is shuffled as card codes and dealt as views over it (see CompactDeck.deal_views), which
+        only builds each Card once it is drawn.  The deal is exactly the same as without views
+    fast_shuffle: bool
+        Whether hands are reshuffled with the fast seeded permutation of each reshuffle seed (see models.permutation),
+        rather than random.shuffle with a random.Random built from the seed.  Games differ between the two
     """
 
-    def __init__(self, players: List[Player]):
+    def __init__(self, players: List[Player], headless: bool = False, rng: random.Random = None,
+                 output: OutputSink = None, reshuffle: bool = True, seed: int = None, decks: int = 1,
+                 shoe_views: bool = False, fast_shuffle: bool = False, deck: CardDeck = None):
         self.number_of_players = len(players)
         self.players = players
         self.round_number = 0
         self.round_winner = None
         self.game_winner = None
+        self.headless = headless
+        self.rng = rng if rng or seed is None else random.Random(seed)
+        self.output = output or OutputSink()
+        self.reshuffle = reshuffle
+        self.replay_log = None
+        self.round_trace = None
+        self.decks = decks
+        self.deck = deck
+        self.shoe_views = shoe_views
+        self.fast_shuffle = fast_shuffle
 
     def deal_hands(self) -> None:
-        """Deal the standard 52 card deck to each player"""
-        hands = CardDeck().deal(self.number_of_players)
+        """Deal the shoe of standard 52 card decks to each player"""
+        deck = self.build_deck()
+        if self.replay_log and self.shoe_views:
+            self.replay_log.record_deal_codes(deck.codes, self.reshuffle, self.fast_shuffle, self.number_of_players)
+        elif self.replay_log:
+            self.replay_log.record_deal(deck.cards, self.reshuffle, self.fast_shuffle, self.number_of_players)
+
+        hands = deck.deal_views(self.number_of_players) if self.shoe_views else deck.deal(self.number_of_players)
         for player_number, hand in enumerate(hands):
             self.players[player_number].hand = hand
 
+    def build_deck(self) -> CardDeck or CompactDeck:
+        """Build the shuffled deck (or shoe of several decks) to be dealt, as card codes if dealing views"""
+        if not self.deck:
+            if self.shoe_views:
+                return CompactDeck(rng=self.rng, decks=self.decks)
+            return CardDeck(rng=self.rng, decks=self.decks)
+
+        # Both kinds of deck shuffle the same way, so the deal is the same with or without views
+        cards = self.deck.cards * self.decks
+        if self.shoe_views:
+            deck = CompactDeck.from_cards(cards)
+        else:
+            deck = CardDeck(Card.from_trusted((card.rank, card.suit) for card in cards))
+        deck.shuffle(self.rng)
+        return deck
+
+    def next_shuffle_seed(self) -> int:
+        """
+        Draw the seed of the next reshuffle from the game's random number generator.
+        Each reshuffle gets its own seed, so a replay log can reproduce it without the generator's full state
+        """
+        seed = (self.rng or random).getrandbits(32)
+        if self.replay_log:
+            self.replay_log.record_shuffle(seed)
+        return seed
+
     def play_top_card(self, player: Player) -> Card or None:
         """Pull the top card from the player's hand, set it face up, and to the play pile"""
         if player.hand and player.hand_count() > 0:
@@ -46,20 +117,50 @@ class CardGame:
 
     def shuffle_hand_if_needed(self, player: Player) -> None:
         """Shuffle the player's hand if the top card is face up, meaning all cards in deck have been played"""
-        if player.hand.cards[0].face_up:
-            print(f'Shuffling {player.name}\'s deck...\n')
-            player.hand.shuffle()
+        if self.reshuffle and player.hand.is_top_card_face_up():
+            self.shuffle_hand(player)
+
+    def shuffle_hand(self, player: Player) -> None:
+        """Shuffle the player's hand, setting all of its cards face down"""
+        if not self.headless:
+            self.display(f'Shuffling {player.name}\'s deck...\n')
+        if self.fast_shuffle:
+            player.hand.shuffle_seeded(self.next_shuffle_seed())
+        else:
+            player.hand.shuffle(random.Random(self.next_shuffle_seed()))
+
+    def collect_play_piles(self, winner: Player) -> None:
+        """Add every player's play pile, in seat order, to the bottom of the round winner's hand"""
+        for player in self.players:
+            if player.play_pile:
+                winner.add_to_hand(player.play_pile.cards)
 
     def end_round(self) -> None:
         """Display round summary and reset round variables"""
-        self.print_round_summary()
+        self.round_number += 1
+        if self.replay_log:
+            self.replay_log.record_round(self.players.index(self.round_winner))
+        if self.round_trace:
+            self.trace_round()
+        if not self.headless:
+            self.print_round_summary()
         for player in self.players:
             player.clear_play_pile()
         self.round_winner = None
 
+    def trace_round(self, war_depth: int = 0) -> None:
+        """Record the round that just ended to the round trace, while the play piles still hold the cards played"""
+        self.round_trace.record_round(
+            self.players.index(self.round_winner) if self.round_winner else None,
+            war_depth,
+            [player.play_pile.cards if player.play_pile else [] for player in self.players],
+            [player.hand_count() for player in self.players]
+        )
+
     def end_game(self) -> None:
         """Display game summary and reset game variables"""
-        self.print_game_summary()
+        if not self.headless:
+            self.print_game_summary()
         for player in self.players:
             player.hand = None
         self.game_winner = None
@@ -68,24 +169,34 @@ class CardGame:
     def print_round_plays(self) -> None:
         """Print the card's in each player's play_pile this round"""
         for player in self.players:
-            print(f'{player.name} plays:\n{player.play_pile}')
+            if player.play_pile:
+                self.display(f'{player.name} plays:\n{player.play_pile}')
 
     def print_round_summary(self) -> None:
         """Print a summary of the current round to user"""
-        self.round_number += 1
-        print(f'ROUND {self.round_number} RESULTS')
-        print('-------------------------')
-        print(f'Winner: {self.round_winner.name}')
+        self.display(f'ROUND {self.round_number} RESULTS')
+        self.display('-------------------------')
+        if self.round_winner:
+            self.display(f'Winner: {self.round_winner.name}')
+        else:
+            self.display('Winner: None - every player took back their cards')
         for player in self.players:
-            print(f'{player.name}\'s card count: {player.hand_count()}')
+            self.display(f'{player.name}\'s card count: {player.hand_count()}')
 
     def print_game_summary(self) -> None:
         """Print the final game summary to user"""
-        print(f'\n\n=============GAME OVER!=============\n')
-        print(f'GAME SUMMARY')
-        print('----------------------------')
-        print(f'Winner: {self.game_winner.name}')
-        print(f'Number of rounds: {self.round_number}')
+        self.display(f'\n\n=============GAME OVER!=============\n')
+        self.display(f'GAME SUMMARY')
+        self.display('----------------------------')
+        if self.game_winner:
+            self.display(f'Winner: {self.game_winner.name}')
+        else:
+            self.display('Winner: None - the game ended in a draw')
+        self.display(f'Number of rounds: {self.round_number}')
+
+    def display(self, text: str) -> None:
+        """Display a line of text to the user"""
+        self.output.write(text + '\n')
 
     def clear_prompt(self) -> None:
         """Clear user prompt"""
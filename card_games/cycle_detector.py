@@ -0,0 +1,35 @@
+from typing import Hashable
+
+
+class CycleDetector:
+    """
+    A class to detect when a deterministic game returns to an earlier state, meaning it will loop forever.
+    Uses Brent's algorithm, so only a single saved state is kept no matter how long the game runs.
+    A cycle is detected at most twice the cycle length (plus the rounds before the cycle starts) after it begins
+
+    Attributes
+    ----------
+    saved_state: Hashable
+        The state most recently saved for comparison with every new state
+    power: int
+        The number of states that will be compared against saved_state before it is replaced
+    steps: int
+        The number of states compared against saved_state so far
+    """
+
+    def __init__(self):
+        self.saved_state = None
+        self.power = 1
+        self.steps = 0
+
+    def repeats(self, state: Hashable) -> bool:
+        """Record the next state of the game, and check if it repeats the saved state"""
+        if state == self.saved_state:
+            return True
+
+        self.steps += 1
+        if self.steps == self.power:
+            self.saved_state = state
+            self.power *= 2
+            self.steps = 0
+        return False
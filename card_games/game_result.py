@@ -0,0 +1,36 @@
+class GameResult:
+    """
+    A class representing the outcome of a completed card game
+
+    Attributes
+    ----------
+    winner: int
+        The seat number (index into the game's players) of the game winner, or None if the game was a draw
+    winner_name: str
+        The name of the game winner, or None if the game was a draw
+    round_number: int
+        The number of rounds played
+    war_count: int
+        The number of 'War's that happened during the game
+    forfeit: bool
+        Whether the game ended because a player didn't have enough cards for war
+    cycle: bool
+        Whether the game was ended as a draw because it had returned to an earlier state and would never end
+    """
+
+    def __init__(self, winner: int, winner_name: str, round_number: int, war_count: int = 0, forfeit: bool = False,
+                 cycle: bool = False):
+        self.winner = winner
+        self.winner_name = winner_name
+        self.round_number = round_number
+        self.war_count = war_count
+        self.forfeit = forfeit
+        self.cycle = cycle
+
+    def is_draw(self) -> bool:
+        """Check whether the game ended without a winner (a detected cycle or the round cap being reached)"""
+        return self.winner is None
+
+    def __str__(self):
+        """Print a one line summary of the game"""
+        return f'Winner: {self.winner_name}, Rounds: {self.round_number}, Wars: {self.war_count}'
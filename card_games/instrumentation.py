@@ -0,0 +1,130 @@
+from card_games.card_game import CardGame
+from typing import Callable
+import json
+import marshal
+import time
+
+
+# The CardGame (and War) methods timed as each phase of a game
+PHASES = {
+    'deal': ['deal_hands'],
+    'shuffle': ['shuffle_hand'],
+    'play_top_card': ['play_top_card'],
+    'war': ['declare_war'],
+    'pile_transfer': ['collect_play_piles', 'return_play_piles'],
+    'render': ['print_round_plays', 'print_round_summary', 'print_game_summary'],
+}
+
+
+class PhaseTimer:
+    """
+    A class to count the calls and time spent in a single phase of a game
+
+    Attributes
+    ----------
+    calls: int
+        The number of times the phase ran
+    inclusive_ns: int
+        The total time spent in the phase, including any phases nested inside it (e.g. pile transfers during a war)
+    exclusive_ns: int
+        The total time spent in the phase itself, excluding any phases nested inside it
+    """
+
+    __slots__ = ('calls', 'inclusive_ns', 'exclusive_ns')
+
+    def __init__(self):
+        self.calls = 0
+        self.inclusive_ns = 0
+        self.exclusive_ns = 0
+
+
+class Instrumentation:
+    """
+    A class to time each phase of a card game (see PHASES), without an external profiler.
+
+    Attaching the instrumentation wraps the game's phase methods with timers on that game instance only.
+    A game that was never attached runs its original methods, so instrumentation costs nothing while disabled
+
+    Attributes
+    ----------
+    timers: Dict[str, PhaseTimer]
+        The timer of each phase
+    record_trace: bool
+        Whether every phase call is also recorded as a trace event (for export_chrome_trace).
+        Unlike the timers, this grows with the length of the game
+    trace_events: List[Tuple[str, int, int]]
+        The phase, start time and duration (in nanoseconds) of every phase call, when recording a trace
+    """
+
+    def __init__(self, record_trace: bool = False):
+        self.timers = {phase: PhaseTimer() for phase in PHASES}
+        self.record_trace = record_trace
+        self.trace_events = []
+        self._nested_ns = []
+
+    def attach(self, game: CardGame) -> None:
+        """Start timing every phase method the game has"""
+        for phase, method_names in PHASES.items():
+            for method_name in method_names:
+                if hasattr(game, method_name):
+                    setattr(game, method_name, self.timed(phase, getattr(game, method_name)))
+
+    def detach(self, game: CardGame) -> None:
+        """Stop timing the game's phases, restoring its original methods"""
+        for method_names in PHASES.values():
+            for method_name in method_names:
+                game.__dict__.pop(method_name, None)
+
+    def timed(self, phase: str, method: Callable) -> Callable:
+        """Wrap a bound method so every call is counted and timed as part of the given phase"""
+        timer = self.timers[phase]
+        nested_ns = self._nested_ns
+        trace_events = self.trace_events if self.record_trace else None
+        clock = time.perf_counter_ns
+
+        def timed_method(*args, **kwargs):
+            nested_ns.append(0)
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                timer.calls += 1
+                timer.inclusive_ns += elapsed
+                timer.exclusive_ns += elapsed - nested_ns.pop()
+                if nested_ns:
+                    nested_ns[-1] += elapsed
+                if trace_events is not None:
+                    trace_events.append((phase, start, elapsed))
+
+        return timed_method
+
+    def breakdown(self) -> str:
+        """Build a table of the calls and time spent in each phase, excluding nested phases"""
+        total_ns = sum(timer.exclusive_ns for timer in self.timers.values()) or 1
+        lines = [f'{"phase":<15} {"calls":>10} {"total ms":>10} {"share":>7} {"mean us":>9}']
+        for phase, timer in sorted(self.timers.items(), key=lambda item: -item[1].exclusive_ns):
+            mean_us = timer.inclusive_ns / timer.calls / 1e3 if timer.calls else 0.0
+            lines.append(f'{phase:<15} {timer.calls:>10} {timer.exclusive_ns / 1e6:>10.2f} '
+                         f'{timer.exclusive_ns / total_ns:>7.1%} {mean_us:>9.2f}')
+        return '\n'.join(lines)
+
+    def export_chrome_trace(self, path: str) -> None:
+        """
+        Save the recorded trace events in the Chrome trace event format, viewable in chrome://tracing or Perfetto.
+        Requires record_trace
+        """
+        events = [{'name': phase, 'cat': 'card_game', 'ph': 'X', 'ts': start / 1e3, 'dur': elapsed / 1e3,
+                   'pid': 0, 'tid': 0} for phase, start, elapsed in self.trace_events]
+        with open(path, 'w') as trace_file:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, trace_file)
+
+    def export_pstats(self, path: str) -> None:
+        """Save the phase timers in the format written by cProfile, so they can be loaded with pstats.Stats(path)"""
+        stats = {}
+        for phase, timer in self.timers.items():
+            if timer.calls:
+                stats[('card_games', 0, phase)] = (
+                    timer.calls, timer.calls, timer.exclusive_ns / 1e9, timer.inclusive_ns / 1e9, {})
+        with open(path, 'wb') as stats_file:
+            marshal.dump(stats, stats_file)
@@ -0,0 +1,51 @@
+import sys
+from typing import TextIO
+
+
+class OutputSink:
+    """
+    A class representing where a card game's output is written
+
+    Attributes
+    ----------
+    stream: TextIO
+        The stream written to.  Defaults to whatever sys.stdout is at the time of writing
+    buffered: bool
+        Whether writes are held in memory until flush() instead of being written immediately
+    buffer: List[str]
+        The text written since the last flush, while buffered
+    """
+
+    def __init__(self, stream: TextIO = None, buffered: bool = False):
+        self.stream = stream
+        self.buffered = buffered
+        self.buffer = []
+
+    def write(self, text: str) -> None:
+        """Write text to the stream, or hold it until the next flush if buffered"""
+        if self.buffered:
+            self.buffer.append(text)
+        else:
+            (self.stream or sys.stdout).write(text)
+
+    def mark(self) -> int:
+        """Mark the current position in the buffer, so anything written after it can be discarded with truncate()"""
+        return len(self.buffer)
+
+    def truncate(self, mark: int) -> None:
+        """Discard everything buffered after the provided mark"""
+        del self.buffer[mark:]
+
+    def take(self) -> str:
+        """Remove everything buffered and return it, instead of writing it to the stream"""
+        text = ''.join(self.buffer)
+        self.buffer.clear()
+        return text
+
+    def flush(self) -> None:
+        """Write everything buffered to the stream in a single write, and flush the stream"""
+        stream = self.stream or sys.stdout
+        if self.buffer:
+            stream.write(''.join(self.buffer))
+            self.buffer.clear()
+        stream.flush()
@@ -0,0 +1,38 @@
+"""
+The registry of card games playable from the CardTable menu, by name.
+
+Games are registered by the import path of their class ('module:class'), and only imported once they are chosen,
+so registering more games doesn't add to the time it takes to start CardTable.  Register a new game with:
+
+    register_game('Go Fish', 'card_games.go_fish:GoFish')
+
+Only the standard library's importlib is imported here (not even typing), as CardTable reads the registry on startup
+"""
+import importlib
+
+
+# The import path of each registered card game's class, by name, in menu order
+GAMES = {
+    'War': 'card_games.war:War',
+}
+
+
+def register_game(name: str, import_path: str) -> None:
+    """Register the card game class at import_path ('module:class') under the given name"""
+    module_name, _, class_name = import_path.partition(':')
+    if not module_name or not class_name:
+        raise Exception(f'Invalid import path {import_path} - expected \'module:class\'')
+    GAMES[name] = import_path
+
+
+def game_names() -> list:
+    """Get the name of every registered card game, in menu order"""
+    return list(GAMES)
+
+
+def load_game(name: str) -> type:
+    """Import the class of the registered card game with the given name"""
+    if name not in GAMES:
+        raise Exception(f'{name} is not a registered card game')
+    module_name, _, class_name = GAMES[name].partition(':')
+    return getattr(importlib.import_module(module_name), class_name)
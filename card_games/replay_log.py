@@ -0,0 +1,153 @@
+from __future__ import annotations      # Allow typing hinting a method with the type of the enclosing class (i.e. ReplayLog).
+
+from array import array
+from card_games.game_result import GameResult
+from card_games.output_sink import OutputSink
+from card_games.war import War
+from models import Card, CardDeck
+from typing import Iterable, List
+import struct
+
+
+# Magic bytes, format version, flags, number of players, deal length, shuffle count and round count
+HEADER = struct.Struct('<4sBBBIII')
+MAGIC = b'WARL'
+VERSION = 2
+RESHUFFLE_FLAG = 0x01
+FAST_SHUFFLE_FLAG = 0x02
+
+
+class ReplayLog:
+    """
+    A class representing a compact binary record of a single game of War, from which the game can be
+    reconstructed exactly: the deck before the deal, the seed of every reshuffle and the winner of every round.
+    A typical game fits in a few hundred bytes.
+
+    Logs don't record the rule variant a game was played with, so they are always replayed with the standard rules
+    (with or without reshuffling, as recorded).  The only guard against replaying a game with the wrong rules is
+    that games whose variant isn't replayable (see RuleVariant.is_replayable) refuse to be recorded
+
+    Attributes
+    ----------
+    deal: bytearray
+        The card codes (see models.card_code) of the deck before it was dealt
+    shuffle_seeds: array
+        The seed of every reshuffle, in the order they happened
+    round_winners: bytearray
+        The seat of the winner of every round
+    reshuffle: bool
+        Whether the game was played with reshuffling
+    fast_shuffle: bool
+        Whether each reshuffle used the fast seeded permutation (see models.permutation) rather than random.shuffle
+    number_of_players: int
+        The number of players the deck was dealt to
+    """
+
+    def __init__(self, deal: bytes = b'', shuffle_seeds: Iterable[int] = (), round_winners: bytes = b'',
+                 reshuffle: bool = True, fast_shuffle: bool = False, number_of_players: int = 2):
+        self.deal = bytearray(deal)
+        self.shuffle_seeds = array('I', shuffle_seeds)
+        self.round_winners = bytearray(round_winners)
+        self.reshuffle = reshuffle
+        self.fast_shuffle = fast_shuffle
+        self.number_of_players = number_of_players
+
+    def record_deal(self, cards: Iterable[Card], reshuffle: bool = True, fast_shuffle: bool = False,
+                    number_of_players: int = 2) -> None:
+        """Record the deck (or shoe) about to be dealt, who it's dealt to, and how the game's hands are reshuffled"""
+        self.record_deal_codes(bytes(card.to_code() for card in cards), reshuffle, fast_shuffle, number_of_players)
+
+    def record_deal_codes(self, codes: bytes, reshuffle: bool = True, fast_shuffle: bool = False,
+                          number_of_players: int = 2) -> None:
+        """
+        Record the deck (or shoe) about to be dealt as card codes (see models.card_code), who it's dealt to,
+        and how hands are reshuffled
+        """
+        if number_of_players > 255:
+            raise Exception(f'Games of {number_of_players} players can\'t be recorded to a replay log (at most 255)')
+        self.deal = bytearray(codes)
+        self.reshuffle = reshuffle
+        self.fast_shuffle = fast_shuffle
+        self.number_of_players = number_of_players
+
+    def record_shuffle(self, seed: int) -> None:
+        """Record the seed of a reshuffle"""
+        self.shuffle_seeds.append(seed)
+
+    def record_round(self, winner: int) -> None:
+        """Record the seat of a round's winner"""
+        self.round_winners.append(winner)
+
+    def to_bytes(self) -> bytes:
+        """Encode the log in its compact binary format"""
+        flags = (RESHUFFLE_FLAG if self.reshuffle else 0) | (FAST_SHUFFLE_FLAG if self.fast_shuffle else 0)
+        header = HEADER.pack(MAGIC, VERSION, flags, self.number_of_players, len(self.deal),
+                             len(self.shuffle_seeds), len(self.round_winners))
+        return header + bytes(self.deal) + struct.pack(f'<{len(self.shuffle_seeds)}I', *self.shuffle_seeds) + \
+            bytes(self.round_winners)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> ReplayLog:
+        """Decode a log from its compact binary format"""
+        magic, version, flags, number_of_players, deal_length, shuffle_count, round_count = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise Exception(f'Not a version {VERSION} War replay log')
+
+        offset = HEADER.size
+        deal = data[offset:offset + deal_length]
+        offset += deal_length
+        shuffle_seeds = struct.unpack_from(f'<{shuffle_count}I', data, offset)
+        offset += 4 * shuffle_count
+        round_winners = data[offset:offset + round_count]
+        return cls(deal, shuffle_seeds, round_winners, bool(flags & RESHUFFLE_FLAG), bool(flags & FAST_SHUFFLE_FLAG),
+                   number_of_players)
+
+    def replay(self, output: OutputSink = None, names: List[str] = None) -> GameResult:
+        """
+        Reconstruct the recorded game by playing it again from the recorded deal and reshuffles.
+        Every round is displayed if an output is provided, otherwise the game is replayed headless.
+        Raises an exception if any round ends differently than recorded
+        """
+        game = ReplayedWar(self, headless=output is None, names=names, output=output)
+        game.replay_log = ReplayLog()
+        result = game.run_to_completion()
+        if game.replay_log.round_winners != self.round_winners:
+            raise Exception('Replayed game does not match the replay log')
+        return result
+
+
+class ReplayedWar(War):
+    """
+    A class representing a game of War that takes its deal and reshuffles from a replay log,
+    rather than from a random number generator
+
+    Attributes
+    ----------
+    replayed_log: ReplayLog
+        The replay log being played out
+    replayed_shuffle_seeds: Iterator[int]
+        The recorded reshuffle seeds not used yet
+    """
+
+    def __init__(self, replayed_log: ReplayLog, headless: bool = True, names: List[str] = None,
+                 output: OutputSink = None):
+        # Games ended as a draw are ended after the same number of rounds
+        names = names or [f'Player {seat}' for seat in range(1, replayed_log.number_of_players + 1)]
+        if len(names) != replayed_log.number_of_players:
+            raise Exception(f'The replay log is of a {replayed_log.number_of_players} player game')
+        super().__init__(headless=headless, names=names, output=output,
+                         reshuffle=replayed_log.reshuffle, max_rounds=len(replayed_log.round_winners),
+                         fast_shuffle=replayed_log.fast_shuffle)
+        self.replayed_log = replayed_log
+        self.replayed_shuffle_seeds = iter(replayed_log.shuffle_seeds)
+
+    def build_deck(self) -> CardDeck:
+        """Build the recorded deck, in the recorded order"""
+        return CardDeck([Card.from_code(code) for code in self.replayed_log.deal])
+
+    def next_shuffle_seed(self) -> int:
+        """Use the next recorded reshuffle seed"""
+        seed = next(self.replayed_shuffle_seeds)
+        if self.replay_log:
+            self.replay_log.record_shuffle(seed)
+        return seed
@@ -0,0 +1,317 @@
+"""
+Round by round traces of games, for investigating individual games of a simulation after the fact.
+
+A RoundTrace attached to a game (CardGame.round_trace) records every round as it ends: the round winner, the number
+of 'War's it took, the cards each player played and every player's hand count afterwards.  Traces are encoded in a
+compact binary format, with cards as card codes (see models.card_code).
+
+A TraceWriter appends the traces of many games to a trace file in blocks, each optionally compressed with zlib, and
+writes the position of every game to an index file alongside it (the path suffixed with '.index').  Blocks are
+compressed and written by a background thread, so the game loop only waits on the disk once the queue of blocks is
+full.  A TraceReader finds a game in the index by binary search, then reads and decodes only the block holding it.
+"""
+from __future__ import annotations      # Allow typing hinting a method with the type of the enclosing class (i.e. RoundTrace).
+
+from models import Card
+from typing import Iterator, List, Optional, Tuple
+import mmap
+import os
+import queue
+import struct
+import threading
+import zlib
+
+
+MAGIC = b'WART'
+VERSION = 1
+COMPRESSED_FLAG = 0x01
+
+# The magic, version, flags, decoded length and stored length of a block of the trace file
+BLOCK_HEADER = struct.Struct('<4sBBII')
+
+# The game id, block offset, and position and length (within the decoded block) of a game in the index file
+INDEX_ENTRY = struct.Struct('<QQII')
+
+# The game id, number of players and number of rounds of a game's trace
+GAME_HEADER = struct.Struct('<QBI')
+
+# The winner's seat (-1 for none) and number of 'War's of a round, and the number of cards a player played in it
+ROUND_HEADER = struct.Struct('<bH')
+CARD_COUNT = struct.Struct('<H')
+
+
+class TracedRound:
+    """
+    A class representing a single round of a traced game
+
+    Attributes
+    ----------
+    winner: int
+        The seat of the round winner, or None if every player took back their cards
+    war_depth: int
+        The number of 'War's the round took
+    played: List[List[Card]]
+        The cards each player played in the round, by seat, face down cards included
+    hand_counts: List[int]
+        The number of cards in each player's hand once the round was over, by seat
+    """
+
+    __slots__ = ('winner', 'war_depth', 'played', 'hand_counts')
+
+    def __init__(self, winner: Optional[int], war_depth: int, played: List[List[Card]], hand_counts: List[int]):
+        self.winner = winner
+        self.war_depth = war_depth
+        self.played = played
+        self.hand_counts = hand_counts
+
+
+class RoundTrace:
+    """
+    A class representing the trace of a single game, encoded round by round as it is played
+
+    Attributes
+    ----------
+    game_id: int
+        The id the game is found by in a trace file (e.g. its game number in a simulation)
+    number_of_players: int
+        The number of players at the game's table
+    round_count: int
+        The number of rounds recorded
+    data: bytearray
+        The encoded rounds
+    """
+
+    def __init__(self, game_id: int):
+        self.game_id = game_id
+        self.number_of_players = 0
+        self.round_count = 0
+        self.data = bytearray()
+
+    def record_round(self, winner: Optional[int], war_depth: int, played: List[List[Card]],
+                     hand_counts: List[int]) -> None:
+        """Record a round: its winner's seat, its number of 'War's, the cards played and the hand counts after it"""
+        self.number_of_players = len(hand_counts)
+        self.data += ROUND_HEADER.pack(-1 if winner is None else winner, war_depth)
+        for cards in played:
+            self.data += CARD_COUNT.pack(len(cards))
+            self.data += bytes(card.to_code() for card in cards)
+        self.data += struct.pack(f'<{len(hand_counts)}H', *hand_counts)
+        self.round_count += 1
+
+    def to_bytes(self) -> bytes:
+        """Encode the trace in its compact binary format"""
+        return GAME_HEADER.pack(self.game_id, self.number_of_players, self.round_count) + bytes(self.data)
+
+    def rounds(self) -> Iterator[TracedRound]:
+        """Decode every round recorded so far, in order"""
+        return decode_rounds(self.to_bytes())
+
+
+class TraceWriter:
+    """
+    A class to write the traces of many games to a trace file and its index, from a background thread.
+    Traces must be written in increasing order of game id
+
+    Attributes
+    ----------
+    path: str
+        The path of the trace file.  The index is written to path + '.index'
+    compress: bool
+        Whether blocks are compressed with zlib
+    block_size: int
+        The number of encoded bytes after which a block is handed to the background thread
+    block: bytearray
+        The traces encoded since the last block was handed over
+    block_games: List[Tuple[int, int, int]]
+        The game id, position and length of every trace in the block
+    last_game_id: int
+        The id of the last game written, if any
+    queue: queue.Queue
+        The blocks waiting to be written by the background thread, followed by None once the writer is closed
+    thread: threading.Thread
+        The background thread compressing and writing blocks
+    error: BaseException
+        The exception the background thread failed with, if any, which is raised by the next write or close
+    """
+
+    def __init__(self, path: str, compress: bool = True, block_size: int = 1 << 20, queue_size: int = 8):
+        self.path = path
+        self.compress = compress
+        self.block_size = block_size
+        self.block = bytearray()
+        self.block_games = []
+        self.last_game_id = None
+        self.error = None
+        self.data_file = open(path, 'wb')
+        self.index_file = open(path + '.index', 'wb')
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.thread = threading.Thread(target=self.write_blocks, name=f'TraceWriter({path})', daemon=True)
+        self.thread.start()
+
+    def write(self, trace: RoundTrace) -> None:
+        """Add a game's trace to the current block, handing the block to the background thread once it is full"""
+        if self.error:
+            raise self.error
+        if self.last_game_id is not None and trace.game_id <= self.last_game_id:
+            raise Exception(f'Game {trace.game_id} written after game {self.last_game_id}')
+        self.last_game_id = trace.game_id
+
+        data = trace.to_bytes()
+        self.block_games.append((trace.game_id, len(self.block), len(data)))
+        self.block += data
+        if len(self.block) >= self.block_size:
+            self.submit_block()
+
+    def submit_block(self) -> None:
+        """Hand the current block to the background thread, waiting only if its queue is full"""
+        if self.block_games:
+            self.queue.put((bytes(self.block), self.block_games))
+            self.block = bytearray()
+            self.block_games = []
+
+    def write_blocks(self) -> None:
+        """Compress and write every block handed over, until the writer is closed.  Runs in the background thread"""
+        offset = 0
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            if self.error:
+                continue
+
+            block, block_games = item
+            try:
+                payload = zlib.compress(block) if self.compress else block
+                flags = COMPRESSED_FLAG if self.compress else 0
+                self.data_file.write(BLOCK_HEADER.pack(MAGIC, VERSION, flags, len(block), len(payload)))
+                self.data_file.write(payload)
+                self.index_file.write(b''.join(INDEX_ENTRY.pack(game_id, offset, position, length)
+                                               for game_id, position, length in block_games))
+                offset += BLOCK_HEADER.size + len(payload)
+            except BaseException as error:
+                self.error = error
+
+    def close(self) -> None:
+        """Write the last block, wait for the background thread to finish writing, and close the files"""
+        self.submit_block()
+        self.queue.put(None)
+        self.thread.join()
+        self.data_file.close()
+        self.index_file.close()
+        if self.error:
+            raise self.error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+
+class TraceReader:
+    """
+    A class to read the trace of any game in a trace file, without reading the games before it
+
+    Attributes
+    ----------
+    path: str
+        The path of the trace file
+    data_file: BinaryIO
+        The trace file
+    index: mmap.mmap
+        The memory map of the index file, if it has any entries
+    count: int
+        The number of games in the trace file
+    cached_block: Tuple[int, bytes]
+        The offset and decoded contents of the last block read, since consecutive games share blocks
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.data_file = open(path, 'rb')
+        self.index = None
+        with open(path + '.index', 'rb') as index_file:
+            self.count = os.fstat(index_file.fileno()).st_size // INDEX_ENTRY.size
+            if self.count:
+                self.index = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.cached_block = (None, b'')
+
+    def entry(self, number: int) -> Tuple[int, int, int, int]:
+        """Get the game id, block offset, position and length of the index's entry number"""
+        return INDEX_ENTRY.unpack_from(self.index, number * INDEX_ENTRY.size)
+
+    def game_ids(self) -> Iterator[int]:
+        """Get the id of every game in the trace file, in order"""
+        for number in range(self.count):
+            yield self.entry(number)[0]
+
+    def find(self, game_id: int) -> Optional[Tuple[int, int, int]]:
+        """Find the block offset, position and length of a game's trace by binary search of the index, if it's there"""
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.entry(middle)[0] < game_id:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.count:
+            entry_game_id, offset, position, length = self.entry(low)
+            if entry_game_id == game_id:
+                return offset, position, length
+        return None
+
+    def __contains__(self, game_id: int) -> bool:
+        return self.find(game_id) is not None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def read_block(self, offset: int) -> bytes:
+        """Read and decode the block at offset in the trace file"""
+        if self.cached_block[0] != offset:
+            self.data_file.seek(offset)
+            magic, version, flags, length, stored_length = BLOCK_HEADER.unpack(self.data_file.read(BLOCK_HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                raise Exception(f'Not a version {VERSION} War trace file')
+            payload = self.data_file.read(stored_length)
+            self.cached_block = (offset, zlib.decompress(payload) if flags & COMPRESSED_FLAG else payload)
+        return self.cached_block[1]
+
+    def rounds(self, game_id: int) -> Iterator[TracedRound]:
+        """Stream every round of a game's trace, in order.  Raises an exception if the game isn't in the trace file"""
+        location = self.find(game_id)
+        if location is None:
+            raise Exception(f'Game {game_id} is not in the trace file {self.path}')
+        offset, position, length = location
+        return decode_rounds(self.read_block(offset)[position:position + length])
+
+    def close(self) -> None:
+        """Close the trace file and index"""
+        self.data_file.close()
+        if self.index:
+            self.index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+
+def decode_rounds(data: bytes) -> Iterator[TracedRound]:
+    """Decode the rounds of a game's trace one at a time, from its compact binary format"""
+    _, number_of_players, round_count = GAME_HEADER.unpack_from(data)
+    hand_counts = struct.Struct(f'<{number_of_players}H')
+    offset = GAME_HEADER.size
+    for _ in range(round_count):
+        winner, war_depth = ROUND_HEADER.unpack_from(data, offset)
+        offset += ROUND_HEADER.size
+        played = []
+        for _ in range(number_of_players):
+            (card_count,) = CARD_COUNT.unpack_from(data, offset)
+            offset += CARD_COUNT.size
+            played.append([Card.from_code(code) for code in data[offset:offset + card_count]])
+            offset += card_count
+        counts = list(hand_counts.unpack_from(data, offset))
+        offset += hand_counts.size
+        yield TracedRound(None if winner < 0 else winner, war_depth, played, counts)
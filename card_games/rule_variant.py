@@ -0,0 +1,250 @@
+"""
+Variants of the rules of War, and the round functions compiled for them.
+
+A RuleVariant declares the rules a game of War is played with.  War follows the variant's rules in its round methods
+whenever rounds are displayed, but games played to completion headlessly (e.g. simulations) play every round with the
+function compiled for their variant instead.  The function's source is written once per variant with every rule
+decided up front, so its rounds have no rule branches, and each card's value is a lookup in a table built for the
+variant.  Compiled functions are cached, so studying many variants costs one compile each.  Each function keeps its
+source (as its source attribute), which is also registered with linecache so tracebacks through it show its lines.
+"""
+from __future__ import annotations      # Allow typing hinting a method with the type of the enclosing class (i.e. RuleVariant).
+
+from enums import Rank
+from typing import Callable, Dict, Tuple
+import linecache
+
+
+# How players without enough cards for a 'War' take part in it
+SHORT_WAR_RULES = ('forfeit', 'play_remaining')
+
+# The order the play piles are added to the bottom of the round winner's hand
+PILE_ORDERS = ('seat', 'winner_first', 'winner_last')
+
+# When a player's hand is reshuffled: never, once all of its cards have been played, or before every round
+RESHUFFLE_POLICIES = ('never', 'cycle', 'every_round')
+
+
+class RuleVariant:
+    """
+    A class representing a variant of the rules of War.  The defaults are the standard rules
+
+    Attributes
+    ----------
+    ace_low: bool
+        Whether Aces are the lowest card, rather than the highest
+    face_down_cards: int
+        The number of cards each player puts face down in a 'War', before the face up card that decides it
+    war_depth: int
+        The number of chained 'War's allowed in a single round, if limited.  A tie after that many 'War's ends the
+        round with every player taking back their own play pile
+    short_war: str
+        How players without enough cards for a 'War' take part in it (see SHORT_WAR_RULES).  They either forfeit,
+        or play every card they have left with the last one face up (their last face up card if they have none left).
+        A 'War' in which no player has any cards left ends the round with every player taking back their play pile
+    pile_order: str
+        The order the play piles are added to the bottom of the round winner's hand (see PILE_ORDERS)
+    reshuffle: str
+        When a player's hand is reshuffled (see RESHUFFLE_POLICIES)
+    """
+
+    __slots__ = ('ace_low', 'face_down_cards', 'war_depth', 'short_war', 'pile_order', 'reshuffle')
+
+    def __init__(self, ace_low: bool = False, face_down_cards: int = 3, war_depth: int = None,
+                 short_war: str = 'forfeit', pile_order: str = 'seat', reshuffle: str = 'cycle'):
+        if face_down_cards < 0:
+            raise Exception(f'{face_down_cards} is not a valid number of face down cards')
+        if war_depth is not None and war_depth < 0:
+            raise Exception(f'{war_depth} is not a valid war depth')
+        if short_war not in SHORT_WAR_RULES:
+            raise Exception(f'{short_war} is not a valid short war rule - expected one of {SHORT_WAR_RULES}')
+        if pile_order not in PILE_ORDERS:
+            raise Exception(f'{pile_order} is not a valid pile order - expected one of {PILE_ORDERS}')
+        if reshuffle not in RESHUFFLE_POLICIES:
+            raise Exception(f'{reshuffle} is not a valid reshuffle policy - expected one of {RESHUFFLE_POLICIES}')
+
+        self.ace_low = ace_low
+        self.face_down_cards = face_down_cards
+        self.war_depth = war_depth
+        self.short_war = short_war
+        self.pile_order = pile_order
+        self.reshuffle = reshuffle
+
+    def war_cards(self) -> int:
+        """Count the cards each player puts into play for a 'War', the last of which decides it"""
+        return self.face_down_cards + 1
+
+    def rank_values(self) -> Dict[Rank, int]:
+        """Build the value of each card rank.  Higher values "beat" lower values head-to-head"""
+        values = {rank: value for value, rank in enumerate(Rank, start=2)}
+        if self.ace_low:
+            values[Rank.ACE] = 1
+        return values
+
+    def is_replayable(self) -> bool:
+        """
+        Check whether games with these rules can be recorded to a replay log: the standard rules, with or without
+        reshuffling once all of a hand's cards have been played
+        """
+        return self == RuleVariant(reshuffle=self.reshuffle) and self.reshuffle != 'every_round'
+
+    def key(self) -> Tuple:
+        """Get every rule of the variant, in attribute order"""
+        return tuple(getattr(self, rule) for rule in self.__slots__)
+
+    def __eq__(self, other):
+        return isinstance(other, RuleVariant) and self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def __repr__(self):
+        rules = ', '.join(f'{rule}={getattr(self, rule)!r}' for rule in self.__slots__)
+        return f'RuleVariant({rules})'
+
+
+# The round function compiled for each variant, by variant
+COMPILED_ROUNDS = {}
+
+
+def compile_round(variant: RuleVariant) -> Callable:
+    """
+    Build (or get from the cache) the function playing a single headless round of War with the variant's rules.
+    It plays exactly the same round as War.play_round, without displaying it
+    """
+    if variant not in COMPILED_ROUNDS:
+        source = round_source(variant)
+        filename = f'<War round {variant!r}>'
+        # Without a file to read them from, tracebacks only find the function's lines in linecache
+        linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+        namespace = {'rank_values': variant.rank_values()}
+        exec(compile(source, filename, 'exec'), namespace)
+        play_round = namespace['play_round']
+        play_round.source = source
+        COMPILED_ROUNDS[variant] = play_round
+    return COMPILED_ROUNDS[variant]
+
+
+def round_source(variant: RuleVariant) -> str:
+    """
+    Write the source of the round function for the variant, with every rule decided up front.
+    Play piles are kept as lists of cards, aligned with the list of contenders, rather than on each Player
+    """
+    lines = [
+        'def play_round(game):',
+        '    players = game.players',
+        '    eliminated = game.eliminated_players',
+        '    contenders = [player for player in players',
+        '                  if player not in eliminated and player.hand and player.hand.card_count()]',
+    ]
+    if variant.reshuffle == 'cycle':
+        lines += [
+            '    for player in contenders:',
+            '        if player.hand.is_top_card_face_up():',
+            '            game.shuffle_hand(player)',
+        ]
+    elif variant.reshuffle == 'every_round':
+        lines += [
+            '    for player in contenders:',
+            '        game.shuffle_hand(player)',
+        ]
+
+    lines += [
+        '    piles = []',
+        '    values = []',
+        '    for player in contenders:',
+        '        card = player.hand.draw(1)[0]',
+        '        card.face_up = not card.face_up',
+        '        piles.append([card])',
+        '        values.append(rank_values[card.rank])',
+        '    highest_value = max(values)',
+        '    leaders = [index for index, value in enumerate(values) if value == highest_value]',
+        '    wars = 0',
+        '    while len(leaders) > 1:',
+    ]
+    if variant.war_depth is not None:
+        lines += [
+            f'        if wars == {variant.war_depth}:',
+            '            break',
+        ]
+    lines += [
+        '        game.war_count += 1',
+        '        wars += 1',
+    ]
+
+    if variant.short_war == 'forfeit':
+        lines += [
+            '        for index in list(leaders):',
+            f'            if len(leaders) > 1 and contenders[index].hand.card_count() < {variant.war_cards()}:',
+            '                leaders.remove(index)',
+            '                eliminated.add(contenders[index])',
+            '                game.forfeit = True',
+            '        if len(leaders) == 1:',
+            '            winner = contenders[leaders[0]]',
+            '            if not any(player is not winner and player not in eliminated and player.hand.card_count()',
+            '                       for player in players):',
+            '                # The game is won, so the play piles are never collected',
+            '                game.game_winner = winner',
+            '                piles = [[] for pile in piles]',
+            '            break',
+            '        for index in leaders:',
+            f'            cards = contenders[index].hand.draw({variant.war_cards()})',
+            '            card = cards[-1]',
+            '            card.face_up = not card.face_up',
+            '            piles[index] += cards',
+            '            values[index] = rank_values[card.rank]',
+        ]
+    else:
+        lines += [
+            '        drawn = False',
+            '        for index in leaders:',
+            '            hand = contenders[index].hand',
+            '            count = hand.card_count()',
+            '            if count:',
+            f'                cards = hand.draw(min({variant.face_down_cards}, count - 1) + 1)',
+            '                card = cards[-1]',
+            '                card.face_up = not card.face_up',
+            '                piles[index] += cards',
+            '                values[index] = rank_values[card.rank]',
+            '                drawn = True',
+            '        if not drawn:',
+            '            break',
+        ]
+    lines += [
+        '        highest_value = max(values[index] for index in leaders)',
+        '        leaders = [index for index in leaders if values[index] == highest_value]',
+        '',
+        '    if len(leaders) == 1:',
+        '        winner = contenders[leaders[0]]',
+        '        add = winner.hand.add',
+    ]
+    if variant.pile_order == 'seat':
+        lines += [
+            '        for pile in piles:',
+            '            add(pile)',
+        ]
+    elif variant.pile_order == 'winner_first':
+        lines += [
+            '        add(piles[leaders[0]])',
+            '        for index, pile in enumerate(piles):',
+            '            if index != leaders[0]:',
+            '                add(pile)',
+        ]
+    else:
+        lines += [
+            '        for index, pile in enumerate(piles):',
+            '            if index != leaders[0]:',
+            '                add(pile)',
+            '        add(piles[leaders[0]])',
+        ]
+    lines += [
+        '    else:',
+        '        winner = None',
+        '        for player, pile in zip(contenders, piles):',
+        '            player.hand.add(pile)',
+        '',
+        '    game.round_number += 1',
+        '    if game.replay_log:',
+        '        game.replay_log.record_round(players.index(winner))',
+    ]
+    return '\n'.join(lines) + '\n'
@@ -1,7 +1,20 @@
 from card_games.card_game import CardGame
-from enums import Rank
-from models import Card, Player
-from typing import List
+from card_games.cycle_detector import CycleDetector
+from card_games.game_result import GameResult
+from card_games.output_sink import OutputSink
+from card_games.rule_variant import RuleVariant, compile_round
+from models import Card, CardDeck, Player
+from typing import Callable, List, Tuple
+import random
+
+
+# The number of cards each player puts into play for a 'War' with the standard rules, the last of which decides it
+WAR_CARDS = 4
+
+# The methods a round compiled for the game's rule variant (see card_games.rule_variant) plays the round in place of
+COMPILED_METHODS = ('play_round', 'players_in_play', 'shuffle_hand_if_needed', 'play_top_card',
+                    'determine_round_winner', 'declare_war', 'play_war_cards', 'collect_play_piles',
+                    'return_play_piles', 'end_round')
 
 
 class War(CardGame):
@@ -16,115 +29,314 @@ class War(CardGame):
         The first player playing the game
     player_two: Player
         The second player playing the game
+    eliminated_players: Set[Player]
+        The players knocked out of the game for not having enough cards for war.
+        With only two players the other player then wins the game
+    variant: RuleVariant
+        The rules the game is played with.  Defaults to the standard rules, reshuffling unless reshuffle is off
     rank_value_map: Dict[Rank, int]
         The card rank value associated with the Rank.  Higher numbers "beat" lower numbers head-to-head
+    round_war_count: int
+        The number of 'War's that have happened this round
+    forfeit: bool
+        Whether the game ended because a player didn't have enough cards for war
+    skip_display_interval: int
+        When skipping to the end, only display every Nth round (the final round is always displayed).  Must be at
+        least 1
+    skip_display_wars_only: bool
+        When skipping to the end, only display rounds in which a 'War' happened (the final round is always displayed)
+    detect_cycles: bool
+        Whether to end the game as a draw once the hands return to an earlier state.  Requires reshuffle to be off,
+        since only then is the game deterministic and guaranteed to repeat forever
+    max_rounds: int
+        The number of rounds after which the game is ended as a draw, if any
+    draw: bool
+        Whether the game has ended without a winner
+    cycle_detected: bool
+        Whether the game was ended as a draw because it would never end
     """
 
-    def __init__(self):
-        player_one_name = input(
-            'Enter the name of player 1 - [default: Player 1]: ') or 'Player 1'
-        player_two_name = input(
-            'Enter the name of player 2 - [default: Player 2]: ') or 'Player 2'
+    def __init__(self, headless: bool = False, names: List[str] = None, rng: random.Random = None,
+                 output: OutputSink = None, skip_display_interval: int = 1, skip_display_wars_only: bool = False,
+                 reshuffle: bool = True, detect_cycles: bool = False, max_rounds: int = None, seed: int = None,
+                 number_of_players: int = 2, decks: int = 1, shoe_views: bool = False, fast_shuffle: bool = False,
+                 variant: RuleVariant = None, deck: CardDeck = None):
+        variant = variant or RuleVariant(reshuffle='cycle' if reshuffle else 'never')
+        reshuffle = variant.reshuffle != 'never'
+        if detect_cycles and reshuffle:
+            raise Exception('Cycle detection requires reshuffle to be off')
+        if skip_display_interval < 1:
+            raise ValueError(f'{skip_display_interval} is not a valid skip display interval - expected at least 1')
+        if names:
+            number_of_players = len(names)
+        if number_of_players < 2:
+            raise Exception('War requires at least 2 players')
+
+        if not names:
+            if headless:
+                names = [f'Player {seat}' for seat in range(1, number_of_players + 1)]
+            else:
+                names = [input(f'Enter the name of player {seat} - [default: Player {seat}]: ') or f'Player {seat}'
+                         for seat in range(1, number_of_players + 1)]
 
         self.war_count = 0
-        self.player_one = Player(player_one_name)
-        self.player_two = Player(player_two_name)
-        self.rank_value_map = {
-            Rank.TWO: 2,
-            Rank.THREE: 3,
-            Rank.FOUR: 4,
-            Rank.FIVE: 5,
-            Rank.SIX: 6,
-            Rank.SEVEN: 7,
-            Rank.EIGHT: 8,
-            Rank.NINE: 9,
-            Rank.TEN: 10,
-            Rank.JACK: 11,
-            Rank.QUEEN: 12,
-            Rank.KING: 13,
-            Rank.ACE: 14,
-        }
-
-        super().__init__([self.player_one, self.player_two])
+        self.round_war_count = 0
+        self.forfeit = False
+        self.skip_display_interval = skip_display_interval
+        self.skip_display_wars_only = skip_display_wars_only
+        self.detect_cycles = detect_cycles
+        self.max_rounds = max_rounds
+        self.cycle_detector = None
+        self.draw = False
+        self.cycle_detected = False
+        self.eliminated_players = set()
+        players = [Player(name) for name in names]
+        self.player_one, self.player_two = players[:2]
+        self.variant = variant
+        self.rank_value_map = variant.rank_values()
+
+        super().__init__(players, headless=headless, rng=rng, output=output, reshuffle=reshuffle, seed=seed,
+                         decks=decks, shoe_views=shoe_views, fast_shuffle=fast_shuffle, deck=deck)
 
     def play(self) -> None:
         """
-        Deal both players hands and play rounds of war until:
-            1. A player has ran out of cards
-            2. War was declared and a player doesn't have enough cards for War
+        Deal every player's hand and play rounds of war until a single player is left, with the others having:
+            1. Ran out of cards
+            2. Not had enough cards for a War they were part of
         """
         self.deal_hands()
 
         skip_to_end = False
-        while not self.game_winner:
-            print(f'\n\t\tROUND {self.round_number + 1}\n')
-            self.play_round()
-
-            # If either player has ran out of cards then the other player wins
-            if self.player_one.has_empty_hand():
-                self.game_winner = self.player_two
-            elif self.player_two.has_empty_hand():
-                self.game_winner = self.player_one
-
-            # Ask the user to either continue to next round or automate the game to the end
-            if not skip_to_end and not self.game_winner:
+        while not self.is_game_over():
+            round_start = self.output.mark()
+            war_count = self.war_count
+            self.play_next_round()
+
+            # While skipping to the end, only keep the output of the rounds being summarised
+            if skip_to_end and not self.is_game_over() and not self.is_skipped_round_displayed(war_count):
+                self.output.truncate(round_start)
+
+            # Ask the user to either continue to next round or automate the game to the end.
+            # Output is buffered while skipping, and written all at once when the game is over
+            if not skip_to_end and not self.is_game_over():
                 user_input = input(
                     '\nPress ENTER to continue or \'s\' to skip to end: ')
                 if user_input == 's' or user_input == 'S':
                     skip_to_end = True
+                    self.output.buffered = True
 
         # End game and ask user if they would like to play again
         self.end_game()
-        print(f'Number of wars: {self.war_count}\n')
+        self.output.buffered = False
+        self.output.flush()
         self.prompt_replay()
 
+    def play_next_round(self) -> None:
+        """Display the number of the next round (unless headless), play it, and check whether it ended the game"""
+        if not self.headless:
+            self.display(f'\n\t\tROUND {self.round_number + 1}\n')
+        self.play_round()
+        self.check_for_game_winner()
+
+    def is_skipped_round_displayed(self, war_count: int) -> bool:
+        """
+        Check whether the round just played should be displayed while skipping to the end
+
+            Parameters:
+                war_count (int): The number of 'War's before the round was played
+        """
+        if self.round_number % self.skip_display_interval:
+            return False
+        return not self.skip_display_wars_only or self.war_count > war_count
+
+    def run_to_completion(self) -> GameResult:
+        """
+        Deal every player's hand and play rounds of war until the game is over, without prompting or printing.
+        The game state is reset afterwards, so the same instance can be used to play again
+        """
+        self.deal_hands()
+        play_round = self.compiled_round()
+        while not self.is_game_over():
+            play_round(self)
+            self.check_for_game_winner()
+
+        result = GameResult(
+            self.players.index(self.game_winner) if self.game_winner else None,
+            self.game_winner.name if self.game_winner else None,
+            self.round_number,
+            self.war_count,
+            self.forfeit,
+            self.cycle_detected
+        )
+        self.end_game()
+        self.reset_game_state()
+        return result
+
+    def compiled_round(self) -> Callable[['War'], None]:
+        """
+        Get the fastest way to play a round of the game: the round function compiled for the game's rule variant,
+        unless rounds are displayed or traced, or any of the methods it plays the round in place of are overridden
+        (e.g. timed)
+        """
+        if self.headless and not self.round_trace and \
+                not any(name in self.__dict__ or getattr(type(self), name) is not getattr(War, name)
+                        for name in COMPILED_METHODS):
+            return compile_round(self.variant)
+        return War.play_round
+
+    def deal_hands(self) -> None:
+        """Deal the shoe to each player, and start tracking the game for cycles if needed"""
+        if self.replay_log and not self.variant.is_replayable():
+            raise Exception(f'Games with the rules {self.variant} can\'t be recorded to a replay log')
+        super().deal_hands()
+        if self.detect_cycles:
+            self.cycle_detector = CycleDetector()
+
+    def trace_round(self, war_depth: int = None) -> None:
+        """Record the round that just ended to the round trace, with the number of 'War's it took"""
+        super().trace_round(self.round_war_count if war_depth is None else war_depth)
+
+    def end_game(self) -> None:
+        """Display the game summary and the number of 'War's, and reset game variables"""
+        super().end_game()
+        if not self.headless:
+            self.display(f'Number of wars: {self.war_count}\n')
+
+    def reset_game_state(self) -> None:
+        """Reset the War specific game variables, so the game can be played again"""
+        self.war_count = 0
+        self.forfeit = False
+        self.draw = False
+        self.cycle_detected = False
+        self.cycle_detector = None
+        self.eliminated_players = set()
+
+    def is_game_over(self) -> bool:
+        """Check whether the game has been won or ended as a draw"""
+        return self.game_winner is not None or self.draw
+
+    def check_for_game_winner(self) -> None:
+        """
+        If only one player has any cards left then they win.  Otherwise, if only one of them hasn't been eliminated
+        for not having enough cards for war then they win.  Otherwise check if the game is a draw
+        """
+        holding_players = [player for player in self.players if not player.has_empty_hand()]
+        standing_players = [player for player in holding_players or self.players
+                            if player not in self.eliminated_players]
+        if len(holding_players) == 1:
+            self.game_winner = holding_players[0]
+        elif len(standing_players) == 1:
+            self.game_winner = standing_players[0]
+        elif not self.game_winner:
+            self.check_for_draw()
+
+    def check_for_draw(self) -> None:
+        """End the game as a draw if the round cap has been reached, or if the game has entered a never ending cycle"""
+        if self.max_rounds and self.round_number >= self.max_rounds:
+            self.draw = True
+        elif self.cycle_detector and self.cycle_detector.repeats(self.hand_state()):
+            self.draw = True
+            self.cycle_detected = True
+
+    def hand_state(self) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+        """
+        Build a signature of every player's hand between rounds.  Cards keep their identity for the whole game,
+        so the order of the cards in every hand fully describes the state of a game without reshuffling.
+        Hands dealt as shoe views are signed without building the cards not drawn yet (see ShoeView.signature)
+        """
+        return tuple(player.hand.signature() for player in self.players)
+
+    def players_in_play(self) -> List[Player]:
+        """Get the players still taking part in rounds: those with cards left who haven't been eliminated"""
+        return [player for player in self.players
+                if player not in self.eliminated_players and not player.has_empty_hand()]
+
     def play_round(self) -> None:
         """Play a round of war"""
         # Shuffle hand if the card on top of the deck for the player is face up, meaning all cards have been cycled
-        self.shuffle_hand_if_needed(self.player_one)
-        self.shuffle_hand_if_needed(self.player_two)
+        contenders = self.players_in_play()
+        for player in contenders:
+            self.shuffle_hand_if_needed(player)
+        self.round_war_count = 0
 
         # Update and display play piles for each player
-        card_one = self.play_top_card(self.player_one)
-        card_two = self.play_top_card(self.player_two)
-        self.print_round_plays()
+        cards = [self.play_top_card(player) for player in contenders]
+        if not self.headless:
+            self.print_round_plays()
 
         # Determine round winner
-        self.determine_round_winner([card_one], [card_two])
+        self.determine_round_winner(*([card] for card in cards), contenders=contenders)
 
         # Print round results and clear both player's play piles
         self.end_round()
 
-    def declare_war(self) -> None:
-        """Play out a War"""
-        print('Tie! Declare war!\n')
+    def declare_war(self, contenders: List[Player] = None) -> None:
+        """
+        Play out a War between the tied players (defaulted to every player)
+
+            Parameters:
+                contenders (List[Player]): The players tied for the highest card, in seat order
+        """
+        # Once the variant's limit of 'War's in a round is reached, the tie ends the round with no winner
+        if self.variant.war_depth is not None and self.round_war_count >= self.variant.war_depth:
+            if not self.headless:
+                self.display('Tie! Too many wars - every player takes back their cards\n')
+            self.return_play_piles()
+            return
+
+        if not self.headless:
+            self.display('Tie! Declare war!\n')
         self.war_count += 1
+        self.round_war_count += 1
 
-        # If either player has less the 4 cards required for war, then the game is over and the other player wins
+        # Players with less than the cards required for war are eliminated, in seat order, until one player is left
+        # (unless the variant lets them play what they have).  With only two players the one left wins the game.
         # Otherwise, determine a round winner using war cards
-        if self.player_one.hand_count() < 4:
-            self.game_winner = self.player_two
-            self.round_winner = self.player_two
-            print(f'{self.player_one.name} doesn\'t have enough cards for war...\n')
-        elif self.player_two.hand_count() < 4:
-            self.game_winner = self.player_one
-            self.round_winner = self.player_one
-            print(f'{self.player_two.name} doesn\'t have enough cards for war...\n')
+        contenders = list(contenders or self.players)
+        forfeits = self.variant.short_war == 'forfeit'
+        for player in list(contenders):
+            if forfeits and len(contenders) > 1 and player.hand_count() < self.variant.war_cards():
+                contenders.remove(player)
+                self.eliminated_players.add(player)
+                self.forfeit = True
+                if not self.headless:
+                    self.display(f'{player.name} doesn\'t have enough cards for war...\n')
+
+        if len(contenders) == 1:
+            self.round_winner = contenders[0]
+            if len(set(self.players_in_play() + contenders)) > 1:
+                self.collect_play_piles(self.round_winner)
+            else:
+                self.game_winner = self.round_winner
         else:
             # Update and display war play piles for each player
-            war_cards_one = self.play_war_cards(self.player_one)
-            war_cards_two = self.play_war_cards(self.player_two)
-            self.print_round_plays()
+            war_cards = [self.play_war_cards(player) for player in contenders]
+            if self.variant.short_war == 'play_remaining':
+                # Players without any cards left stand by their last face up card
+                if not any(war_cards):
+                    if not self.headless:
+                        self.display('No cards left for war - every player takes back their cards\n')
+                    self.return_play_piles()
+                    return
+                war_cards = [cards or [player.play_pile.cards[-1]] for player, cards in zip(contenders, war_cards)]
+            if not self.headless:
+                self.print_round_plays()
 
             # Determine round winner
-            self.determine_round_winner(war_cards_one, war_cards_two)
+            self.determine_round_winner(*war_cards, contenders=contenders)
 
     def play_war_cards(self, player: Player) -> List[Card]:
         """Draw 'War' cards for the provided player and put them in play.  Then return all cards pulled"""
-        # Draw 3 cards and leave face down
-        drawn_cards = player.draw_from_hand(3)
+        # Draw the variant's face down cards (3 by default) and leave face down.  Without forfeits, a player short
+        # of cards plays every card they have left, and none at all once they have run out
+        face_down_cards = self.variant.face_down_cards
+        if self.variant.short_war == 'play_remaining':
+            face_down_cards = min(face_down_cards, player.hand_count() - 1)
+            if face_down_cards < 0:
+                return []
+        drawn_cards = player.draw_from_hand(face_down_cards)
 
-        # Draw 4th card, which is used to determine round winner, and flip it face up
+        # Draw the last card, which is used to determine round winner, and flip it face up
         war_card = player.draw_from_hand()[0]
         war_card.flip()
         drawn_cards.append(war_card)
@@ -133,34 +345,60 @@ class War(CardGame):
         player.add_to_play_pile(drawn_cards)
         return drawn_cards
 
-    def determine_round_winner(self, cards_one: List[Card], cards_two: List[Card]) -> None:
+    def collect_play_piles(self, winner: Player) -> None:
+        """Add every player's play pile to the bottom of the round winner's hand, in the variant's pile order"""
+        if self.variant.pile_order == 'seat':
+            super().collect_play_piles(winner)
+            return
+
+        others = [player for player in self.players if player is not winner]
+        players = [winner] + others if self.variant.pile_order == 'winner_first' else others + [winner]
+        for player in players:
+            if player.play_pile:
+                winner.add_to_hand(player.play_pile.cards)
+
+    def return_play_piles(self) -> None:
+        """End the round without a winner, every player taking their own play pile back to the bottom of their hand"""
+        for player in self.players:
+            if player.play_pile:
+                player.add_to_hand(player.play_pile.cards)
+        self.round_winner = None
+
+    def shuffle_hand_if_needed(self, player: Player) -> None:
+        """Shuffle the player's hand when the variant's reshuffle policy calls for it"""
+        if self.variant.reshuffle == 'every_round':
+            self.shuffle_hand(player)
+        else:
+            super().shuffle_hand_if_needed(player)
+
+    def determine_round_winner(self, *played_cards: List[Card], contenders: List[Player] = None) -> None:
         """
-        Determine which player wins this round, or declare 'War' in the event of a tie
+        Determine which player wins this round, or declare 'War' between the players tied for the highest card
 
             Parameters:
-                cards_one (List[Card]): The cards played by player one
-                cards_two (List[Card]): The cards played by player two
+                played_cards (List[Card]): The cards played by each contender
+                contenders (List[Player]): The players the cards were played by, in seat order
+                    (defaulted to every player)
         """
+        contenders = contenders or self.players
 
-        # Pull the rightmost card from list
-        decision_card_one = cards_one[-1]
-        decision_card_two = cards_two[-1]
-
-        # Check the value of both cards
-        decision_card_one_value = self.rank_value_map[decision_card_one.rank]
-        decision_card_two_value = self.rank_value_map[decision_card_two.rank]
+        # Find the players whose rightmost card has the highest value, in a single pass
+        highest_value = None
+        leaders = []
+        for player, cards in zip(contenders, played_cards):
+            value = self.rank_value_map[cards[-1].rank]
+            if highest_value is None or value > highest_value:
+                highest_value = value
+                leaders = [player]
+            elif value == highest_value:
+                leaders.append(player)
 
         # Determine round winner or declare war if there's a tie
-        if decision_card_one_value > decision_card_two_value:
-            self.player_one.add_to_hand(self.player_one.play_pile.cards)
-            self.player_one.add_to_hand(self.player_two.play_pile.cards)
-            self.round_winner = self.player_one
-        elif decision_card_one_value < decision_card_two_value:
-            self.player_two.add_to_hand(self.player_one.play_pile.cards)
-            self.player_two.add_to_hand(self.player_two.play_pile.cards)
-            self.round_winner = self.player_two
-        elif decision_card_one_value == decision_card_two_value:
-            self.declare_war()
+        if len(leaders) == 1:
+            self.collect_play_piles(leaders[0])
+            self.round_winner = leaders[0]
+        else:
+            self.declare_war(leaders)
 
     def prompt_replay(self) -> None:
         """
@@ -169,8 +407,8 @@ class War(CardGame):
         """
         user_input = input('\nPress \'Y\' to play again: ')
         if user_input == 'Y' or user_input == 'y':
-            self.war_count = 0
+            self.reset_game_state()
             self.clear_prompt()
             self.play()
         else:
-            print('\nGoodbye!')
+            self.display('\nGoodbye!')
@@ -1,6 +1,6 @@
 import os
 
-from card_games import War
+from card_games.registry import game_names, load_game
 
 
 # ASCII art generated by https://patorjk.com/software/taag/#p=display&f=Doom&t=Card%20Table
@@ -21,21 +21,15 @@ class CardTable:
     banner: str
         The ASCII art displayed above the menu prompt
     option_labels: List[str]
-        The names of the card games available, with 'Exit' as the final option
+        The names of the card games registered (see card_games.registry), with 'Exit' as the final option
     option_values: List[() => None]
         The executable functions to be associated with each option
     """
 
     def __init__(self):
         self.banner = ASCII_ART
-        self.option_labels = [
-            'War',
-            'Exit'
-        ]
-        self.option_values = [
-            self.play_war,
-            self.exit
-        ]
+        self.option_labels = game_names() + ['Exit']
+        self.option_values = [lambda name=name: self.play(name) for name in game_names()] + [self.exit]
 
     def _clear_prompt(self) -> None:
         """Clear user prompt"""
@@ -83,9 +77,9 @@ class CardTable:
         """Terminate the card table prompt"""
         print("Goodbye!")
 
-    def play_war(self) -> None:
-        """Launch the card game 'War'"""
-        War().play()
+    def play(self, game_name: str) -> None:
+        """Launch the registered card game with the given name, only importing it now it has been chosen"""
+        load_game(game_name)().play()
 
     def play_game(self) -> None:
         """Prompt user for a game to choose, and execute the option selected"""
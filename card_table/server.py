@@ -0,0 +1,249 @@
+"""
+An asyncio server hosting many concurrent tables of War from a single process, over a simple line protocol
+(e.g. play with `nc localhost 8023`).  Start it from the project's main directory with:
+
+    python -m card_table.server --port 8023
+
+Each connection is a session at its own table.  Commands are case insensitive, one per line:
+
+    NEW [name ...]    Deal a new game of War for the named players (defaulted to two players, at most max_players)
+    PLAY              Play the next round.  An empty line also plays the next round
+    SKIP              Play the rest of the game, only displaying the game summary
+    STATUS            Display each player's card count
+    QUIT              Leave the table
+
+Every response is any number of lines of game output, each prefixed with '| ', followed by a single status line
+starting with 'OK' or 'ERR'.
+
+Games are played one round at a time between reads, and skipping to the end of a game hands control back to the
+event loop after every round, so no table can hold up the others.  Output is only written once the client has
+read enough of the previous output, so a slow client only slows down its own table.
+"""
+from card_games import OutputSink, War
+from typing import List
+import argparse
+import asyncio
+import random
+
+
+DEFAULT_PORT = 8023
+
+# The most players a client can seat at a table, since a deck is dealt to every seat
+DEFAULT_MAX_PLAYERS = 8
+
+# The longest command line accepted, and the unread output (in bytes) after which a table waits for its client
+LINE_LIMIT = 1024
+WRITE_BUFFER_LIMIT = 64 * 1024
+
+
+class TableSession:
+    """
+    A class representing a single client's session at a table, driving games of War through the line protocol
+
+    Attributes
+    ----------
+    reader: asyncio.StreamReader
+        The stream the client's commands are read from
+    writer: asyncio.StreamWriter
+        The stream the responses are written to
+    rng: random.Random
+        The random number generator used for every game at the table, if any
+    output: OutputSink
+        Where the games' output is buffered, until it is sent with the next response
+    war: War
+        The game being played, if any
+    max_players: int
+        The most players a game at the table can be dealt for
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, rng: random.Random = None,
+                 max_players: int = DEFAULT_MAX_PLAYERS):
+        self.reader = reader
+        self.writer = writer
+        self.rng = rng
+        self.max_players = max_players
+        self.output = OutputSink(buffered=True)
+        self.war = None
+
+    async def run(self) -> None:
+        """Answer the client's commands until they quit or disconnect"""
+        await self.respond('OK Welcome to CardTable.  Commands: NEW [name ...], PLAY, SKIP, STATUS, QUIT')
+        while True:
+            try:
+                line = await self.reader.readline()
+            except ValueError:
+                await self.respond('ERR line too long')
+                return
+            if not line:
+                return
+
+            command, *arguments = line.decode(errors='replace').split() or ['PLAY']
+            command = command.upper()
+            if command == 'QUIT':
+                await self.respond('OK Goodbye!')
+                return
+            elif command == 'NEW':
+                await self.respond(self.new_game(arguments))
+            elif command == 'PLAY':
+                await self.respond(self.play_round())
+            elif command == 'SKIP':
+                await self.respond(await self.skip_to_end())
+            elif command == 'STATUS':
+                await self.respond(self.status())
+            else:
+                await self.respond(f'ERR Unknown command {command}')
+
+    def new_game(self, names: List[str]) -> str:
+        """Deal a new game of War for the named players"""
+        if len(names) == 1:
+            return 'ERR War requires at least 2 players'
+        if len(names) > self.max_players:
+            return f'ERR At most {self.max_players} players can play at a table'
+        self.war = War(names=names or ['Player 1', 'Player 2'], rng=self.rng, output=self.output)
+        self.war.deal_hands()
+        return f'OK Dealt {self.war.number_of_players} players'
+
+    def play_round(self) -> str:
+        """Play the next round of the game"""
+        if not self.war:
+            return 'ERR No game being played.  Send NEW to deal one'
+        self.war.play_next_round()
+        if self.war.is_game_over():
+            return self.end_game()
+        return f'OK Round {self.war.round_number}'
+
+    async def skip_to_end(self) -> str:
+        """Play the rest of the game without displaying it, handing control back to the event loop every round"""
+        if not self.war:
+            return 'ERR No game being played.  Send NEW to deal one'
+        self.war.headless = True
+        while not self.war.is_game_over():
+            self.war.play_next_round()
+            await asyncio.sleep(0)
+        self.war.headless = False
+        return self.end_game()
+
+    def end_game(self) -> str:
+        """Display the game summary, and reset the table for the next game"""
+        winner_name = self.war.game_winner.name if self.war.game_winner else None
+        round_number = self.war.round_number
+        self.war.end_game()
+        self.war.reset_game_state()
+        self.war = None
+        if winner_name:
+            return f'OK Game over after {round_number} rounds.  Winner: {winner_name}'
+        return f'OK Game over after {round_number} rounds.  Draw'
+
+    def status(self) -> str:
+        """Display each player's card count"""
+        if not self.war:
+            return 'ERR No game being played.  Send NEW to deal one'
+        for player in self.war.players:
+            self.war.display(str(player))
+        return f'OK Round {self.war.round_number}'
+
+    async def respond(self, status: str) -> None:
+        """
+        Send the game output since the last response, followed by the status line.
+        Waits until the client has read enough of its earlier output first
+        """
+        lines = [f'| {line}' for line in self.output.take().splitlines()]
+        lines.append(status)
+        self.writer.write(('\n'.join(lines) + '\n').encode())
+        await self.writer.drain()
+
+
+class WarServer:
+    """
+    A class representing a server hosting a table of War for every connection
+
+    Attributes
+    ----------
+    host: str
+        The address the server listens on
+    port: int
+        The port the server listens on.  0 picks a free port, which is then available once started
+    max_sessions: int
+        The number of concurrent sessions after which new connections are turned away
+    seed: int
+        The seed of every table's random number generator (combined with the session number), if any
+    max_players: int
+        The most players a client can seat at their table
+    sessions: Set[asyncio.Task]
+        The sessions being played
+    session_count: int
+        The number of sessions started
+    server: asyncio.AbstractServer
+        The listening server, once started
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = DEFAULT_PORT, max_sessions: int = 1000,
+                 seed: int = None, max_players: int = DEFAULT_MAX_PLAYERS):
+        self.host = host
+        self.port = port
+        self.max_sessions = max_sessions
+        self.seed = seed
+        self.max_players = max_players
+        self.sessions = set()
+        self.session_count = 0
+        self.server = None
+
+    async def start(self) -> None:
+        """Start listening for connections"""
+        self.server = await asyncio.start_server(self.handle_connection, self.host, self.port, limit=LINE_LIMIT)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        """Start listening for connections, and serve them until cancelled"""
+        await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self) -> None:
+        """Stop listening, and end every session"""
+        self.server.close()
+        for session in list(self.sessions):
+            session.cancel()
+        await asyncio.gather(*self.sessions, return_exceptions=True)
+        await self.server.wait_closed()
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Play a session at a new table for the connection, unless the server is full"""
+        writer.transport.set_write_buffer_limits(high=WRITE_BUFFER_LIMIT)
+        task = asyncio.current_task()
+        try:
+            if len(self.sessions) >= self.max_sessions:
+                writer.write(b'ERR Server full\n')
+                await writer.drain()
+                return
+
+            self.sessions.add(task)
+            rng = None if self.seed is None else random.Random(f'{self.seed}/{self.session_count}')
+            self.session_count += 1
+            await TableSession(reader, writer, rng, self.max_players).run()
+        except (ConnectionError, asyncio.CancelledError):
+            # The client has disconnected, or the server is closing
+            pass
+        finally:
+            self.sessions.discard(task)
+            writer.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Host tables of War over a line protocol')
+    parser.add_argument('--host', default='127.0.0.1', help='address to listen on')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='port to listen on')
+    parser.add_argument('--max-sessions', type=int, default=1000, help='concurrent sessions to allow')
+    parser.add_argument('--seed', type=int, help='seed for reproducible tables')
+    parser.add_argument('--max-players', type=int, default=DEFAULT_MAX_PLAYERS, help='players to allow per table')
+    args = parser.parse_args()
+
+    server = WarServer(args.host, args.port, args.max_sessions, args.seed, args.max_players)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
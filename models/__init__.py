@@ -1,3 +1,5 @@
 from .card import Card
 from .card_deck import CardDeck
-from .player import Player
\ No newline at end of file
+from .compact_deck import CompactDeck
+from .player import Player
+from .shoe_view import ShoeView
\ No newline at end of file
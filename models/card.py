@@ -1,4 +1,12 @@
+from __future__ import annotations      # Allow typing hinting a method with the type of the enclosing class (i.e. Card).
+
+from .card_code import CARD_MASK, FACE_UP, RANK_INDEX, RANKS, SUIT_INDEX, SUITS
 from enums import Rank, Suit
+from typing import Iterable, List, Tuple
+
+
+# Immutable (Rank, Suit) template of a standard 52 card deck (excluding Jokers), in card code order
+STANDARD_DECK = tuple((rank, suit) for rank in Rank for suit in Suit)
 
 
 class Card:
@@ -15,6 +23,8 @@ class Card:
         Whether the playing card should be face up without it's value hidden or not
     """
 
+    __slots__ = ('rank', 'suit', 'face_up')
+
     def __init__(self, rank: Rank, suit: Suit, face_up: bool = False):
         if not isinstance(rank, Rank):
             raise Exception(f'{rank} is not a valid rank')
@@ -29,23 +39,67 @@ class Card:
         """Toggle whether the card is face up or down"""
         self.face_up = not self.face_up
 
+    @classmethod
+    def from_trusted(cls, ranks_and_suits: Iterable[Tuple[Rank, Suit]], face_up: bool = False) -> List[Card]:
+        """
+        Build a card for each (rank, suit) pair, skipping validation.
+        Only use with pairs already known to be valid, such as STANDARD_DECK
+        """
+        cards = []
+        new_card = object.__new__
+        for rank, suit in ranks_and_suits:
+            card = new_card(cls)
+            card.rank = rank
+            card.suit = suit
+            card.face_up = face_up
+            cards.append(card)
+        return cards
+
+    @classmethod
+    def from_code(cls, code: int) -> Card:
+        """Build the playing card represented by a compact card code (see models.card_code)"""
+        card = object.__new__(cls)
+        card.rank = RANKS[(code & CARD_MASK) >> 2]
+        card.suit = SUITS[code & 3]
+        card.face_up = bool(code & FACE_UP)
+        return card
+
+    def to_code(self) -> int:
+        """Encode this playing card as a compact card code (see models.card_code)"""
+        return RANK_INDEX[self.rank] * 4 + SUIT_INDEX[self.suit] | (FACE_UP if self.face_up else 0)
+
+    def lines(self) -> Tuple[str, ...]:
+        """Get the lines of the drawing of this card (see __str__), from the prebuilt rendering cache"""
+        if self.face_up:
+            return FACE_UP_LINES[self.rank, self.suit]
+        return FACE_DOWN_LINES
+
     def __str__(self):
         """Draw the given playing card.  Card will be hidden if the card is face down"""
-        card = "┌───────┐\n"
-
-        # Disguise face value if card isn't flipped
         if self.face_up:
-            card += f"| {self.rank.value:<2}    |\n"
-            card += "|       |\n"
-            card += f"|   {self.suit.value}   |\n"
-            card += "|       |\n"
-            card += f"|    {self.rank.value:>2} |\n"
-        else:
-            card += "| ----- |\n"
-            card += "| ----- |\n"
-            card += "| ----- |\n"
-            card += "| ----- |\n"
-            card += "| ----- |\n"
-
-        card += "└───────┘"
-        return card
+            return FACE_UP_STRINGS[self.rank, self.suit]
+        return FACE_DOWN_STRING
+
+
+def _draw_lines(rank: Rank, suit: Suit, face_up: bool) -> Tuple[str, ...]:
+    """Draw the lines of a playing card.  Card will be hidden if the card is face down"""
+    # Disguise face value if card isn't flipped
+    if face_up:
+        face = (
+            f"| {rank.value:<2}    |",
+            "|       |",
+            f"|   {suit.value}   |",
+            "|       |",
+            f"|    {rank.value:>2} |",
+        )
+    else:
+        face = ("| ----- |",) * 5
+
+    return ("┌───────┐",) + face + ("└───────┘",)
+
+
+# Rendering cache.  There are only 52 face up drawings and 1 face down drawing, so they are all built once up front
+FACE_UP_LINES = {(rank, suit): _draw_lines(rank, suit, True) for rank, suit in STANDARD_DECK}
+FACE_DOWN_LINES = _draw_lines(Rank.TWO, Suit.CLUBS, False)
+FACE_UP_STRINGS = {rank_and_suit: '\n'.join(lines) for rank_and_suit, lines in FACE_UP_LINES.items()}
+FACE_DOWN_STRING = '\n'.join(FACE_DOWN_LINES)
@@ -0,0 +1,42 @@
+"""
+Compact integer encoding of playing cards, for simulations that can't afford a Card object per card.
+
+A card code is rank_index * 4 + suit_index (0 - 51, in the same order as a freshly built CardDeck),
+with the FACE_UP bit set when the card is face up.  A code always fits in a single byte.
+"""
+from enums import Rank, Suit
+
+
+RANKS = tuple(Rank)
+SUITS = tuple(Suit)
+RANK_INDEX = {rank: index for index, rank in enumerate(RANKS)}
+SUIT_INDEX = {suit: index for index, suit in enumerate(SUITS)}
+
+FACE_UP = 0x40
+CARD_MASK = 0x3F
+
+# Every card of a standard 52 card deck (excluding Jokers), face down
+STANDARD_DECK_CODES = bytes(range(len(RANKS) * len(SUITS)))
+
+# Translation table (see bytes.translate) setting every card face down in a single call
+FACE_DOWN_TABLE = bytes(code & ~FACE_UP for code in range(256))
+
+
+def encode(rank: Rank, suit: Suit, face_up: bool = False) -> int:
+    """Encode the rank, suit and face of a card as a card code"""
+    return RANK_INDEX[rank] * 4 + SUIT_INDEX[suit] | (FACE_UP if face_up else 0)
+
+
+def rank_index(code: int) -> int:
+    """Get the index of the card's rank within Rank (0 for TWO up to 12 for ACE)"""
+    return (code & CARD_MASK) >> 2
+
+
+def suit_index(code: int) -> int:
+    """Get the index of the card's suit within Suit"""
+    return code & 3
+
+
+def is_face_up(code: int) -> bool:
+    """Check whether the encoded card is face up"""
+    return bool(code & FACE_UP)
@@ -1,72 +1,111 @@
 from __future__ import annotations      # Allow typing hinting a method with the type of the enclosing class (i.e. CardDeck).
                                         # Support for this may be included in a future release of python
 
-from .card import Card
-from enums import Rank, Suit
-from typing import List
+from .card import Card, STANDARD_DECK
+from .permutation import permute, seeded_permutation
+from collections import deque
+from typing import List, Tuple
 import random
 
 
 class CardDeck:
     """
-    A class to represent a deck of playing cards (excluding Jokers)
+    A class to represent a deck of playing cards (excluding Jokers).
+    A complete shuffled deck (or shoe of decks) is built when no cards are given, while an empty list of cards gives an
+    empty deck
 
     Attributes
     ----------
-    cards: List[Card]
-        The cards in the deck
+    queue: Deque[Card]
+        The cards in the deck, from the top of the deck (left) to the bottom (right)
     """
 
-    def __init__(self, cards: List[Card]=None):
-        if not cards:
-            # Build complete deck of 52 cards (excluding Jokers)
-            self.cards = [Card(rank, suit) for rank in Rank for suit in Suit]
-            self.shuffle()
+    __slots__ = ('queue',)
+
+    def __init__(self, cards: List[Card]=None, rng: random.Random = None, decks: int = 1):
+        if cards is None:
+            # Build complete deck of 52 cards (excluding Jokers), or a shoe of several complete decks
+            self.queue = deque(Card.from_trusted(STANDARD_DECK * decks))
+            self.shuffle(rng)
         else:
-            self.cards = cards
+            self.queue = deque(cards)
+
+    @property
+    def cards(self) -> List[Card]:
+        """
+        Get a list of the cards in the deck, from the top of the deck to the bottom.
+        The list is a copy, so it slices and compares like any list, but changing it doesn't change the deck
+        """
+        return list(self.queue)
+
+    @cards.setter
+    def cards(self, cards: List[Card]) -> None:
+        """Replace the cards in the deck"""
+        self.queue = deque(cards)
+
+    def shuffle(self, rng: random.Random = None) -> None:
+        """Shuffle the deck, using the provided random number generator if any, and set all cards face down"""
+        # Shuffle a list copy, since indexing into the middle of a deque gets slower as the deck (or shoe) grows
+        cards = list(self.queue)
+        (rng or random).shuffle(cards)
+        for card in cards:
+            card.face_up = False
+        self.queue.clear()
+        self.queue.extend(cards)
 
-    def shuffle(self) -> None:
-        """Shuffle the deck and set all cards face down"""
-        random.shuffle(self.cards)
-        for card in self.cards:
+    def shuffle_seeded(self, seed: int) -> None:
+        """
+        Shuffle the deck with the fast permutation of the given 32 bit seed (see models.permutation),
+        and set all cards face down
+        """
+        cards = permute(list(self.queue), seeded_permutation(seed, len(self.queue)))
+        # Faces are reset card by card: for a 26 card hand the loop measured about 3x quicker than a bulk
+        # map(setattr, ...), and about 8% of the cost of the permutation.  Keeping faces outside Card (as card codes)
+        # would cost a to_code and a from_code per card instead, which measured over 40x slower than the loop
+        for card in cards:
             card.face_up = False
+        self.queue.clear()
+        self.queue.extend(cards)
 
     def card_count(self) -> int:
         """Count the number of cards in the deck"""
-        return len(self.cards)
+        return len(self.queue)
+
+    def signature(self) -> Tuple[int, ...]:
+        """Build a signature of the order of the cards in the deck.  Cards keep their identity, so their ids are used"""
+        return tuple(map(id, self.queue))
+
+    def is_top_card_face_up(self) -> bool:
+        """Check whether the card on top of the deck is face up"""
+        return self.queue[0].face_up
 
     def deal(self, number_of_hands: int) -> List[CardDeck]:
         """Split the deck into number_of_hands amount of card groups"""
-        hands = []
-        for hand_index in range(number_of_hands):
-            starting_index = 0 + hand_index
-            hands.append(CardDeck(self.cards[starting_index::number_of_hands]))
-        return hands
+        # Slicing a single copy of the deck visits each card once, however many hands are dealt
+        cards = list(self.queue)
+        return [CardDeck(cards[hand_index::number_of_hands]) for hand_index in range(number_of_hands)]
 
     def draw(self, number_of_cards: int = 1) -> List[Card]:
-        """Draw number_of_cards amount of cards from the deck (defaulted to 1)"""
-        drawn_cards = []
-        for _ in range(number_of_cards):
-            drawn_cards.append(self.cards.pop(0))
-        return drawn_cards
+        """Draw number_of_cards amount of cards from the top of the deck (defaulted to 1)"""
+        if number_of_cards == 1:
+            return [self.queue.popleft()]
+        popleft = self.queue.popleft
+        return [popleft() for _ in range(number_of_cards)]
 
     def add(self, cards: List[Card]) -> None:
         """Add cards to the end of the deck"""
-        self.cards.extend(cards)
+        self.queue.extend(cards)
 
     def __str__(self):
         """
         Print all the cards in the deck, in groups of 5 at a time, from the top of the deck (left) to the bottom (right).
         Card group amounts can be increased/decreased by changing the value of 'chunks'
         """
-        res = ''
         chunks = 5
-        for card_group in (self.cards[index:index + chunks] for index in range(0, len(self.cards), chunks)):
-            strings = [str(card) for card in card_group]
-            strings_by_column = [s.split('\n') for s in strings]
-            strings_by_line = zip(*strings_by_column)
-
-            for parts in strings_by_line:
-                res += ''.join(parts) + '\n'
+        cards = list(self.queue)
+        rows = []
+        for index in range(0, len(cards), chunks):
+            card_lines = [card.lines() for card in cards[index:index + chunks]]
+            rows.append(''.join(''.join(parts) + '\n' for parts in zip(*card_lines)))
 
-        return res
+        return ''.join(rows)
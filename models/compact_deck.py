@@ -0,0 +1,78 @@
+from __future__ import annotations      # Allow typing hinting a method with the type of the enclosing class (i.e. CompactDeck).
+
+from .card import Card
+from .card_code import FACE_DOWN_TABLE, STANDARD_DECK_CODES
+from .permutation import permute, seeded_permutation
+from .shoe_view import ShoeView
+from typing import List
+import random
+
+
+class CompactDeck:
+    """
+    A class to represent a deck of playing cards as one byte per card (see models.card_code).
+    Mirrors the CardDeck interface, but draws and adds card codes instead of Card objects
+
+    Attributes
+    ----------
+    codes: bytearray
+        The card codes in the deck, from the top of the deck (left) to the bottom (right)
+    """
+
+    def __init__(self, codes: bytes = None, rng: random.Random = None, decks: int = 1):
+        if codes is None:
+            # Build complete deck of 52 cards (excluding Jokers), or a shoe of several complete decks
+            self.codes = bytearray(STANDARD_DECK_CODES * decks)
+            self.shuffle(rng)
+        else:
+            self.codes = bytearray(codes)
+
+    @classmethod
+    def from_cards(cls, cards: List[Card]) -> CompactDeck:
+        """Build a compact deck holding the same cards, in the same order, as the provided Card objects"""
+        return cls(bytes(card.to_code() for card in cards))
+
+    def to_cards(self) -> List[Card]:
+        """Build the Card objects for every card in the deck"""
+        return [Card.from_code(code) for code in self.codes]
+
+    def shuffle(self, rng: random.Random = None) -> None:
+        """Shuffle the deck, using the provided random number generator if any, and set all cards face down"""
+        (rng or random).shuffle(self.codes)
+        self.codes = self.codes.translate(FACE_DOWN_TABLE)
+
+    def shuffle_seeded(self, seed: int) -> None:
+        """Shuffle the deck with the fast permutation of the given 32 bit seed, like CardDeck.shuffle_seeded"""
+        order = seeded_permutation(seed, len(self.codes))
+        self.codes = bytearray(permute(self.codes, order)).translate(FACE_DOWN_TABLE)
+
+    def card_count(self) -> int:
+        """Count the number of cards in the deck"""
+        return len(self.codes)
+
+    def deal(self, number_of_hands: int) -> List[CompactDeck]:
+        """Split the deck into number_of_hands amount of card groups"""
+        return [CompactDeck(self.codes[hand_index::number_of_hands]) for hand_index in range(number_of_hands)]
+
+    def deal_views(self, number_of_hands: int) -> List[ShoeView]:
+        """
+        Split the deck into number_of_hands amount of card groups, exactly like deal (or CardDeck.deal), without
+        copying the deck: each hand is a view over this deck's codes, which must no longer be modified
+        """
+        positions = {}
+        return [ShoeView(self.codes, hand_index, number_of_hands, positions) for hand_index in range(number_of_hands)]
+
+    def draw(self, number_of_cards: int = 1) -> bytearray:
+        """
+        Draw number_of_cards amount of card codes from the top of the deck (defaulted to 1).
+        Deleting from the front of a bytearray only moves its start offset, so this doesn't shift the remaining cards
+        """
+        if number_of_cards > len(self.codes):
+            raise IndexError('draw from a deck without enough cards')
+        drawn_codes = self.codes[:number_of_cards]
+        del self.codes[:number_of_cards]
+        return drawn_codes
+
+    def add(self, codes: bytes) -> None:
+        """Add card codes to the end of the deck"""
+        self.codes += codes
@@ -0,0 +1,29 @@
+"""
+Fast seeded permutations, for reshuffling hands many times per game.
+
+Each permutation is derived directly from a 32 bit seed, by sorting the indexes by random keys taken from a SHAKE-128
+digest of the seed.  This skips seeding a new random.Random and its element by element Fisher-Yates shuffle, and is
+fully determined by the seed on every platform, so replay logs can record just the seed of each reshuffle.
+Keys are 32 bits, so ties (broken by index) are rare enough not to matter even for large shoes.
+"""
+from array import array
+from operator import itemgetter
+from typing import List, Sequence
+import hashlib
+import sys
+
+
+def seeded_permutation(seed: int, length: int) -> List[int]:
+    """Build the permutation of range(length) for the given 32 bit seed"""
+    keys = array('I', hashlib.shake_128(seed.to_bytes(4, 'little')).digest(4 * length))
+    if sys.byteorder == 'big':
+        keys.byteswap()
+    # Sorting by a list's items is quicker than by an array's, which builds an int for every lookup
+    return sorted(range(length), key=keys.tolist().__getitem__)
+
+
+def permute(items: Sequence, order: List[int]) -> list:
+    """Reorder the items so the i-th item is items[order[i]], in a single call"""
+    if len(order) < 2:
+        return [items[index] for index in order]
+    return list(itemgetter(*order)(items))
@@ -17,6 +17,8 @@ class Player:
         The player's cards in play for the current game/round
     """
 
+    __slots__ = ('name', 'hand', 'play_pile')
+
     def __init__(self, name: str):
         self.name = name
         self.hand = None
@@ -0,0 +1,131 @@
+from __future__ import annotations      # Allow typing hinting a method with the type of the enclosing class (i.e. ShoeView).
+
+from .card import Card
+from .card_code import FACE_UP
+from .card_deck import CardDeck
+from .permutation import permute, seeded_permutation
+from collections import deque
+from typing import Deque, Dict, List, Tuple
+import random
+
+
+class ShoeView:
+    """
+    A class to represent a hand dealt as a view over a shared, shuffled shoe of card codes (see CompactDeck.deal_views).
+    Mirrors the CardDeck interface, but dealing it copies nothing: the dealt cards stay in the shoe, and a Card is
+    only built for each of them once it is drawn from the hand
+
+    Attributes
+    ----------
+    shoe: bytearray
+        The shuffled card codes (see models.card_code) shared by every hand dealt from the shoe.  Never modified
+    head: int
+        The index in the shoe of the hand's next dealt card not drawn yet
+    step: int
+        The distance in the shoe between consecutive cards of the hand (the number of hands dealt)
+    remaining: int
+        The number of dealt cards not drawn yet, which are on top of the hand
+    added: Deque[Card]
+        The cards added to the hand since it was dealt, below the dealt cards not drawn yet
+    positions: Dict[Card, int]
+        The index in the shoe of every card built from it so far, shared by every hand dealt from the shoe
+    """
+
+    __slots__ = ('shoe', 'head', 'step', 'remaining', 'added', 'positions')
+
+    def __init__(self, shoe: bytearray, start: int, step: int, positions: Dict[Card, int] = None):
+        self.shoe = shoe
+        self.head = start
+        self.step = step
+        self.remaining = len(range(start, len(shoe), step))
+        self.added = deque()
+        self.positions = {} if positions is None else positions
+
+    @property
+    def queue(self) -> Deque[Card]:
+        """
+        Get every card in the hand, from the top of the hand (left) to the bottom (right), like CardDeck.queue.
+        This builds a Card for every dealt card not drawn yet, after which the hand no longer refers to the shoe
+        """
+        if self.remaining:
+            stop = self.head + self.remaining * self.step
+            cards = [Card.from_code(code) for code in self.shoe[self.head:stop:self.step]]
+            self.positions.update(zip(cards, range(self.head, stop, self.step)))
+            self.added.extendleft(reversed(cards))
+            self.head = stop
+            self.remaining = 0
+        return self.added
+
+    @property
+    def cards(self) -> List[Card]:
+        """Get a list of every card in the hand, from the top of the hand to the bottom, like CardDeck.cards"""
+        return list(self.queue)
+
+    def shuffle(self, rng: random.Random = None) -> None:
+        """Shuffle the hand, using the provided random number generator if any, and set all cards face down"""
+        cards = list(self.queue)
+        (rng or random).shuffle(cards)
+        for card in cards:
+            card.face_up = False
+        self.added.clear()
+        self.added.extend(cards)
+
+    def shuffle_seeded(self, seed: int) -> None:
+        """
+        Shuffle the hand with the fast permutation of the given 32 bit seed, like CardDeck.shuffle_seeded.
+        The shuffled hand mixes dealt and added cards, so any dealt cards not drawn yet are built first (see queue).
+        Dealt cards are face down, so a hand reshuffled once its top card is face up has already drawn all of them,
+        and only reshuffling before every round builds any
+        """
+        cards = permute(list(self.queue), seeded_permutation(seed, self.card_count()))
+        # Faces are reset card by card, for the reasons measured in CardDeck.shuffle_seeded
+        for card in cards:
+            card.face_up = False
+        self.added.clear()
+        self.added.extend(cards)
+
+    def card_count(self) -> int:
+        """Count the number of cards in the hand"""
+        return self.remaining + len(self.added)
+
+    def signature(self) -> Tuple[int, ...]:
+        """
+        Build a signature of the order of the cards in the hand, like CardDeck.signature, without building the dealt
+        cards not drawn yet: every card is identified by its index in the shoe (or its id, if it isn't from the shoe)
+        """
+        stop = self.head + self.remaining * self.step
+        try:
+            added_positions = tuple(map(self.positions.__getitem__, self.added))
+        except KeyError:
+            added_positions = tuple(map(self.positions.get, self.added, map(id, self.added)))
+        return tuple(range(self.head, stop, self.step)) + added_positions
+
+    def is_top_card_face_up(self) -> bool:
+        """Check whether the card on top of the hand is face up, without building it"""
+        if self.remaining:
+            return bool(self.shoe[self.head] & FACE_UP)
+        return self.added[0].face_up
+
+    def draw(self, number_of_cards: int = 1) -> List[Card]:
+        """Draw number_of_cards amount of cards from the top of the hand (defaulted to 1)"""
+        drawn_cards = []
+        if self.remaining:
+            dealt_count = min(number_of_cards, self.remaining)
+            stop = self.head + dealt_count * self.step
+            drawn_cards = [Card.from_code(code) for code in self.shoe[self.head:stop:self.step]]
+            self.positions.update(zip(drawn_cards, range(self.head, stop, self.step)))
+            self.head = stop
+            self.remaining -= dealt_count
+            number_of_cards -= dealt_count
+
+        popleft = self.added.popleft
+        drawn_cards.extend(popleft() for _ in range(number_of_cards))
+        return drawn_cards
+
+    def add(self, cards: List[Card]) -> None:
+        """Add cards to the end of the hand"""
+        self.added.extend(cards)
+
+    def __str__(self):
+        """Print all the cards in the hand, like CardDeck"""
+        return str(CardDeck(self.queue))
@@ -0,0 +1,32 @@
+import argparse
+import sys
+
+from benchmarks.suite import DEFAULT_THRESHOLD, compare_results, format_results, load_results, run_benchmarks, \
+    save_results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the CardTable performance benchmarks')
+    parser.add_argument('--output', help='save the results as JSON to this path')
+    parser.add_argument('--compare', help='compare the results against a baseline JSON file saved with --output')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='fraction slower than the baseline that counts as a regression (default: %(default)s)')
+    parser.add_argument('--filter', default='', help='only run benchmarks whose name contains this text')
+    args = parser.parse_args()
+
+    baseline = load_results(args.compare) if args.compare else None
+    results = run_benchmarks(args.filter)
+    print(format_results(results, baseline, args.threshold))
+
+    if args.output:
+        save_results(results, args.output)
+
+    if baseline:
+        regressions = compare_results(results, baseline, args.threshold)
+        if regressions:
+            print(f'\n{len(regressions)} regression(s): {", ".join(regressions)}')
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
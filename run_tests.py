@@ -1,8 +1,13 @@
 import unittest
 
-from __tests__.card_games import TestCardGame, TestWar
-from __tests__.models import TestCard, TestCardDeck, TestPlayer
+from __tests__.benchmarks import TestSuite
+from __tests__.card_table import TestServer
+from __tests__.card_games import TestCardGame, TestCycleDetector, TestInstrumentation, TestOutputSink, TestRegistry, \
+    TestReplayLog, TestRoundTrace, TestRuleVariant, TestWar
+from __tests__.models import TestCard, TestCardDeck, TestCompactDeck, TestPermutation, TestPlayer, TestShoeView
+from __tests__.simulation import TestCheckpoint, TestResultsStore, TestSequential, TestSimulator, TestSolver, \
+    TestStatistics, TestSweep, TestVectorizedWar
 
 
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    unittest.main()
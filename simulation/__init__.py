@@ -0,0 +1 @@
+from .simulator import SimulationResults, simulate
\ No newline at end of file
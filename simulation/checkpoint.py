@@ -0,0 +1,139 @@
+"""
+Checkpoints of long running simulations, so an interrupted simulation resumes where it left off instead of from zero.
+
+Every game of a simulation gets its own random number generator, derived from the simulation seed and the game number
+(see simulator.game_rng), so the only state needed to resume is the simulation's settings, which chunks of games are
+done and the aggregate of their results.  Aggregates only keep integer counts, so a resumed simulation gives results
+identical to an uninterrupted one, whatever order its chunks finish in.
+
+Checkpoints are double buffered between two slot files (the path suffixed with '.0' and '.1'), each save overwriting
+the older slot.  A save interrupted part way through only ever tears the slot being written, which then fails its
+checksum, so the previous checkpoint in the other slot is still intact to resume from.  Slots are written by the
+process collecting results, while the worker processes keep playing the chunks already sent to them.
+"""
+from __future__ import annotations      # Allow type hinting SimulationResults without importing the simulator.
+
+from typing import Dict, Optional, Tuple, TYPE_CHECKING
+import os
+import pickle
+import struct
+import time
+import zlib
+
+if TYPE_CHECKING:
+    from simulation.simulator import SimulationResults
+
+
+MAGIC = b'WARC'
+VERSION = 2
+
+# The magic, version, sequence number, payload length and payload checksum of a checkpoint slot
+HEADER = struct.Struct('<4sBQII')
+
+
+class SimulationCheckpoint:
+    """
+    A class representing the checkpoint of a simulation, saved periodically while its chunks of games are completed
+
+    Attributes
+    ----------
+    path: str
+        The path of the checkpoint, which is saved to the slot files path + '.0' and path + '.1'
+    interval: float
+        The minimum number of seconds between saves as chunks are completed
+    settings: Dict[str, object]
+        The settings of the simulation (seed, number of games, ...).  Only a simulation with identical settings
+        can resume from the checkpoint
+    chunk_size: int
+        The number of games in each chunk of the simulation
+    completed: Set[int]
+        The number of the first game of every completed chunk
+    results: SimulationResults
+        The aggregate results of every completed chunk
+    sequence: int
+        The sequence number of the last checkpoint saved or loaded, which decides the slot of the next one
+    last_saved: float
+        The time (from time.monotonic) the checkpoint was last saved or loaded
+    """
+
+    def __init__(self, path: str, interval: float = 60.0):
+        self.path = path
+        self.interval = interval
+        self.settings = None
+        self.chunk_size = None
+        self.completed = set()
+        self.results = None
+        self.sequence = 0
+        self.last_saved = time.monotonic()
+
+    def slot_path(self, sequence: int) -> str:
+        """Get the path of the slot file the checkpoint with the given sequence number is saved to"""
+        return f'{self.path}.{sequence % 2}'
+
+    def start(self, settings: Dict[str, object], chunk_size: int, results: SimulationResults) -> None:
+        """Start checkpointing a new simulation, aggregating its chunks into results"""
+        self.settings = settings
+        self.chunk_size = chunk_size
+        self.completed = set()
+        self.results = results
+        self.last_saved = time.monotonic()
+
+    def load(self, settings: Dict[str, object]) -> bool:
+        """
+        Load the latest intact checkpoint saved, giving whether there was one.
+        Raises an exception if it is the checkpoint of a simulation with different settings
+        """
+        slots = [slot for slot in (read_slot(self.slot_path(0)), read_slot(self.slot_path(1))) if slot]
+        if not slots:
+            return False
+
+        sequence, state = max(slots, key=lambda slot: slot[0])
+        if state['settings'] != settings:
+            raise Exception(f'The checkpoint at {self.path} is of a different simulation: {state["settings"]}')
+        self.settings = state['settings']
+        self.chunk_size = state['chunk_size']
+        self.completed = state['completed']
+        self.results = state['results']
+        self.sequence = sequence
+        self.last_saved = time.monotonic()
+        return True
+
+    def complete(self, start: int) -> None:
+        """Record the chunk starting at game number start as completed, saving if the interval has passed"""
+        self.completed.add(start)
+        if time.monotonic() - self.last_saved >= self.interval:
+            self.save()
+
+    def save(self) -> None:
+        """Save the checkpoint over the older slot, flushing it all the way to disk"""
+        state = {
+            'settings': self.settings,
+            'chunk_size': self.chunk_size,
+            'completed': self.completed,
+            'results': self.results,
+        }
+        payload = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+        self.sequence += 1
+        with open(self.slot_path(self.sequence), 'wb') as slot_file:
+            slot_file.write(HEADER.pack(MAGIC, VERSION, self.sequence, len(payload), zlib.crc32(payload)))
+            slot_file.write(payload)
+            slot_file.flush()
+            os.fsync(slot_file.fileno())
+        self.last_saved = time.monotonic()
+
+
+def read_slot(path: str) -> Optional[Tuple[int, Dict[str, object]]]:
+    """Read the sequence number and state of the checkpoint in a slot file, if it exists and is intact"""
+    try:
+        with open(path, 'rb') as slot_file:
+            data = slot_file.read()
+    except FileNotFoundError:
+        return None
+    if len(data) < HEADER.size:
+        return None
+
+    magic, version, sequence, length, checksum = HEADER.unpack_from(data)
+    payload = data[HEADER.size:HEADER.size + length]
+    if magic != MAGIC or version != VERSION or len(payload) != length or zlib.crc32(payload) != checksum:
+        return None
+    return sequence, pickle.loads(payload)
@@ -0,0 +1,430 @@
+"""
+A columnar store of per-game simulation records, for simulations far too large to keep as JSON or CSV.
+
+A store is a directory holding a file per column, each a fixed width little endian array with one value per game,
+and a manifest (manifest.json) with the simulation seed and the number of games stored.  Records are appended in
+batches, and the manifest is only updated once a whole batch is written, so a store cut short (e.g. by a crash) is
+still readable up to its last complete batch.
+
+Stores are read through mmap, so only the pages of the columns actually read are loaded into memory.  With NumPy
+installed, columns can also be read as numpy.memmap arrays, and filtered scans are vectorized.
+
+Parallel workers each write a store of their own (a shard), which are then concatenated into a single store.
+"""
+from array import array
+from card_games import GameResult
+from concurrent.futures import ProcessPoolExecutor
+from simulation.simulator import play_games
+from typing import Callable, Dict, Iterable, Iterator, List
+import json
+import mmap
+import os
+import shutil
+import sys
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# The array typecode and NumPy dtype of each column.  A draw's winner is stored as -1, and the winner is 16 bits wide
+# so any number of seats a game can be dealt to (replay logs allow up to 255) is stored
+COLUMNS = {
+    'game_number': ('Q', '<u8'),
+    'winner': ('h', '<i2'),
+    'round_number': ('I', '<u4'),
+    'war_count': ('I', '<u4'),
+    'flags': ('B', 'u1'),
+}
+
+# The bits of the flags column
+FORFEIT_FLAG = 0x01
+CYCLE_FLAG = 0x02
+
+MANIFEST = 'manifest.json'
+VERSION = 2
+
+# The number of records buffered before they are appended to the column files
+BATCH_SIZE = 65536
+
+# The number of records checked at a time by a filtered scan
+SCAN_BLOCK = 1 << 20
+
+
+class GameRecord:
+    """
+    A class representing the record of a single simulated game
+
+    Attributes
+    ----------
+    game_number: int
+        The number of the game in its simulation, from which the game's random number generator is derived
+        (see simulator.game_rng)
+    winner: int
+        The seat number of the game winner, or -1 if the game was a draw
+    round_number: int
+        The number of rounds played
+    war_count: int
+        The number of 'War's that happened during the game
+    forfeit: bool
+        Whether the game ended because a player didn't have enough cards for war
+    cycle: bool
+        Whether the game was ended as a draw because it would never end
+    """
+
+    __slots__ = ('game_number', 'winner', 'round_number', 'war_count', 'forfeit', 'cycle')
+
+    def __init__(self, game_number: int, winner: int, round_number: int, war_count: int, forfeit: bool = False,
+                 cycle: bool = False):
+        self.game_number = game_number
+        self.winner = winner
+        self.round_number = round_number
+        self.war_count = war_count
+        self.forfeit = forfeit
+        self.cycle = cycle
+
+    def is_draw(self) -> bool:
+        """Check whether the game ended without a winner"""
+        return self.winner < 0
+
+
+class ResultsStoreWriter:
+    """
+    A class to append game records to a results store, creating it if needed
+
+    Attributes
+    ----------
+    path: str
+        The directory of the store
+    seed: int
+        The seed of the simulation the games are from
+    count: int
+        The number of records written to the column files, and recorded in the manifest
+    buffers: Dict[str, array]
+        The records appended since the last flush, by column
+    files: Dict[str, BinaryIO]
+        The column files being appended to
+    """
+
+    def __init__(self, path: str, seed: int = 0):
+        self.path = path
+        self.seed = seed
+        self.count = 0
+        os.makedirs(path, exist_ok=True)
+        if os.path.exists(os.path.join(path, MANIFEST)):
+            manifest = read_manifest(path)
+            if manifest['seed'] != seed:
+                raise Exception(f'The store at {path} holds games of the simulation with seed {manifest["seed"]}')
+            self.count = manifest['count']
+        else:
+            write_manifest(path, seed, 0)
+
+        # Anything past the manifest's count is from a batch cut short, so it is overwritten
+        self.buffers = {name: array(typecode) for name, (typecode, _) in COLUMNS.items()}
+        self.files = {}
+        for name, (typecode, _) in COLUMNS.items():
+            column_file = open(column_path(path, name), 'ab')
+            column_file.truncate(self.count * array(typecode).itemsize)
+            self.files[name] = column_file
+
+    def append(self, game_number: int, result: GameResult) -> None:
+        """Append the record of a single game"""
+        self.buffers['game_number'].append(game_number)
+        self.buffers['winner'].append(-1 if result.winner is None else result.winner)
+        self.buffers['round_number'].append(result.round_number)
+        self.buffers['war_count'].append(result.war_count)
+        self.buffers['flags'].append((FORFEIT_FLAG if result.forfeit else 0) | (CYCLE_FLAG if result.cycle else 0))
+        if len(self.buffers['flags']) >= BATCH_SIZE:
+            self.flush()
+
+    def extend(self, start: int, results: Iterable[GameResult]) -> None:
+        """Append the records of consecutively numbered games, starting with game number start"""
+        for game_number, result in enumerate(results, start):
+            self.append(game_number, result)
+
+    def flush(self) -> None:
+        """Write the buffered records to the column files, then record them in the manifest"""
+        batch_count = len(self.buffers['flags'])
+        if not batch_count:
+            return
+        for name, buffer in self.buffers.items():
+            if sys.byteorder == 'big':
+                buffer.byteswap()
+            buffer.tofile(self.files[name])
+            self.files[name].flush()
+            del buffer[:]
+        self.count += batch_count
+        write_manifest(self.path, self.seed, self.count)
+
+    def close(self) -> None:
+        """Write any buffered records, and close the column files"""
+        self.flush()
+        for column_file in self.files.values():
+            column_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+
+class ResultsStore:
+    """
+    A class to read a results store through mmap, without loading it into memory
+
+    Attributes
+    ----------
+    path: str
+        The directory of the store
+    seed: int
+        The seed of the simulation the games are from
+    count: int
+        The number of game records in the store
+    maps: Dict[str, mmap.mmap]
+        The memory map of each column file read so far
+    views: Dict[str, memoryview]
+        The typed view of each column read so far, over its memory map
+    arrays: Dict[str, numpy.memmap]
+        The NumPy memmap of each column read as an array so far
+    """
+
+    def __init__(self, path: str):
+        manifest = read_manifest(path)
+        self.path = path
+        self.seed = manifest['seed']
+        self.count = manifest['count']
+        self.maps = {}
+        self.views = {}
+        self.arrays = {}
+
+    def refresh(self) -> None:
+        """Re-read the manifest, e.g. while a writer is still appending, so the records stored since are read too"""
+        count = read_manifest(self.path)['count']
+        if count != self.count:
+            # The views and arrays only span the records stored when they were made
+            self.close()
+            self.count = count
+
+    def column(self, name: str) -> memoryview or array:
+        """
+        Get every value of a column, as a view over its memory map.
+        Only on big endian platforms, where the little endian values have to be swapped, is it read into memory
+        """
+        if name not in self.views:
+            typecode, _ = COLUMNS[name]
+            if sys.byteorder == 'big':
+                values = array(typecode)
+                with open(column_path(self.path, name), 'rb') as column_file:
+                    values.fromfile(column_file, self.count)
+                values.byteswap()
+                self.views[name] = values
+            elif not self.count:
+                self.views[name] = memoryview(b'').cast(typecode)
+            else:
+                with open(column_path(self.path, name), 'rb') as column_file:
+                    self.maps[name] = mmap.mmap(column_file.fileno(), 0, access=mmap.ACCESS_READ)
+                self.views[name] = memoryview(self.maps[name]).cast(typecode)[:self.count]
+        return self.views[name]
+
+    def array(self, name: str) -> 'np.ndarray':
+        """Get every value of a column as a read only NumPy memmap.  Requires NumPy"""
+        if np is None:
+            raise Exception('Reading columns as arrays requires NumPy')
+        if name not in self.arrays:
+            _, dtype = COLUMNS[name]
+            if not self.count:
+                self.arrays[name] = np.zeros(0, dtype=dtype)
+            else:
+                self.arrays[name] = np.memmap(column_path(self.path, name), dtype=dtype, mode='r', shape=(self.count,))
+        return self.arrays[name]
+
+    def record(self, index: int) -> GameRecord:
+        """Get the record of the game stored at index"""
+        flags = self.column('flags')[index]
+        return GameRecord(self.column('game_number')[index], self.column('winner')[index],
+                          self.column('round_number')[index], self.column('war_count')[index],
+                          bool(flags & FORFEIT_FLAG), bool(flags & CYCLE_FLAG))
+
+    def records(self) -> Iterator[GameRecord]:
+        """Get the record of every game stored, in order"""
+        for index in range(self.count):
+            yield self.record(index)
+
+    def scan(self, **conditions) -> Iterator[GameRecord]:
+        """
+        Get the record of every game stored meeting all of the conditions, in order.  Reads the store a block at a
+        time, so scans take constant memory however large the store is
+
+            Parameters:
+                conditions: A column (game_number, winner, round_number or war_count) with either a value to equal,
+                            or an inclusive (minimum, maximum) range where None is unbounded.  Or forfeit or cycle,
+                            with whether the flag should be set.
+                            e.g. store.scan(round_number=(5000, None), forfeit=False)
+        """
+        for name in conditions:
+            if name == 'flags' or (name not in COLUMNS and name not in ('forfeit', 'cycle')):
+                raise Exception(f'Can\'t scan on {name}')
+
+        for start in range(0, self.count, SCAN_BLOCK):
+            stop = min(start + SCAN_BLOCK, self.count)
+            for index in (self.scan_block_numpy if np is not None else self.scan_block)(start, stop, conditions):
+                yield self.record(index)
+
+    def scan_block(self, start: int, stop: int, conditions: Dict[str, object]) -> List[int]:
+        """Find the indexes of the games from start to stop (exclusive) meeting all of the conditions"""
+        indexes = range(start, stop)
+        for name, condition in conditions.items():
+            values = self.column('flags' if name in ('forfeit', 'cycle') else name)
+            matches = condition_test(name, condition)
+            indexes = [index for index in indexes if matches(values[index])]
+        return indexes
+
+    def scan_block_numpy(self, start: int, stop: int, conditions: Dict[str, object]) -> List[int]:
+        """Find the indexes of the games from start to stop (exclusive) meeting all of the conditions, with NumPy"""
+        mask = np.ones(stop - start, dtype=bool)
+        for name, condition in conditions.items():
+            if name in ('forfeit', 'cycle'):
+                flag = FORFEIT_FLAG if name == 'forfeit' else CYCLE_FLAG
+                mask &= ((self.array('flags')[start:stop] & flag) != 0) == bool(condition)
+            elif isinstance(condition, tuple):
+                minimum, maximum = condition
+                values = self.array(name)[start:stop]
+                if minimum is not None:
+                    mask &= values >= minimum
+                if maximum is not None:
+                    mask &= values <= maximum
+            else:
+                mask &= self.array(name)[start:stop] == condition
+        return (np.flatnonzero(mask) + start).tolist()
+
+    def close(self) -> None:
+        """Release every view, array and memory map of the store"""
+        for view in self.views.values():
+            if isinstance(view, memoryview):
+                view.release()
+        for memory_map in self.maps.values():
+            memory_map.close()
+        self.views = {}
+        self.maps = {}
+        self.arrays = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+
+def condition_test(name: str, condition: object) -> Callable[[int], bool]:
+    """Build the test of a single column value for a scan condition (see ResultsStore.scan)"""
+    if name in ('forfeit', 'cycle'):
+        flag = FORFEIT_FLAG if name == 'forfeit' else CYCLE_FLAG
+        return lambda value: bool(value & flag) == bool(condition)
+    if isinstance(condition, tuple):
+        minimum, maximum = condition
+        return lambda value: (minimum is None or value >= minimum) and (maximum is None or value <= maximum)
+    return lambda value: value == condition
+
+
+def column_path(path: str, name: str) -> str:
+    """Get the path of a column's file in the store at path"""
+    return os.path.join(path, f'{name}.col')
+
+
+def read_manifest(path: str) -> Dict[str, object]:
+    """Read the manifest of the store at path"""
+    with open(os.path.join(path, MANIFEST)) as manifest_file:
+        manifest = json.load(manifest_file)
+    if manifest['version'] != VERSION:
+        raise Exception(f'Unsupported results store version {manifest["version"]}')
+    return manifest
+
+
+def write_manifest(path: str, seed: int, count: int) -> None:
+    """Replace the manifest of the store at path with one recording count records, in a single step"""
+    manifest = {'version': VERSION, 'seed': seed, 'count': count,
+                'columns': {name: dtype for name, (_, dtype) in COLUMNS.items()}}
+    temporary_path = os.path.join(path, MANIFEST + '.tmp')
+    with open(temporary_path, 'w') as manifest_file:
+        json.dump(manifest, manifest_file)
+    os.replace(temporary_path, os.path.join(path, MANIFEST))
+
+
+def remove_store(path: str) -> None:
+    """Remove the manifest and column files of the store at path, if there is one, leaving any other files there"""
+    for file_path in [os.path.join(path, MANIFEST)] + [column_path(path, name) for name in COLUMNS]:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+
+def concatenate(shard_paths: List[str], path: str) -> None:
+    """
+    Concatenate stores (e.g. the shards written by parallel workers) into a new store at path, in the order given.
+    Every shard must be of the same simulation
+    """
+    manifests = [read_manifest(shard_path) for shard_path in shard_paths]
+    seeds = {manifest['seed'] for manifest in manifests}
+    if len(seeds) > 1:
+        raise Exception(f'Can\'t concatenate stores of different simulations (seeds {sorted(seeds)})')
+
+    os.makedirs(path, exist_ok=True)
+    for name, (typecode, _) in COLUMNS.items():
+        with open(column_path(path, name), 'wb') as column_file:
+            for shard_path, manifest in zip(shard_paths, manifests):
+                with open(column_path(shard_path, name), 'rb') as shard_file:
+                    copy_bytes(shard_file, column_file, manifest['count'] * array(typecode).itemsize)
+
+    write_manifest(path, seeds.pop() if seeds else 0, sum(manifest['count'] for manifest in manifests))
+
+
+def copy_bytes(source, destination, size: int, buffer_size: int = 1 << 20) -> None:
+    """Copy exactly size bytes from the source file to the destination file, a buffer at a time"""
+    while size > 0:
+        data = source.read(min(buffer_size, size))
+        if not data:
+            raise Exception('The store is shorter than its manifest')
+        destination.write(data)
+        size -= len(data)
+
+
+def store_games(path: str, seed: int, start: int, stop: int, **game_options) -> None:
+    """
+    Play the games numbered start to stop (exclusive) of a simulation, appending the record of each to the store
+    at path.  game_options are passed on to simulator.play_games (e.g. reshuffle, max_rounds or variant)
+    """
+    with ResultsStoreWriter(path, seed) as writer:
+        writer.extend(start, play_games(seed, start, stop, **game_options))
+
+
+def simulate_to_store(n_games: int, path: str, workers: int = None, seed: int = 0, chunk_size: int = None,
+                      **game_options) -> ResultsStore:
+    """
+    Simulate n_games games of War like simulator.simulate, storing the record of every game at path, replacing any
+    store already there.  Each chunk of games is stored in a shard by its worker, and the shards are then concatenated
+    in game order.  game_options are passed on to simulator.play_games (e.g. reshuffle, max_rounds or variant)
+    """
+    workers = workers or os.cpu_count() or 1
+    remove_store(path)
+    if workers == 1:
+        store_games(path, seed, 0, n_games, **game_options)
+        return ResultsStore(path)
+
+    if not chunk_size:
+        chunk_size = max(1, min(100000, -(-n_games // (workers * 4))))
+    shards_path = path + '.shards'
+    if os.path.exists(shards_path):
+        # Shards left by an interrupted run would otherwise be appended to
+        shutil.rmtree(shards_path)
+    shard_paths = [os.path.join(shards_path, f'{start:012d}') for start in range(0, n_games, chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(store_games, shard_path, seed, start, min(start + chunk_size, n_games),
+                                   **game_options)
+                   for shard_path, start in zip(shard_paths, range(0, n_games, chunk_size))]
+        for future in futures:
+            future.result()
+
+    concatenate(shard_paths, path)
+    shutil.rmtree(shards_path)
+    return ResultsStore(path)
@@ -0,0 +1,159 @@
+"""
+Sequential sampling: simulating games of War until every estimate of interest is as precise as asked for, rather than
+for a fixed number of games picked (usually far too conservatively) up front.
+
+Games are played in chunks, and the chunks are merged in game order, so after each chunk the results are those of
+the first games of the simulation.  The precision targets are checked after every merged chunk, and the simulation
+stops at the first chunk where all of them are met, cancelling the chunks still queued in the pool.  The stopping
+point only depends on the seed, the chunk size and the targets, so the results are identical for any worker count.
+
+Checking the targets after every chunk (rather than once, at a fixed count) makes the stated confidence slightly
+optimistic, so min_games keeps the early, noisy estimates from stopping the simulation by chance.
+"""
+from card_games.rule_variant import RuleVariant
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from models import CardDeck
+from simulation.simulator import SimulationResults, simulate_games
+from statistics import NormalDist
+from typing import List
+import math
+import os
+
+
+# The estimates a precision target can be set on: proportions of games, and means per game
+RATE_METRICS = ('win_rate', 'forfeit_rate', 'draw_rate', 'cycle_rate')
+MEAN_METRICS = ('mean_rounds', 'mean_wars')
+
+
+class PrecisionTarget:
+    """
+    A class representing how precise an estimate from a simulation needs to be: the half width of its confidence
+    interval at the given confidence level.  e.g. PrecisionTarget('win_rate', 0.001, 0.99) for the first seat's
+    win rate to within ±0.1% at 99% confidence, or PrecisionTarget('mean_rounds', 1) for the mean rounds to within ±1
+
+    Attributes
+    ----------
+    metric: str
+        The estimate the target is set on (see RATE_METRICS and MEAN_METRICS)
+    half_width: float
+        The largest half width of the confidence interval that meets the target, in the metric's units
+    confidence: float
+        The confidence level of the interval (e.g. 0.99)
+    seat: int
+        The seat whose win rate is estimated, for the win_rate metric
+    """
+
+    def __init__(self, metric: str, half_width: float, confidence: float = 0.95, seat: int = 0):
+        if metric not in RATE_METRICS + MEAN_METRICS:
+            raise Exception(f'{metric} is not a valid metric - expected one of {RATE_METRICS + MEAN_METRICS}')
+        if half_width <= 0:
+            raise Exception(f'{half_width} is not a valid half width')
+        if not 0 < confidence < 1:
+            raise Exception(f'{confidence} is not a valid confidence level')
+
+        self.metric = metric
+        self.half_width = half_width
+        self.confidence = confidence
+        self.seat = seat
+
+    def z_score(self) -> float:
+        """Calculate the number of standard errors either side of the estimate its confidence interval spans"""
+        return NormalDist().inv_cdf((1 + self.confidence) / 2)
+
+    def estimate(self, results: SimulationResults) -> float:
+        """Calculate the metric's estimate from the results so far"""
+        if self.metric == 'mean_rounds':
+            return results.rounds.moments.mean()
+        if self.metric == 'mean_wars':
+            return results.wars.moments.mean()
+        count = {
+            'win_rate': results.wins[self.seat],
+            'forfeit_rate': results.forfeit_count,
+            'draw_rate': results.draw_count,
+            'cycle_rate': results.cycle_count,
+        }[self.metric]
+        return count / results.game_count if results.game_count else 0.0
+
+    def interval_half_width(self, results: SimulationResults) -> float:
+        """
+        Calculate the half width of the estimate's confidence interval from the results so far.  Rates use the Wilson
+        score interval, which (unlike the normal approximation) doesn't collapse to zero for rare events
+        """
+        n = results.game_count
+        if not n:
+            return math.inf
+        z = self.z_score()
+        if self.metric in MEAN_METRICS:
+            moments = results.rounds.moments if self.metric == 'mean_rounds' else results.wars.moments
+            return z * moments.standard_deviation() / math.sqrt(n) if n > 1 else math.inf
+
+        rate = self.estimate(results)
+        return z / (1 + z * z / n) * math.sqrt(rate * (1 - rate) / n + z * z / (4 * n * n))
+
+    def is_met(self, results: SimulationResults) -> bool:
+        """Check whether the estimate is precise enough, from the results so far"""
+        return self.interval_half_width(results) <= self.half_width
+
+    def __str__(self):
+        seat = f' (seat {self.seat})' if self.metric == 'win_rate' else ''
+        return f'{self.metric}{seat} ±{self.half_width:g} at {self.confidence:.0%} confidence'
+
+
+def is_finished(results: SimulationResults, targets: List[PrecisionTarget], min_games: int,
+                max_games: int = None) -> bool:
+    """Check whether a sequential simulation can stop: every target is met (after min_games), or max_games are done"""
+    if max_games is not None and results.game_count >= max_games:
+        return True
+    return results.game_count >= min_games and all(target.is_met(results) for target in targets)
+
+
+def simulate_until(targets: List[PrecisionTarget], workers: int = None, seed: int = 0, chunk_size: int = 1000,
+                   min_games: int = 1000, max_games: int = None, reshuffle: bool = True, max_rounds: int = None,
+                   number_of_players: int = 2, decks: int = 1, variant: RuleVariant = None,
+                   deck: CardDeck = None) -> SimulationResults:
+    """
+    Simulate games of War until every precision target is met, fanned out across a pool of worker processes
+
+        Parameters:
+            targets (List[PrecisionTarget]): How precise each estimate of interest needs to be
+            workers (int): The number of worker processes.  Defaults to the number of CPUs, and 1 plays in this process
+            seed (int): The simulation seed.  The same seed always gives identical results, regardless of worker count
+            chunk_size (int): The number of games sent to a worker at a time, and between checks of the targets
+            min_games (int): The number of games played before the targets are first checked
+            max_games (int): The number of games after which the simulation stops, met or not, if any
+            reshuffle, max_rounds, number_of_players, decks, variant, deck: How every game is played (see simulate)
+    """
+    workers = workers or os.cpu_count() or 1
+    game_options = (reshuffle, max_rounds, number_of_players, decks, variant, deck)
+    results = SimulationResults(number_of_players)
+    next_start = 0
+
+    if workers == 1:
+        while not is_finished(results, targets, min_games, max_games):
+            stop = next_start + chunk_size if max_games is None else min(next_start + chunk_size, max_games)
+            results.merge(simulate_games(seed, next_start, stop, *game_options))
+            next_start = stop
+        return results
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        running = {}
+        finished = {}
+        while not is_finished(results, targets, min_games, max_games):
+            # Keep a second chunk queued for every worker, so none of them waits on the checks
+            while len(running) < workers * 2 and (max_games is None or next_start < max_games):
+                stop = next_start + chunk_size if max_games is None else min(next_start + chunk_size, max_games)
+                running[executor.submit(simulate_games, seed, next_start, stop, *game_options)] = next_start
+                next_start = stop
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                finished[running.pop(future)] = future.result()
+
+            # Merge finished chunks in game order, checking the targets after each one
+            while results.game_count in finished and not is_finished(results, targets, min_games, max_games):
+                results.merge(finished.pop(results.game_count))
+    finally:
+        # Cancel the queued chunks rather than waiting on them.  Chunks already running are finished and discarded
+        executor.shutdown(wait=True, cancel_futures=True)
+    return results
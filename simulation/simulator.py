@@ -0,0 +1,228 @@
+from __future__ import annotations      # Allow typing hinting a method with the type of the enclosing class (i.e. SimulationResults).
+
+from card_games import GameResult, War
+from card_games.replay_log import ReplayLog
+from card_games.round_trace import RoundTrace, TraceWriter
+from card_games.rule_variant import RuleVariant
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from models import CardDeck
+from simulation.checkpoint import SimulationCheckpoint
+from simulation.statistics import StreamingStatistics
+from typing import Iterable, Iterator, List
+import os
+import random
+
+
+class SimulationResults:
+    """
+    A class representing the aggregated results of many simulated games of War.
+    Results are streamed in and only constant memory statistics are kept, so any number of games can be aggregated
+
+    Attributes
+    ----------
+    game_count: int
+        The number of games aggregated
+    wins: List[int]
+        The number of games won by each seat
+    rounds: StreamingStatistics
+        The moments, histogram (one bin per round count, up to the longest game) and quantiles of the number of rounds
+        per game
+    wars: StreamingStatistics
+        The moments, histogram (one bin per war count, up to the most wars) and quantiles of the number of 'War's per
+        game
+    forfeit_count: int
+        The number of games that ended because a player didn't have enough cards for war
+    draw_count: int
+        The number of games that ended without a winner (a detected cycle or the round cap being reached)
+    cycle_count: int
+        The number of games ended as a draw because they would never end
+    """
+
+    def __init__(self, number_of_players: int = 2):
+        self.game_count = 0
+        self.wins = [0] * number_of_players
+        self.rounds = StreamingStatistics(bin_width=1, bin_count=None)
+        self.wars = StreamingStatistics(bin_width=1, bin_count=None)
+        self.forfeit_count = 0
+        self.draw_count = 0
+        self.cycle_count = 0
+
+    def add(self, result: GameResult) -> None:
+        """Add a single game result to the aggregate"""
+        self.game_count += 1
+        if result.is_draw():
+            self.draw_count += 1
+        else:
+            self.wins[result.winner] += 1
+        if result.cycle:
+            self.cycle_count += 1
+        self.rounds.add(result.round_number)
+        self.wars.add(result.war_count)
+        if result.forfeit:
+            self.forfeit_count += 1
+
+    def consume(self, results: Iterable[GameResult]) -> None:
+        """Add every game result of an iterable (e.g. a generator of games being played) to the aggregate"""
+        for result in results:
+            self.add(result)
+
+    def merge(self, other: SimulationResults) -> None:
+        """
+        Add the aggregate of another batch of games to this one.
+        Only integer counts are kept, so merging in any order gives identical results
+        """
+        self.game_count += other.game_count
+        self.wins = [wins + other_wins for wins, other_wins in zip(self.wins, other.wins)]
+        self.rounds.merge(other.rounds)
+        self.wars.merge(other.wars)
+        self.forfeit_count += other.forfeit_count
+        self.draw_count += other.draw_count
+        self.cycle_count += other.cycle_count
+
+    def win_rates(self) -> List[float]:
+        """Calculate the fraction of games won by each seat"""
+        if not self.game_count:
+            return [0.0] * len(self.wins)
+        return [wins / self.game_count for wins in self.wins]
+
+    def __str__(self):
+        """Print a summary of the aggregated games"""
+        win_rates = ', '.join(f'{rate:.2%}' for rate in self.win_rates())
+        return (f'Games: {self.game_count}, Win rates: {win_rates}, '
+                f'Forfeits: {self.forfeit_count}, Draws: {self.draw_count}, '
+                f'Rounds: mean {self.rounds.moments.mean():.1f}, p50 {self.rounds.quantile(0.5):.0f}, '
+                f'p99 {self.rounds.quantile(0.99):.0f}')
+
+
+def game_rng(seed: int, game_number: int) -> random.Random:
+    """
+    Build the random number generator for a single game of a simulation.
+    Each game gets its own stream derived from the simulation seed and the game number,
+    so results don't depend on how games are split between workers
+    """
+    return random.Random(f'{seed}/{game_number}')
+
+
+def play_games(seed: int, start: int, stop: int, reshuffle: bool = True, max_rounds: int = None,
+               number_of_players: int = 2, decks: int = 1, variant: RuleVariant = None,
+               deck: CardDeck = None) -> Iterator[GameResult]:
+    """
+    Play the games numbered start to stop (exclusive) of a simulation, yielding each result as it finishes.
+    Games without reshuffling are deterministic once dealt, so they are checked for never ending cycles.
+    Hands are dealt as views over the shoe, which deals exactly the same games without copying the shoe,
+    and reshuffled with the fast seeded permutation.  A rule variant, if any, overrides reshuffle, and a deck, if any,
+    replaces each standard 52 card deck in the shoe
+    """
+    war = simulation_war(reshuffle, max_rounds, number_of_players, decks, variant, deck)
+    for game_number in range(start, stop):
+        war.rng = game_rng(seed, game_number)
+        yield war.run_to_completion()
+
+
+def simulation_war(reshuffle: bool = True, max_rounds: int = None, number_of_players: int = 2, decks: int = 1,
+                   variant: RuleVariant = None, deck: CardDeck = None) -> War:
+    """Build the headless game every game of a simulation is played with, one after another"""
+    variant = variant or RuleVariant(reshuffle='cycle' if reshuffle else 'never')
+    return War(headless=True, detect_cycles=variant.reshuffle == 'never', max_rounds=max_rounds,
+               number_of_players=number_of_players, decks=decks, shoe_views=True, fast_shuffle=True, variant=variant,
+               deck=deck)
+
+
+def simulate_games(seed: int, start: int, stop: int, reshuffle: bool = True, max_rounds: int = None,
+                   number_of_players: int = 2, decks: int = 1, variant: RuleVariant = None,
+                   deck: CardDeck = None) -> SimulationResults:
+    """Play the games numbered start to stop (exclusive) of a simulation and aggregate their results"""
+    results = SimulationResults(number_of_players)
+    results.consume(play_games(seed, start, stop, reshuffle, max_rounds, number_of_players, decks, variant, deck))
+    return results
+
+
+def record_game(seed: int, game_number: int, reshuffle: bool = True, max_rounds: int = None, number_of_players: int = 2,
+                decks: int = 1, variant: RuleVariant = None, deck: CardDeck = None) -> ReplayLog:
+    """
+    Play a single game of a simulation again, recording its replay log.  Only that game is played, so any game of a
+    large simulation can be investigated on its own, given the same options the simulation was played with.
+    Raises an exception if the game's rules can't be recorded to a replay log (see RuleVariant.is_replayable)
+    """
+    war = simulation_war(reshuffle, max_rounds, number_of_players, decks, variant, deck)
+    war.rng = game_rng(seed, game_number)
+    war.replay_log = ReplayLog()
+    war.run_to_completion()
+    return war.replay_log
+
+
+def trace_games(path: str, seed: int, start: int, stop: int, reshuffle: bool = True, max_rounds: int = None,
+                number_of_players: int = 2, decks: int = 1, variant: RuleVariant = None, deck: CardDeck = None,
+                compress: bool = True) -> None:
+    """
+    Play the games numbered start to stop (exclusive) of a simulation again, writing the trace of every round of each
+    to a trace file at path, found by its game number (see card_games.round_trace).  Traced rounds are played without
+    the compiled round function, but the games are exactly the same as in the simulation
+    """
+    war = simulation_war(reshuffle, max_rounds, number_of_players, decks, variant, deck)
+    with TraceWriter(path, compress) as writer:
+        for game_number in range(start, stop):
+            war.rng = game_rng(seed, game_number)
+            war.round_trace = RoundTrace(game_number)
+            war.run_to_completion()
+            writer.write(war.round_trace)
+
+
+def simulate(n_games: int, workers: int = None, seed: int = 0, chunk_size: int = None, reshuffle: bool = True,
+             max_rounds: int = None, number_of_players: int = 2, decks: int = 1, variant: RuleVariant = None,
+             checkpoint_path: str = None, checkpoint_interval: float = 60.0) -> SimulationResults:
+    """
+    Simulate n_games games of War, fanned out across a pool of worker processes
+
+        Parameters:
+            n_games (int): The number of games to play
+            workers (int): The number of worker processes.  Defaults to the number of CPUs, and 1 plays in this process
+            seed (int): The simulation seed.  The same seed always gives identical results, regardless of worker count
+            chunk_size (int): The number of games sent to a worker at a time
+            reshuffle (bool): Whether hands are reshuffled once all of their cards have been played
+            max_rounds (int): The number of rounds after which a game is ended as a draw, if any
+            number_of_players (int): The number of players at the table of every game
+            decks (int): The number of standard 52 card decks shuffled together into the shoe of every game
+            variant (RuleVariant): The rules every game is played with, if not the standard rules.  Overrides reshuffle
+            checkpoint_path (str): Where the simulation is checkpointed, if anywhere (see simulation.checkpoint).
+                                   If it already holds a checkpoint of the simulation, the simulation resumes from it
+            checkpoint_interval (float): The minimum number of seconds between checkpoints
+    """
+    workers = workers or os.cpu_count() or 1
+    if not chunk_size:
+        chunk_size = max(1, min(1000, -(-n_games // (workers * 4))))
+
+    game_options = (reshuffle, max_rounds, number_of_players, decks, variant)
+    results = SimulationResults(number_of_players)
+    checkpoint = None
+    if checkpoint_path:
+        checkpoint = SimulationCheckpoint(checkpoint_path, checkpoint_interval)
+        settings = {'n_games': n_games, 'seed': seed, 'reshuffle': reshuffle, 'max_rounds': max_rounds,
+                    'number_of_players': number_of_players, 'decks': decks, 'variant': variant}
+        if checkpoint.load(settings):
+            # Keep the interrupted simulation's chunks, which may have been sized for a different number of workers
+            chunk_size = checkpoint.chunk_size
+            results = checkpoint.results
+        else:
+            checkpoint.start(settings, chunk_size, results)
+
+    chunks = [(start, min(start + chunk_size, n_games)) for start in range(0, n_games, chunk_size)
+              if not checkpoint or start not in checkpoint.completed]
+    if workers == 1:
+        for start, stop in chunks:
+            results.merge(simulate_games(seed, start, stop, *game_options))
+            if checkpoint:
+                checkpoint.complete(start)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(simulate_games, seed, start, stop, *game_options): start
+                       for start, stop in chunks}
+            # Merge chunks as they finish, so each is checkpointed as soon as possible.  Merging is exact in any order
+            for future in as_completed(futures):
+                results.merge(future.result())
+                if checkpoint:
+                    checkpoint.complete(futures[future])
+
+    if checkpoint:
+        checkpoint.save()
+    return results
@@ -0,0 +1,336 @@
+"""
+An exact solver for War played with reduced decks (e.g. 3 ranks of 4 suits), as ground truth for the Monte Carlo
+simulator.
+
+Only the deterministic variant of War (reshuffle off) is solved: once dealt, every game then follows a single path
+of states, so the outcome of every deal can be computed exactly.  Suits never affect the game, so states are
+canonicalised to the ranks of each hand, and every distinct ordering of ranks is one equally likely deal.
+
+Games from different deals quickly run into the same states, so the outcome of every state reached is kept in a
+bounded transposition table, and a game reaching a known state is finished without playing it out.
+"""
+from __future__ import annotations      # Allow typing hinting a method with the type of the enclosing class.
+
+from collections import Counter, OrderedDict
+from fractions import Fraction
+from models import CardDeck
+from models.card_code import RANK_INDEX
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+
+# The state of a game between rounds: the rank index of every card in each player's hand, from the top of the hand
+State = Tuple[Tuple[int, ...], Tuple[int, ...]]
+
+WAR_CARDS = 4
+
+
+class Outcome:
+    """
+    A class representing how a game of War ends when played from a given state
+
+    Attributes
+    ----------
+    winner: int
+        The seat of the winner, or None if the game never ends
+    round_count: int
+        The number of rounds left to play, or None if the game never ends
+    war_count: int
+        The number of 'War's left to happen, or None if the game never ends
+    forfeit: bool
+        Whether the game ends because a player doesn't have enough cards for war
+    """
+
+    __slots__ = ('winner', 'round_count', 'war_count', 'forfeit')
+
+    def __init__(self, winner: Optional[int], round_count: Optional[int], war_count: Optional[int],
+                 forfeit: bool = False):
+        self.winner = winner
+        self.round_count = round_count
+        self.war_count = war_count
+        self.forfeit = forfeit
+
+    def is_cycle(self) -> bool:
+        """Check whether the game never ends"""
+        return self.winner is None
+
+
+# The outcome of every state of a game that never ends
+CYCLE = Outcome(None, None, None)
+
+
+class TranspositionTable:
+    """
+    A class to memoise the outcome of game states with bounded memory, evicting the least recently used states
+
+    Attributes
+    ----------
+    capacity: int
+        The maximum number of states kept
+    outcomes: OrderedDict[State, Outcome]
+        The outcome of every state kept, from the least (first) to the most (last) recently used
+    hits: int
+        The number of lookups that found a known state
+    misses: int
+        The number of lookups that didn't
+    evictions: int
+        The number of states evicted to stay within capacity
+    """
+
+    def __init__(self, capacity: int = 1_000_000):
+        self.capacity = capacity
+        self.outcomes = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, state: State) -> Optional[Outcome]:
+        """Look up the outcome of a state, if it is known"""
+        outcome = self.outcomes.get(state)
+        if outcome is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.outcomes.move_to_end(state)
+        return outcome
+
+    def put(self, state: State, outcome: Outcome) -> None:
+        """Remember the outcome of a state, evicting the least recently used state if the table is full"""
+        self.outcomes[state] = outcome
+        self.outcomes.move_to_end(state)
+        if len(self.outcomes) > self.capacity:
+            self.outcomes.popitem(last=False)
+            self.evictions += 1
+
+    def __len__(self):
+        return len(self.outcomes)
+
+
+class SolverResults:
+    """
+    A class representing the exact results of War over every deal of a deck
+
+    Attributes
+    ----------
+    deal_count: int
+        The number of distinct deals (orderings of ranks) of the deck, which are all equally likely
+    wins: List[int]
+        The number of deals won by each seat
+    cycle_count: int
+        The number of deals whose game never ends
+    forfeit_count: int
+        The number of deals whose game ends because a player doesn't have enough cards for war
+    total_rounds: int
+        The total number of rounds played over every deal whose game ends
+    total_wars: int
+        The total number of 'War's over every deal whose game ends
+    """
+
+    def __init__(self):
+        self.deal_count = 0
+        self.wins = [0, 0]
+        self.cycle_count = 0
+        self.forfeit_count = 0
+        self.total_rounds = 0
+        self.total_wars = 0
+
+    def add(self, outcome: Outcome) -> None:
+        """Add the outcome of a single deal"""
+        self.deal_count += 1
+        if outcome.is_cycle():
+            self.cycle_count += 1
+            return
+        self.wins[outcome.winner] += 1
+        self.total_rounds += outcome.round_count
+        self.total_wars += outcome.war_count
+        if outcome.forfeit:
+            self.forfeit_count += 1
+
+    def win_probabilities(self) -> List[Fraction]:
+        """Calculate the exact probability of each seat winning"""
+        return [Fraction(wins, self.deal_count) for wins in self.wins]
+
+    def cycle_probability(self) -> Fraction:
+        """Calculate the exact probability of the game never ending"""
+        return Fraction(self.cycle_count, self.deal_count)
+
+    def forfeit_probability(self) -> Fraction:
+        """Calculate the exact probability of the game ending because a player doesn't have enough cards for war"""
+        return Fraction(self.forfeit_count, self.deal_count)
+
+    def expected_rounds(self) -> Fraction:
+        """Calculate the exact expected number of rounds of a game, given that it ends"""
+        finished_count = self.deal_count - self.cycle_count
+        return Fraction(self.total_rounds, finished_count) if finished_count else Fraction(0)
+
+    def expected_wars(self) -> Fraction:
+        """Calculate the exact expected number of 'War's in a game, given that it ends"""
+        finished_count = self.deal_count - self.cycle_count
+        return Fraction(self.total_wars, finished_count) if finished_count else Fraction(0)
+
+    def __str__(self):
+        return '\n'.join([
+            f'Deals: {self.deal_count}',
+            'Win probabilities: ' + ', '.join(f'{float(p):.4%}' for p in self.win_probabilities()),
+            f'Cycle probability: {float(self.cycle_probability()):.4%}',
+            f'Forfeit probability: {float(self.forfeit_probability()):.4%}',
+            f'Expected rounds: {float(self.expected_rounds()):.2f}',
+            f'Expected wars: {float(self.expected_wars()):.2f}',
+        ])
+
+
+class WarSolver:
+    """
+    A class to solve War without reshuffling exactly, for every deal of a (reduced) deck
+
+    Attributes
+    ----------
+    ranks: List[int]
+        The rank index (see models.card_code) of every card in the deck
+    table: TranspositionTable
+        The known outcome of every state reached so far
+    """
+
+    def __init__(self, deck: CardDeck, table_capacity: int = 1_000_000):
+        self.ranks = sorted(RANK_INDEX[card.rank] for card in deck.cards)
+        self.table = TranspositionTable(table_capacity)
+
+    def solve(self) -> SolverResults:
+        """Solve the game of every distinct deal of the deck"""
+        results = SolverResults()
+        for deal in distinct_permutations(self.ranks):
+            results.add(self.solve_deal(deal))
+
+        # Every deal must be solved exactly once for the probabilities to be exact
+        if results.deal_count != self.deal_count():
+            raise Exception(f'Solved {results.deal_count} of the deck\'s {self.deal_count()} deals')
+        return results
+
+    def deal_count(self) -> int:
+        """Count the distinct deals (orderings of ranks) of the deck, which solve plays one game each of"""
+        return count_distinct_permutations(self.ranks)
+
+    def solve_deal(self, deal: Tuple[int, ...]) -> Outcome:
+        """Solve the game of a deck in the given order of ranks, dealt one card at a time like CardDeck.deal"""
+        return self.solve_state((deal[0::2], deal[1::2]))
+
+    def solve_state(self, state: State) -> Outcome:
+        """
+        Solve the game played from the given state, by playing rounds until the game ends, repeats a state
+        (a cycle that never ends) or reaches a state whose outcome is already known
+        """
+        path = []
+        path_indexes = {}
+        war_counts = []
+        while True:
+            outcome = self.table.get(state)
+            if outcome is not None:
+                break
+            if state in path_indexes:
+                outcome = CYCLE
+                break
+
+            path_indexes[state] = len(path)
+            path.append(state)
+            state, war_count, winner, forfeit = play_round(state)
+            war_counts.append(war_count)
+            if winner is not None:
+                outcome = Outcome(winner, 0, 0, forfeit)
+                break
+
+        # Every state on the path ends the same way, a round (and its 'War's) further from the end than the next
+        if outcome.is_cycle():
+            for path_state in path:
+                self.table.put(path_state, CYCLE)
+            return CYCLE
+
+        round_count, war_count = outcome.round_count, outcome.war_count
+        for path_state, round_war_count in zip(reversed(path), reversed(war_counts)):
+            round_count += 1
+            war_count += round_war_count
+            outcome = Outcome(outcome.winner, round_count, war_count, outcome.forfeit)
+            self.table.put(path_state, outcome)
+        return outcome
+
+
+def play_round(state: State) -> Tuple[State, int, Optional[int], bool]:
+    """
+    Play a round of War (exactly like War.play_round, without reshuffling) from the given state.
+    Gives the next state, the number of 'War's in the round, and the seat of the game winner and whether it was
+    a forfeit if the round ended the game
+    """
+    hand_one, hand_two = state
+    played_one, played_two = 1, 1
+    war_count = 0
+    forfeit_winner = None
+    while hand_one[played_one - 1] == hand_two[played_two - 1]:
+        war_count += 1
+        if len(hand_one) - played_one < WAR_CARDS:
+            forfeit_winner = 1
+            break
+        if len(hand_two) - played_two < WAR_CARDS:
+            forfeit_winner = 0
+            break
+        played_one += WAR_CARDS
+        played_two += WAR_CARDS
+
+    # The round winner collects player one's play pile and then player two's play pile, like collect_play_piles.
+    # After a forfeit the play piles are discarded with the game over
+    if forfeit_winner is not None:
+        next_state = (hand_one[played_one:], hand_two[played_two:])
+    elif hand_one[played_one - 1] > hand_two[played_two - 1]:
+        next_state = (hand_one[played_one:] + hand_one[:played_one] + hand_two[:played_two], hand_two[played_two:])
+    else:
+        next_state = (hand_one[played_one:], hand_two[played_two:] + hand_one[:played_one] + hand_two[:played_two])
+
+    # Like War.check_for_game_winner, a player with an empty hand loses even if the other player forfeited
+    forfeit = forfeit_winner is not None
+    if not next_state[0]:
+        return next_state, war_count, 1, forfeit
+    if not next_state[1]:
+        return next_state, war_count, 0, forfeit
+    return next_state, war_count, forfeit_winner, forfeit
+
+
+def distinct_permutations(items: Iterable[int]) -> Iterator[Tuple[int, ...]]:
+    """
+    Generate every distinct ordering of a multiset of items, each exactly once, in lexicographic order.
+    A deck of r ranks of k suits has (r * k)! / (k!)^r of them, rather than (r * k)! orderings of its cards
+    """
+    items = sorted(items)
+    while True:
+        yield tuple(items)
+
+        # Step to the next lexicographic permutation (Narayana Pandita's algorithm)
+        pivot = len(items) - 2
+        while pivot >= 0 and items[pivot] >= items[pivot + 1]:
+            pivot -= 1
+        if pivot < 0:
+            return
+        successor = len(items) - 1
+        while items[successor] <= items[pivot]:
+            successor -= 1
+        items[pivot], items[successor] = items[successor], items[pivot]
+        items[pivot + 1:] = reversed(items[pivot + 1:])
+
+
+def count_distinct_permutations(items: Iterable[int]) -> int:
+    """Count the distinct orderings of a multiset of items"""
+    items = list(items)
+    count = 1
+    placed = 0
+    for multiplicity in Counter(items).values():
+        for index in range(multiplicity):
+            placed += 1
+            count = count * placed // (index + 1)
+    return count
+
+
+def solve(deck: CardDeck, table_capacity: int = 1_000_000) -> SolverResults:
+    """
+    Solve War without reshuffling exactly, over every deal of the deck
+
+        Parameters:
+            deck (CardDeck): The (reduced) deck dealt, e.g. CardDeck(cards=[Card(rank, suit) for ...])
+            table_capacity (int): The maximum number of game states memoised at a time
+    """
+    return WarSolver(deck, table_capacity).solve()
@@ -0,0 +1,233 @@
+"""
+Constant memory statistics over streams of non-negative integers (e.g. game lengths), for aggregating
+any number of simulated games without keeping them.
+
+Every statistic only keeps integer counts and sums, so partial aggregates from parallel workers can be merged
+in any order and always give bit-for-bit identical results.
+"""
+from __future__ import annotations      # Allow typing hinting a method with the type of the enclosing class.
+
+from typing import Dict, Iterable
+import math
+
+
+class RunningMoments:
+    """
+    A class to track the count, mean and variance of a stream of integers.
+    The sums are kept as exact Python integers rather than floating point running averages, so they never
+    lose precision and merging partial moments is exact
+
+    Attributes
+    ----------
+    count: int
+        The number of values added
+    total: int
+        The sum of every value added
+    total_of_squares: int
+        The sum of the square of every value added
+    minimum: int
+        The smallest value added, if any
+    maximum: int
+        The largest value added, if any
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.total_of_squares = 0
+        self.minimum = None
+        self.maximum = None
+
+    def add(self, value: int) -> None:
+        """Add a value to the stream"""
+        self.count += 1
+        self.total += value
+        self.total_of_squares += value * value
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+
+    def merge(self, other: RunningMoments) -> None:
+        """Add the moments of another stream to this one"""
+        self.count += other.count
+        self.total += other.total
+        self.total_of_squares += other.total_of_squares
+        if other.minimum is not None and (self.minimum is None or other.minimum < self.minimum):
+            self.minimum = other.minimum
+        if other.maximum is not None and (self.maximum is None or other.maximum > self.maximum):
+            self.maximum = other.maximum
+
+    def mean(self) -> float:
+        """Calculate the mean of the values added"""
+        return self.total / self.count if self.count else 0.0
+
+    def variance(self) -> float:
+        """Calculate the sample variance of the values added"""
+        if self.count < 2:
+            return 0.0
+        return (self.count * self.total_of_squares - self.total * self.total) / (self.count * (self.count - 1))
+
+    def standard_deviation(self) -> float:
+        """Calculate the sample standard deviation of the values added"""
+        return math.sqrt(self.variance())
+
+
+class Histogram:
+    """
+    A class to count a stream of integers in fixed width bins
+
+    Attributes
+    ----------
+    bin_width: int
+        The range of values counted by each bin.  Bin i counts values from i * bin_width up to (i + 1) * bin_width
+    bin_count: int
+        The number of bins, or None if bins are added as larger values are counted (so nothing overflows)
+    counts: List[int]
+        The number of values counted in each bin
+    overflow: int
+        The number of values too large for the last bin
+    """
+
+    def __init__(self, bin_width: int = 1, bin_count: int = 1000):
+        self.bin_width = bin_width
+        self.bin_count = bin_count
+        self.counts = [0] * (bin_count or 0)
+        self.overflow = 0
+
+    def add(self, value: int) -> None:
+        """Count a value in its bin"""
+        index = value // self.bin_width
+        if index >= len(self.counts) and self.bin_count is None:
+            self.counts.extend([0] * (index + 1 - len(self.counts)))
+        if index < len(self.counts):
+            self.counts[index] += 1
+        else:
+            self.overflow += 1
+
+    def merge(self, other: Histogram) -> None:
+        """Add the counts of another histogram with the same bins to this one"""
+        if other.bin_width != self.bin_width or other.bin_count != self.bin_count:
+            raise Exception('Only histograms with the same bins can be merged')
+        if len(other.counts) > len(self.counts):
+            self.counts.extend([0] * (len(other.counts) - len(self.counts)))
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.overflow += other.overflow
+
+
+class LogHistogram:
+    """
+    A class to count a stream of integers in logarithmically sized bins, which gives approximate quantiles
+    with a bounded relative error using a few hundred bins for any range of values (in the style of DDSketch)
+
+    Attributes
+    ----------
+    relative_accuracy: float
+        The maximum relative error of any quantile estimate
+    gamma: float
+        The ratio between the upper and lower bound of every bin
+    counts: Dict[int, int]
+        The number of values counted in each non-empty bin.  Bin i counts values in (gamma^(i-1), gamma^i]
+    zero_count: int
+        The number of zeros counted, which don't fit any logarithmic bin
+    """
+
+    def __init__(self, relative_accuracy: float = 0.005):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.counts = {}
+        self.zero_count = 0
+
+    def add(self, value: int) -> None:
+        """Count a value in its bin"""
+        if value <= 0:
+            self.zero_count += 1
+            return
+        index = math.ceil(math.log(value) / self.log_gamma)
+        self.counts[index] = self.counts.get(index, 0) + 1
+
+    def merge(self, other: LogHistogram) -> None:
+        """Add the counts of another histogram with the same accuracy to this one"""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise Exception('Only histograms with the same accuracy can be merged')
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.zero_count += other.zero_count
+
+    def count(self) -> int:
+        """Count the number of values added"""
+        return self.zero_count + sum(self.counts.values())
+
+    def quantile(self, q: float) -> float:
+        """Estimate the q-th quantile (0 <= q <= 1) of the values added"""
+        total = self.count()
+        if not total:
+            return 0.0
+
+        rank = q * (total - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if rank < seen:
+                # The value minimising the relative error to anything in (gamma^(index-1), gamma^index]
+                return 2 * self.gamma ** index / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.counts) / (self.gamma + 1)
+
+
+class StreamingStatistics:
+    """
+    A class to track the moments, fixed width histogram and quantiles of a stream of integers
+
+    Attributes
+    ----------
+    moments: RunningMoments
+        The count, mean and variance of the stream
+    histogram: Histogram
+        The fixed width histogram of the stream (with bins added as needed if bin_count is None)
+    log_histogram: LogHistogram
+        The logarithmic histogram of the stream, used for quantiles
+    """
+
+    def __init__(self, bin_width: int = 1, bin_count: int = 1000, relative_accuracy: float = 0.005):
+        self.moments = RunningMoments()
+        self.histogram = Histogram(bin_width, bin_count)
+        self.log_histogram = LogHistogram(relative_accuracy)
+
+    def add(self, value: int) -> None:
+        """Add a value to the stream"""
+        self.moments.add(value)
+        self.histogram.add(value)
+        self.log_histogram.add(value)
+
+    def consume(self, values: Iterable[int]) -> None:
+        """Add every value of an iterable (e.g. a generator) to the stream"""
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: StreamingStatistics) -> None:
+        """Add the statistics of another stream to this one"""
+        self.moments.merge(other.moments)
+        self.histogram.merge(other.histogram)
+        self.log_histogram.merge(other.log_histogram)
+
+    def quantile(self, q: float) -> float:
+        """Estimate the q-th quantile (0 <= q <= 1) of the stream"""
+        return self.log_histogram.quantile(q)
+
+    def summary(self) -> Dict[str, float]:
+        """Summarise the stream's count, mean, standard deviation, extremes and common quantiles"""
+        return {
+            'count': self.moments.count,
+            'mean': self.moments.mean(),
+            'std': self.moments.standard_deviation(),
+            'min': self.moments.minimum,
+            'p50': self.quantile(0.5),
+            'p90': self.quantile(0.9),
+            'p99': self.quantile(0.99),
+            'p99.9': self.quantile(0.999),
+            'max': self.moments.maximum,
+        }
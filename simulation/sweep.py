@@ -0,0 +1,258 @@
+"""
+Parameter sweeps: simulating many configurations of War (rule variants, deck compositions and player counts) from a
+single pool of worker processes, with a summary row written for each configuration as soon as it finishes.
+
+Every configuration shares the pool, rather than getting a pool of its own, so no core sits idle waiting on another
+configuration's stragglers.  Chunks of games are sized from each configuration's measured time per game:
+
+    1. Every configuration starts with a small probe chunk, which measures its time per game
+    2. Later chunks are sized to take about target_chunk_seconds, so configurations with long games (e.g. variants
+       without reshuffling) are split into more chunks than those with short games
+    3. As the sweep runs out of work, chunks shrink so that the last ones finish close together
+    4. The configuration with the most estimated work left is always scheduled first
+
+Results don't depend on the chunk sizes: every game gets its own random number generator (see simulator.game_rng),
+and merging aggregates is exact.
+"""
+from card_games.rule_variant import RuleVariant
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from models import CardDeck
+from simulation.simulator import SimulationResults, simulate_games
+from typing import Dict, Iterable, Iterator, List, TextIO, Tuple
+import csv
+import itertools
+import os
+import time
+
+
+# The number of games played to measure a configuration's time per game, before sizing its chunks
+PROBE_GAMES = 8
+
+# The columns of the summary row written for each configuration
+SUMMARY_COLUMNS = ['name', 'number_of_players', 'decks', 'deck_size', 'ace_low', 'face_down_cards', 'war_depth',
+                   'short_war', 'pile_order', 'reshuffle', 'games', 'win_rates', 'rounds_mean', 'rounds_p50',
+                   'rounds_p99', 'wars_mean', 'forfeit_rate', 'draw_rate', 'cycle_rate', 'seconds_per_game']
+
+
+class SweepConfiguration:
+    """
+    A class representing a single configuration of War simulated in a sweep
+
+    Attributes
+    ----------
+    name: str
+        The name of the configuration, identifying its summary row
+    n_games: int
+        The number of games to play
+    variant: RuleVariant
+        The rules every game is played with
+    deck: CardDeck
+        The cards of each deck in the shoe (e.g. a reduced deck), if not the standard 52 cards
+    number_of_players: int
+        The number of players at the table of every game
+    decks: int
+        The number of decks shuffled together into the shoe of every game
+    max_rounds: int
+        The number of rounds after which a game is ended as a draw, if any
+    """
+
+    def __init__(self, name: str, n_games: int, variant: RuleVariant = None, deck: CardDeck = None,
+                 number_of_players: int = 2, decks: int = 1, max_rounds: int = None):
+        self.name = name
+        self.n_games = n_games
+        self.variant = variant or RuleVariant()
+        self.deck = deck
+        self.number_of_players = number_of_players
+        self.decks = decks
+        self.max_rounds = max_rounds
+
+    def deck_size(self) -> int:
+        """Count the cards in each deck of the shoe"""
+        return self.deck.card_count() if self.deck else 52
+
+    def simulate_games(self, seed: int, start: int, stop: int) -> SimulationResults:
+        """Play the configuration's games numbered start to stop (exclusive) and aggregate their results"""
+        return simulate_games(seed, start, stop, max_rounds=self.max_rounds, number_of_players=self.number_of_players,
+                              decks=self.decks, variant=self.variant, deck=self.deck)
+
+
+class SweepProgress:
+    """
+    A class to track how far through its games a configuration of a sweep is
+
+    Attributes
+    ----------
+    configuration: SweepConfiguration
+        The configuration being simulated
+    results: SimulationResults
+        The aggregate results of the configuration's completed games
+    scheduled: int
+        The number of games sent to the workers so far, which are always the games numbered below it
+    completed: int
+        The number of games completed
+    seconds: float
+        The time the workers spent playing the completed games
+    """
+
+    def __init__(self, configuration: SweepConfiguration):
+        self.configuration = configuration
+        self.results = SimulationResults(configuration.number_of_players)
+        self.scheduled = 0
+        self.completed = 0
+        self.seconds = 0.0
+
+    def is_measured(self) -> bool:
+        """Check whether any games have been completed, so the configuration's time per game is known"""
+        return self.completed > 0
+
+    def seconds_per_game(self) -> float:
+        """Estimate the time to play one of the configuration's games, from the games completed so far"""
+        return self.seconds / self.completed if self.completed else 0.0
+
+    def remaining_seconds(self) -> float:
+        """Estimate the time to play the games not scheduled yet"""
+        return (self.configuration.n_games - self.scheduled) * self.seconds_per_game()
+
+    def is_finished(self) -> bool:
+        """Check whether every game of the configuration has been completed"""
+        return self.completed == self.configuration.n_games
+
+    def add_chunk(self, results: SimulationResults, size: int, seconds: float) -> None:
+        """Add the results of a completed chunk of size games, which took the given time to play"""
+        self.results.merge(results)
+        self.completed += size
+        self.seconds += seconds
+
+
+def grid(n_games: int, variants: Dict[str, RuleVariant] = None, decks: Dict[str, CardDeck] = None,
+         players: Iterable[int] = (2,), max_rounds: int = None) -> List[SweepConfiguration]:
+    """
+    Build a configuration for every combination of the named rule variants, named decks (None for the standard deck)
+    and player counts, each named after its combination (e.g. 'ace_low/standard/3 players')
+    """
+    variants = variants or {'standard': RuleVariant()}
+    decks = decks or {'standard': None}
+    return [SweepConfiguration(f'{variant_name}/{deck_name}/{number_of_players} players', n_games, variant, deck,
+                               number_of_players, max_rounds=max_rounds)
+            for (variant_name, variant), (deck_name, deck), number_of_players
+            in itertools.product(variants.items(), decks.items(), players)]
+
+
+def play_chunk(configuration: SweepConfiguration, seed: int, start: int,
+               stop: int) -> Tuple[SimulationResults, float]:
+    """Play a chunk of a configuration's games in a worker, timing how long they took"""
+    started = time.perf_counter()
+    results = configuration.simulate_games(seed, start, stop)
+    return results, time.perf_counter() - started
+
+
+def next_chunk(progresses: List[SweepProgress], workers: int,
+               target_chunk_seconds: float) -> Tuple[SweepProgress, int] or None:
+    """
+    Choose the configuration and size of the next chunk to schedule, if any.  Configurations whose time per game is
+    unknown get a single probe chunk first, then the configuration with the most estimated work left is chosen
+    """
+    for progress in progresses:
+        if progress.scheduled == 0 and progress.configuration.n_games:
+            return progress, min(PROBE_GAMES, progress.configuration.n_games)
+
+    measured = [progress for progress in progresses
+                if progress.is_measured() and progress.scheduled < progress.configuration.n_games]
+    if not measured:
+        return None
+
+    # Shrink chunks as the sweep runs out of work, so every worker gets a share of the last of it
+    remaining_seconds = sum(progress.remaining_seconds() for progress in measured)
+    chunk_seconds = min(target_chunk_seconds, remaining_seconds / (workers * 4))
+    progress = max(measured, key=SweepProgress.remaining_seconds)
+    size = int(chunk_seconds / progress.seconds_per_game()) if progress.seconds_per_game() else PROBE_GAMES
+    return progress, max(1, min(size, progress.configuration.n_games - progress.scheduled))
+
+
+def sweep(configurations: List[SweepConfiguration], workers: int = None, seed: int = 0,
+          target_chunk_seconds: float = 0.5) -> Iterator[SweepProgress]:
+    """
+    Simulate every configuration from a single pool of worker processes, yielding each configuration's progress
+    (holding its aggregate results) as soon as all of its games are completed
+
+        Parameters:
+            configurations (List[SweepConfiguration]): The configurations to simulate
+            workers (int): The number of worker processes.  Defaults to the number of CPUs, and 1 plays in this process
+            seed (int): The seed of every configuration, so configurations are compared over the same deals where
+                        they can be.  The same seed always gives identical results, regardless of worker count
+            target_chunk_seconds (float): The time each chunk of games sent to a worker should take
+    """
+    workers = workers or os.cpu_count() or 1
+    progresses = [SweepProgress(configuration) for configuration in configurations]
+    for progress in progresses:
+        if progress.is_finished():
+            yield progress
+
+    if workers == 1:
+        for progress in progresses:
+            if not progress.is_finished():
+                progress.add_chunk(*play_chunk(progress.configuration, seed, 0, progress.configuration.n_games),
+                                   progress.configuration.n_games)
+                yield progress
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        running = {}
+        while True:
+            # Keep a second chunk queued for every worker, so none of them waits on the scheduler
+            while len(running) < workers * 2:
+                chunk = next_chunk(progresses, workers, target_chunk_seconds)
+                if not chunk:
+                    break
+                progress, size = chunk
+                start, progress.scheduled = progress.scheduled, progress.scheduled + size
+                future = executor.submit(play_chunk, progress.configuration, seed, start, progress.scheduled)
+                running[future] = progress, size
+            if not running:
+                return
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                progress, size = running.pop(future)
+                results, seconds = future.result()
+                progress.add_chunk(results, size, seconds)
+                if progress.is_finished():
+                    yield progress
+
+
+def summary_row(progress: SweepProgress) -> Dict[str, object]:
+    """Summarise a finished configuration's results as a row with SUMMARY_COLUMNS"""
+    configuration, results = progress.configuration, progress.results
+    game_count = results.game_count or 1
+    row = {
+        'name': configuration.name,
+        'number_of_players': configuration.number_of_players,
+        'decks': configuration.decks,
+        'deck_size': configuration.deck_size(),
+        'games': results.game_count,
+        'win_rates': ';'.join(f'{rate:.4f}' for rate in results.win_rates()),
+        'rounds_mean': round(results.rounds.moments.mean(), 2),
+        'rounds_p50': round(results.rounds.quantile(0.5)),
+        'rounds_p99': round(results.rounds.quantile(0.99)),
+        'wars_mean': round(results.wars.moments.mean(), 3),
+        'forfeit_rate': round(results.forfeit_count / game_count, 4),
+        'draw_rate': round(results.draw_count / game_count, 4),
+        'cycle_rate': round(results.cycle_count / game_count, 4),
+        'seconds_per_game': f'{progress.seconds_per_game():.6f}',
+    }
+    row.update({rule: getattr(configuration.variant, rule) for rule in RuleVariant.__slots__})
+    return row
+
+
+def write_sweep(configurations: List[SweepConfiguration], stream: TextIO, workers: int = None, seed: int = 0,
+                target_chunk_seconds: float = 0.5) -> None:
+    """
+    Simulate every configuration (see sweep), writing its summary row as CSV to the stream as soon as it finishes.
+    Rows are flushed as they are written, so the results so far can be read while the sweep is running
+    """
+    writer = csv.DictWriter(stream, SUMMARY_COLUMNS)
+    writer.writeheader()
+    stream.flush()
+    for progress in sweep(configurations, workers, seed, target_chunk_seconds):
+        writer.writerow(summary_row(progress))
+        stream.flush()
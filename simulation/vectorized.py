@@ -0,0 +1,254 @@
+"""
+A NumPy engine that plays many independent games of War in lockstep, for simulations where the per-game
+Python overhead of the War class is the bottleneck.
+
+Every hand is a ring buffer of card codes (see models.card_code) with a head and length per game, so each step
+of a round (reshuffling, playing cards, comparing ranks, declaring war and moving the piles) is a handful of array
+operations over every game still being played.  The rules are exactly those of War.play_round: including the face
+of each card flipping as it is played, the < 4 cards war forfeit, and the reshuffle once a hand's top card is face up.
+
+NumPy is an optional dependency, only needed for this module.
+"""
+from card_games import GameResult
+from models.card_code import CARD_MASK, FACE_UP
+from simulation.simulator import SimulationResults
+from typing import Iterator
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+DECK_SIZE = 52
+PLAYERS = 2
+WAR_CARDS = 4
+
+
+class VectorizedWar:
+    """
+    A class representing a batch of games of War played in lockstep
+
+    Attributes
+    ----------
+    game_count: int
+        The number of games in the batch
+    hands: np.ndarray
+        The card codes of each player's hand as a ring buffer, shaped (games, players, 52)
+    heads: np.ndarray
+        The ring buffer index of the top card of each player's hand, shaped (games, players)
+    lengths: np.ndarray
+        The number of cards in each player's hand, shaped (games, players)
+    round_numbers: np.ndarray
+        The number of rounds played in each game
+    war_counts: np.ndarray
+        The number of 'War's that have happened in each game
+    winners: np.ndarray
+        The seat of the winner of each game, or -1 while the game is being played (or if it was a draw)
+    forfeits: np.ndarray
+        Whether each game had a player without enough cards for war
+    active: np.ndarray
+        Whether each game is still being played
+    """
+
+    def __init__(self, deals: 'np.ndarray', rng: 'np.random.Generator' = None, reshuffle: bool = True,
+                 max_rounds: int = None):
+        """
+            Parameters:
+                deals (np.ndarray): The shuffled 52 card deck of each game, shaped (games, 52), dealt like CardDeck.deal
+                rng (np.random.Generator): The random number generator used for every reshuffle
+                reshuffle (bool): Whether a hand is shuffled once its top card is face up
+                max_rounds (int): The number of rounds after which a game is ended as a draw, if any.
+                    Required without reshuffling, since games can then cycle forever
+        """
+        if np is None:
+            raise ImportError('The vectorized War engine requires numpy')
+        if not reshuffle and not max_rounds:
+            raise Exception('Games without reshuffling can cycle forever, so max_rounds is required')
+
+        deals = np.asarray(deals, dtype=np.uint8)
+        self.game_count = len(deals)
+        self.rng = rng or np.random.default_rng()
+        self.reshuffle = reshuffle
+        self.max_rounds = max_rounds
+
+        # Deal every other card to each player, exactly like CardDeck.deal
+        self.hands = np.zeros((self.game_count, PLAYERS, DECK_SIZE), dtype=np.uint8)
+        self.lengths = np.zeros((self.game_count, PLAYERS), dtype=np.int64)
+        for player in range(PLAYERS):
+            hand = deals[:, player::PLAYERS]
+            self.hands[:, player, :hand.shape[1]] = hand
+            self.lengths[:, player] = hand.shape[1]
+        self.heads = np.zeros((self.game_count, PLAYERS), dtype=np.int64)
+
+        # Each player's play pile for the round being played
+        self.piles = np.zeros((self.game_count, PLAYERS, DECK_SIZE), dtype=np.uint8)
+        self.pile_lengths = np.zeros((self.game_count, PLAYERS), dtype=np.int64)
+
+        self.round_numbers = np.zeros(self.game_count, dtype=np.int64)
+        self.war_counts = np.zeros(self.game_count, dtype=np.int64)
+        self.winners = np.full(self.game_count, -1, dtype=np.int64)
+        self.forfeits = np.zeros(self.game_count, dtype=bool)
+        self.active = np.ones(self.game_count, dtype=bool)
+
+    @staticmethod
+    def random_deals(game_count: int, rng: 'np.random.Generator') -> 'np.ndarray':
+        """Shuffle a standard 52 card deck (excluding Jokers) for each of game_count games"""
+        decks = np.tile(np.arange(DECK_SIZE, dtype=np.uint8), (game_count, 1))
+        return rng.permuted(decks, axis=1)
+
+    def run(self) -> None:
+        """Play rounds until every game in the batch is over"""
+        while self.active.any():
+            self.play_round()
+
+    def play_round(self) -> None:
+        """Play a round of war in every game still being played"""
+        games = np.flatnonzero(self.active)
+
+        # Shuffle hands if the card on top of the deck for the player is face up, meaning all cards have been cycled
+        if self.reshuffle:
+            for player in range(PLAYERS):
+                top_cards = self.hands[games, player, self.heads[games, player]]
+                self.shuffle_hands(games[(top_cards & FACE_UP) != 0], player)
+
+        # Play the top card of each hand face up, and compare them
+        self.pile_lengths[games] = 0
+        for player in range(PLAYERS):
+            self.play_cards(games, player, 1, flip_last=True)
+        deciding = games
+        decided_winners = self.compare_last_cards(deciding)
+
+        # Keep declaring war in every game that tied, until each of them has a round winner or a forfeit
+        forfeit_winners = np.full(self.game_count, -1, dtype=np.int64)
+        while True:
+            tied = deciding[decided_winners == -1]
+            decided = deciding[decided_winners != -1]
+            self.transfer_piles(decided, decided_winners[decided_winners != -1])
+            if not len(tied):
+                break
+
+            self.war_counts[tied] += 1
+            player_one_short = self.lengths[tied, 0] < WAR_CARDS
+            player_two_short = ~player_one_short & (self.lengths[tied, 1] < WAR_CARDS)
+            forfeit_winners[tied[player_one_short]] = 1
+            forfeit_winners[tied[player_two_short]] = 0
+            self.forfeits[tied[player_one_short | player_two_short]] = True
+
+            deciding = tied[~(player_one_short | player_two_short)]
+            for player in range(PLAYERS):
+                self.play_cards(deciding, player, WAR_CARDS, flip_last=True)
+            decided_winners = self.compare_last_cards(deciding)
+
+        self.round_numbers[games] += 1
+        self.end_games(games, forfeit_winners[games])
+
+    def shuffle_hands(self, games: 'np.ndarray', player: int) -> None:
+        """Shuffle the player's hand in each of the provided games, and set all of its cards face down"""
+        if not len(games):
+            return
+
+        offsets = np.arange(self.lengths[games, player].max())
+        slots = (self.heads[games, player][:, None] + offsets) % DECK_SIZE
+        in_hand = offsets < self.lengths[games, player][:, None]
+
+        # Sorting random keys gives a uniform permutation of the cards in each hand, with empty slots sorted last
+        keys = self.rng.random(slots.shape)
+        keys[~in_hand] = 2.0
+        order = np.argsort(keys, axis=1)
+
+        cards = self.hands[games[:, None], player, slots]
+        shuffled = np.take_along_axis(cards, order, axis=1) & CARD_MASK
+        self.hands[games[:, None], player, slots] = np.where(in_hand, shuffled, cards)
+
+    def play_cards(self, games: 'np.ndarray', player: int, number_of_cards: int, flip_last: bool) -> None:
+        """Move cards from the top of the player's hand to their play pile, flipping the last one if specified"""
+        if not len(games):
+            return
+
+        offsets = np.arange(number_of_cards)
+        slots = (self.heads[games, player][:, None] + offsets) % DECK_SIZE
+        cards = self.hands[games[:, None], player, slots]
+        if flip_last:
+            cards[:, -1] ^= FACE_UP
+
+        self.piles[games[:, None], player, self.pile_lengths[games, player][:, None] + offsets] = cards
+        self.pile_lengths[games, player] += number_of_cards
+        self.heads[games, player] = (self.heads[games, player] + number_of_cards) % DECK_SIZE
+        self.lengths[games, player] -= number_of_cards
+
+    def compare_last_cards(self, games: 'np.ndarray') -> 'np.ndarray':
+        """Compare the last card played by each player, giving the winning seat of each game or -1 for a tie"""
+        last_cards = self.piles[games[:, None], np.arange(PLAYERS), self.pile_lengths[games] - 1]
+        ranks = (last_cards & CARD_MASK) >> 2
+        return np.where(ranks[:, 0] > ranks[:, 1], 0, np.where(ranks[:, 0] < ranks[:, 1], 1, -1))
+
+    def transfer_piles(self, games: 'np.ndarray', winners: 'np.ndarray') -> None:
+        """Add player one's play pile and then player two's play pile to the bottom of each round winner's hand"""
+        if not len(games):
+            return
+
+        # Line both piles up one after the other, with the unused pile slots masked off.
+        # Piles are usually a single card each, so the grid only spans the longest pair of piles
+        pile_one_lengths = self.pile_lengths[games, 0][:, None]
+        total_lengths = pile_one_lengths + self.pile_lengths[games, 1][:, None]
+        offsets = np.arange(total_lengths.max())
+        from_pile_two = offsets >= pile_one_lengths
+        pile_offsets = np.where(from_pile_two, offsets - pile_one_lengths, offsets) % DECK_SIZE
+        cards = self.piles[games[:, None], from_pile_two.astype(np.int64), pile_offsets]
+        in_piles = offsets < total_lengths
+
+        tails = self.heads[games, winners] + self.lengths[games, winners]
+        slots = (tails[:, None] + offsets) % DECK_SIZE
+        rows, columns = np.nonzero(in_piles)
+        self.hands[games[rows], winners[rows], slots[rows, columns]] = cards[rows, columns]
+        self.lengths[games, winners] += total_lengths[:, 0]
+
+    def end_games(self, games: 'np.ndarray', forfeit_winners: 'np.ndarray') -> None:
+        """
+        End every game where a player has ran out of cards (the other player wins) or forfeited a war,
+        and every game that has reached the round cap (as a draw)
+        """
+        player_one_empty = self.lengths[games, 0] == 0
+        player_two_empty = ~player_one_empty & (self.lengths[games, 1] == 0)
+        winners = np.where(player_one_empty, 1, np.where(player_two_empty, 0, forfeit_winners))
+        self.winners[games] = winners
+
+        over = winners != -1
+        if self.max_rounds:
+            over |= self.round_numbers[games] >= self.max_rounds
+        self.active[games[over]] = False
+
+    def results(self) -> Iterator[GameResult]:
+        """Build the result of each game in the batch"""
+        for winner, round_number, war_count, forfeit in zip(
+                self.winners.tolist(), self.round_numbers.tolist(), self.war_counts.tolist(), self.forfeits.tolist()):
+            if winner == -1:
+                yield GameResult(None, None, round_number, war_count, forfeit)
+            else:
+                yield GameResult(winner, f'Player {winner + 1}', round_number, war_count, forfeit)
+
+
+def simulate_vectorized(n_games: int, seed: int = 0, batch_size: int = 10000, reshuffle: bool = True,
+                        max_rounds: int = None) -> SimulationResults:
+    """
+    Simulate n_games games of War in batches of lockstep games
+
+        Parameters:
+            n_games (int): The number of games to play
+            seed (int): The simulation seed.  The same seed and batch size always give identical results
+            batch_size (int): The number of games played in lockstep at a time
+            reshuffle (bool): Whether hands are reshuffled once all of their cards have been played
+            max_rounds (int): The number of rounds after which a game is ended as a draw, if any
+    """
+    if np is None:
+        raise ImportError('The vectorized War engine requires numpy')
+
+    rng = np.random.default_rng(seed)
+    results = SimulationResults()
+    for start in range(0, n_games, batch_size):
+        game_count = min(batch_size, n_games - start)
+        batch = VectorizedWar(VectorizedWar.random_deals(game_count, rng), rng, reshuffle, max_rounds)
+        batch.run()
+        results.consume(batch.results())
+    return results